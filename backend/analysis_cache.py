@@ -0,0 +1,302 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# counters are kept per process and flushed to the shared SQLite file in batches
+COUNTER_NAMES = ("memory_hits", "disk_hits", "misses", "evictions")
+
+
+def normalize_text(text):
+    """Whitespace-insensitive form of the article text used for hashing."""
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def directory_fingerprint(path):
+    """Hash of every file name, size and mtime under path - changes whenever the model is replaced."""
+    digest = hashlib.sha256()
+    if not os.path.isdir(path):
+        digest.update(b"missing:" + path.encode())
+        return digest.hexdigest()
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            full = os.path.join(root, name)
+            stat = os.stat(full)
+            rel = os.path.relpath(full, path)
+            digest.update(f"{rel}|{stat.st_size}|{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+class AnalysisCache:
+    """
+    Two-tier cache of analysis results keyed on the article text and model fingerprint.
+
+    The memory tier is a per-process LRU. The disk tier is a SQLite file in WAL
+    mode that every gunicorn worker on the host opens, so a story analyzed by one
+    worker is a hit for all of them. The disk tier is evicted least-recently-used
+    once it grows past max_disk_bytes. Its size is a running total in the meta
+    table, kept by triggers, so no write has to scan the entries.
+    """
+
+    def __init__(
+        self,
+        path,
+        fingerprint_fn,
+        memory_items=1024,
+        max_disk_bytes=256 * 1024 * 1024,
+        fingerprint_ttl=30,
+        counter_flush_every=50,
+    ):
+        self.path = path
+        self.fingerprint_fn = fingerprint_fn
+        self.memory_items = memory_items
+        self.max_disk_bytes = max_disk_bytes
+        self.fingerprint_ttl = fingerprint_ttl
+        self.counter_flush_every = counter_flush_every
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._fingerprint = None
+        self._fingerprint_checked = 0.0
+        self._counters = dict.fromkeys(COUNTER_NAMES, 0)
+        self._unflushed = 0
+
+    # SQLite connections cannot be shared across threads or forked processes
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                fingerprint TEXT NOT NULL,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                accessed_at REAL NOT NULL
+            )"""
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_entries_accessed ON entries (accessed_at)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+        )
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value)")
+        if conn.execute("SELECT 1 FROM meta WHERE name = 'disk_bytes'").fetchone() is None:
+            self._create_size_total(conn)
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    @staticmethod
+    def _create_size_total(conn):
+        """Adds the disk_bytes running total and its triggers; sums the entries once."""
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # upserts fire the update trigger; set() never uses INSERT OR REPLACE,
+            # whose implicit deletes would skip the delete trigger
+            conn.execute(
+                """CREATE TRIGGER IF NOT EXISTS entries_size_insert AFTER INSERT ON entries
+                BEGIN UPDATE meta SET value = value + new.size WHERE name = 'disk_bytes'; END"""
+            )
+            conn.execute(
+                """CREATE TRIGGER IF NOT EXISTS entries_size_update AFTER UPDATE OF size ON entries
+                BEGIN UPDATE meta SET value = value + new.size - old.size
+                WHERE name = 'disk_bytes'; END"""
+            )
+            conn.execute(
+                """CREATE TRIGGER IF NOT EXISTS entries_size_delete AFTER DELETE ON entries
+                BEGIN UPDATE meta SET value = value - old.size WHERE name = 'disk_bytes'; END"""
+            )
+            conn.execute(
+                "INSERT OR IGNORE INTO meta (name, value) "
+                "SELECT 'disk_bytes', COALESCE(SUM(size), 0) FROM entries"
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _purge_stale(self, fingerprint):
+        """
+        Drops results of other model versions. The fingerprint they were purged
+        for is kept in meta, so the scan runs once per model change, not once per
+        worker or thread.
+        """
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT value FROM meta WHERE name = 'fingerprint'").fetchone()
+            if row is None or row[0] != fingerprint:
+                conn.execute("DELETE FROM entries WHERE fingerprint != ?", (fingerprint,))
+                conn.execute(
+                    "INSERT INTO meta (name, value) VALUES ('fingerprint', ?) "
+                    "ON CONFLICT(name) DO UPDATE SET value = excluded.value",
+                    (fingerprint,),
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def fingerprint(self):
+        """Current model/version fingerprint, re-checked at most every fingerprint_ttl seconds."""
+        now = time.monotonic()
+        if self._fingerprint is not None and now - self._fingerprint_checked < self.fingerprint_ttl:
+            return self._fingerprint
+        fingerprint = self.fingerprint_fn()
+        with self._lock:
+            changed = fingerprint != self._fingerprint
+            self._fingerprint = fingerprint
+            self._fingerprint_checked = now
+            if changed:
+                self._memory.clear()
+        if changed:
+            self._purge_stale(fingerprint)
+        return fingerprint
+
+    def make_key(self, text):
+        fingerprint = self.fingerprint()
+        digest = hashlib.sha256(fingerprint.encode())
+        digest.update(normalize_text(text).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+            self._unflushed += 1
+            flush = self._unflushed >= self.counter_flush_every
+        if flush:
+            self.flush_counters()
+
+    def get(self, text):
+        """Returns the cached result for text, or None on a miss."""
+        key = self.make_key(text)
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                value = self._memory[key]
+                hit = True
+            else:
+                hit = False
+        if hit:
+            self._count("memory_hits")
+            return value
+
+        conn = self._connect()
+        row = conn.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self._count("misses")
+            return None
+        conn.execute(
+            "UPDATE entries SET accessed_at = ? WHERE key = ?", (time.time(), key)
+        )
+        value = json.loads(row[0])
+        self._remember(key, value)
+        self._count("disk_hits")
+        return value
+
+    def set(self, text, value):
+        key = self.make_key(text)
+        payload = json.dumps(value)
+        self._remember(key, value)
+
+        conn = self._connect()
+        conn.execute(
+            "INSERT INTO entries (key, fingerprint, value, size, accessed_at) "
+            "VALUES (?, ?, ?, ?, ?) ON CONFLICT(key) DO UPDATE SET "
+            "fingerprint = excluded.fingerprint, value = excluded.value, "
+            "size = excluded.size, accessed_at = excluded.accessed_at",
+            (key, self._fingerprint, payload, len(key) + len(payload), time.time()),
+        )
+        self._evict_disk(conn)
+
+    def _remember(self, key, value):
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_items:
+                self._memory.popitem(last=False)
+
+    def _disk_bytes(self, conn):
+        return conn.execute("SELECT value FROM meta WHERE name = 'disk_bytes'").fetchone()[0]
+
+    def _evict_disk(self, conn):
+        if self._disk_bytes(conn) <= self.max_disk_bytes:
+            return
+        # trim to 90% so we are not evicting on every insert
+        target = int(self.max_disk_bytes * 0.9)
+        evicted = 0
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # another worker may have evicted while we waited for the lock
+            total = self._disk_bytes(conn)
+            while total > target:
+                # oldest entries in small batches, only as many as need to go are read
+                rows = conn.execute(
+                    "SELECT key, size FROM entries ORDER BY accessed_at LIMIT 100"
+                ).fetchall()
+                if not rows:
+                    break
+                for key, size in rows:
+                    if total <= target:
+                        break
+                    conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                    total -= size
+                    evicted += 1
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        with self._lock:
+            self._counters["evictions"] += evicted
+
+    def flush_counters(self):
+        """Adds this process's counter deltas to the shared totals on disk."""
+        with self._lock:
+            deltas = {k: v for k, v in self._counters.items() if v}
+            self._counters = dict.fromkeys(COUNTER_NAMES, 0)
+            self._unflushed = 0
+        if not deltas:
+            return
+        conn = self._connect()
+        for name, delta in deltas.items():
+            conn.execute(
+                "INSERT INTO counters (name, value) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+                (name, delta),
+            )
+
+    def stats(self):
+        """Shared hit/miss counters plus the current size of both tiers."""
+        self.flush_counters()
+        conn = self._connect()
+        totals = dict.fromkeys(COUNTER_NAMES, 0)
+        totals.update(conn.execute("SELECT name, value FROM counters").fetchall())
+        entries = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        size = self._disk_bytes(conn)
+        lookups = totals["memory_hits"] + totals["disk_hits"] + totals["misses"]
+        return {
+            **totals,
+            "hit_rate": (lookups - totals["misses"]) / lookups if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "disk_entries": entries,
+            "disk_bytes": size,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        conn = self._connect()
+        conn.execute("DELETE FROM entries")
+        conn.execute("DELETE FROM counters")
@@ -1,11 +1,10 @@
 import datetime as dt
 import json, os, re, time
 import os
-from collections import Counter, defaultdict
+from collections import Counter
 from functools import wraps
 import requests
 from urllib.parse import urlparse
-from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 from flask import Flask, jsonify, request, redirect, session, abort
 from flask_cors import CORS
@@ -13,31 +12,31 @@ from flask_sqlalchemy import SQLAlchemy
 from requests_oauthlib import OAuth2Session
 from werkzeug.security import generate_password_hash, check_password_hash
 import jwt
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 import secrets
 import threading
-from transformers import pipeline, AutoTokenizer, AutoModelForSequenceClassification
-import nltk
-from nltk.corpus import stopwords
 import re
 from collections import Counter
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 import threading
-import sentry_sdk
-from sentry_sdk.integrations.flask import FlaskIntegration
 from config import config_by_name
+from extraction import ParsedPage, clean_article_text, is_learnable
+from inference import MicroBatcher, aggregate_window_scores, split_token_windows
 from flask_migrate import Migrate
 import traceback
 import base64
+import hashlib
+import sqlite3
+import click
+from sqlalchemy import and_, event, func, or_
+from sqlalchemy.orm import Session
 from email.mime.text import MIMEText
+from analysis_cache import AnalysisCache, directory_fingerprint
+from payloads import PayloadError, PayloadMetrics, read_json_body
+from fetcher import FetchError, PageFetcher
+from nlp import CATEGORY_NAMES, CATEGORY_TEXTS, HASHING_PARAMS, NlpResources, artifact_path
+from keywords import tfidf_keywords
+from topics import EPSILON, CentroidCache, centroid_matrix
+from textstore import decode_text, encode_text
+from rollups import ROLLUP_COLUMNS, ROLLUP_KINDS, RollupDeltas, source_domain
 
 # initialize Flask app with database
 load_dotenv()
@@ -57,8 +56,6 @@ CORS(
     },
 )
 
-NLTK_DATA_DIR = os.path.join(os.path.dirname(__file__), "nltk_data")
-nltk.data.path.append(NLTK_DATA_DIR)
 # Get the environment from the FLASK_ENV variable (defaults to 'dev')
 config_name = os.getenv("FLASK_ENV", "dev")
 # Load the configuration object from the config.py file
@@ -71,6 +68,9 @@ app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
 }
 
 if app.config["SENTRY_DSN"]:
+    import sentry_sdk
+    from sentry_sdk.integrations.flask import FlaskIntegration
+
     sentry_sdk.init(
         dsn=app.config["SENTRY_DSN"],
         integrations=[
@@ -86,44 +86,21 @@ db = SQLAlchemy(app)
 # connect migration engine
 migrate = Migrate(app, db)
 
-# specify path to nltk data
-nltk.data.path.append("C:/Users/victo/AppData/Roaming/nltk_data")
+MODEL_PATH = os.path.join(
+    os.path.abspath(os.path.dirname(__file__)), "out-of-the-loop-production-model"
+)
+# bump whenever the analysis logic changes so cached results are invalidated
+ANALYSIS_VERSION = "1"
 
 # global setup with empty placeholder for fast initial startup of Flask
 pipeline_lock = threading.Lock()
 sentiment_pipeline = None
-# root words for keyword list
-lemmatizer = WordNetLemmatizer()
-
-try:
-    stopwords.words("english")
-except LookupError:
-    # This is now just a fallback, the build script should handle it.
-    print("Stopwords not found locally, attempting emergency download...")
-    nltk.download("stopwords", download_dir=NLTK_DATA_DIR)
-
-# buld stopwords set
-stop_words = set(stopwords.words("english"))
-custom_stopwords = {
-    "reuters",
-    "said",
-    "would",
-    "also",
-    "new",
-    "one",
-    "that",
-    "will",
-    "us",
-    "visit",
-    "say",
-    "says",
-    "told",
-    "like",
-    "get",
-    "going",
-    "advertisement",
-}
-stop_words.update(custom_stopwords)
+# stopwords, lemmatizer and category vectorizer, loaded on first use
+nlp = NlpResources(
+    app.config["NLP_ARTIFACT_PATH"] or artifact_path(),
+    lemma_memo_size=app.config["KEYWORD_LEMMA_MEMO_SIZE"],
+    categorizer_mode=app.config["CATEGORIZER_MODE"],
+)
 
 # Database Models
 # association table for User and Article - many users read many articles
@@ -131,6 +108,8 @@ reading_list = db.Table(
     "reading_list",
     db.Column("user_id", db.Integer, db.ForeignKey("user.id"), primary_key=True),
     db.Column("article_id", db.Integer, db.ForeignKey("article.id"), primary_key=True),
+    # the primary key serves lookups by user, this one "who reads this article"
+    db.Index("ix_reading_list_article_id_user_id", "article_id", "user_id"),
 )
 
 
@@ -150,6 +129,9 @@ class User(db.Model):
         "SsoTicket", backref="user", lazy=True, cascade="all, delete-orphan"
     )
     refresh_token = db.Column(db.String(128), unique=True, nullable=True)
+    # bumped whenever anything in the user's reading history or topics changes,
+    # the dashboard ETags are derived from it
+    history_version = db.Column(db.Integer, nullable=False, default=0, server_default="0")
 
     def set_password(self, password):
         self.password_hash = generate_password_hash(password)
@@ -179,13 +161,85 @@ class Article(db.Model):
     # store each article once - reuse, no duplicates
     url = db.Column(db.String(500), unique=True, nullable=False)
     title = db.Column(db.String(500), nullable=False)
-    article_text = db.Column(db.Text, nullable=False)
     # time stamp for when article was added
-    retrieved_at = db.Column(db.DateTime, nullable=False, default=dt.datetime.utcnow)
+    retrieved_at = db.Column(
+        db.DateTime, nullable=False, default=dt.datetime.utcnow, index=True
+    )
+    # derived from url and retrieved_at on insert (see fill_article_derived_columns),
+    # so history queries filter and group on plain indexed columns
+    domain = db.Column(db.String(255), nullable=False, default="", index=True)
+    retrieved_day = db.Column(db.Date, nullable=False)
     # store results of analysis
     sentiment_score = db.Column(db.Float, nullable=True)
     keywords = db.Column(db.JSON, nullable=True)
+    category = db.Column(db.String(50), nullable=True, index=True)
+    # the body lives in article_body, so list and aggregate queries never read it;
+    # it is loaded on first access to article_text
+    body = db.relationship(
+        "ArticleBody", uselist=False, lazy="select", cascade="all, delete-orphan"
+    )
+
+    @property
+    def article_text(self):
+        return self.body.text if self.body is not None else ""
+
+    @article_text.setter
+    def article_text(self, text):
+        if self.body is None:
+            self.body = ArticleBody()
+        self.body.text = text
+
+
+@event.listens_for(Article, "before_insert")
+@event.listens_for(Article, "before_update")
+def fill_article_derived_columns(mapper, connection, article):
+    if article.retrieved_at is None:
+        article.retrieved_at = dt.datetime.utcnow()
+    article.domain = source_domain(article.url)
+    article.retrieved_day = article.retrieved_at.date()
+
+
+# article text, compressed with ARTICLE_TEXT_CODEC (see textstore.py)
+class ArticleBody(db.Model):
+    article_id = db.Column(db.Integer, db.ForeignKey("article.id"), primary_key=True)
+    codec = db.Column(db.String(10), nullable=False)
+    data = db.Column(db.LargeBinary, nullable=False)
+
+    @property
+    def text(self):
+        return decode_text(self.codec, self.data)
+
+    @text.setter
+    def text(self, text):
+        self.codec, self.data = encode_text(
+            text, app.config["ARTICLE_TEXT_CODEC"], app.config["ARTICLE_TEXT_LEVEL"]
+        )
+
+
+# analysis the server ran on a page it fetched itself (/analyze_url), reused for
+# that url by every reader. Articles hold what clients saved and are never reused.
+class PageAnalysis(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    # final url of the fetch, after redirects
+    url = db.Column(db.String(500), unique=True, nullable=False)
+    # url the result was returned under: the page's canonical link if it is on the
+    # fetched site, the fetched url otherwise. /analyze looks results up by it.
+    canonical_url = db.Column(db.String(500), nullable=False, index=True)
+    title = db.Column(db.String(500), nullable=False)
+    sentiment_score = db.Column(db.Float, nullable=True)
+    keywords = db.Column(db.JSON, nullable=True)
+    # default topic from the categorizer, custom topics are applied per reader
     category = db.Column(db.String(50), nullable=True)
+    # article text, compressed like ArticleBody
+    codec = db.Column(db.String(10), nullable=False)
+    data = db.Column(db.LargeBinary, nullable=False)
+    analyzed_at = db.Column(db.DateTime, nullable=False, default=dt.datetime.utcnow)
+    # analysis_fingerprint() at the time, a model or settings change makes the row stale
+    fingerprint = db.Column(db.String(64), nullable=False)
+
+    @property
+    def article_text(self):
+        return decode_text(self.codec, self.data)
 
 
 # temporary single-use tickets for secure login flow
@@ -205,6 +259,91 @@ class PasswordResetToken(db.Model):
     is_used = db.Column(db.Boolean, default=False, nullable=False)
 
 
+# which extraction strategy worked last time for each site (see extraction.STRATEGIES)
+class DomainStrategy(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    domain = db.Column(db.String(255), unique=True, nullable=False, index=True)
+    strategy = db.Column(db.String(100), nullable=False)
+    # how often a strategy was learned for the domain; failures in a row are counted
+    # in memory (strategy_failures), the column is kept for old rows
+    successes = db.Column(db.Integer, default=0, nullable=False)
+    failures = db.Column(db.Integer, default=0, nullable=False)
+    updated_at = db.Column(db.DateTime, nullable=False, default=dt.datetime.utcnow)
+
+
+# learned centroid of the articles a user moved into one of their custom topics
+class UserTopicCentroid(db.Model):
+    topic_id = db.Column(db.Integer, db.ForeignKey("user_topic.id"), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False, index=True)
+    doc_count = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=dt.datetime.utcnow)
+
+
+# the centroid's vector: sum of the unit hashed TF-IDF vectors of its articles, one
+# row per nonzero feature, so a move only touches the moved article's features
+class UserTopicCentroidTerm(db.Model):
+    topic_id = db.Column(db.Integer, db.ForeignKey("user_topic.id"), primary_key=True)
+    feature = db.Column(db.Integer, primary_key=True)
+    weight = db.Column(db.Float, nullable=False)
+
+
+# which of a user's topic centroids holds an article. Article.category is shared
+# by all readers, so it cannot tell whose centroid an article was added to.
+class UserTopicArticle(db.Model):
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), primary_key=True)
+    article_id = db.Column(db.Integer, db.ForeignKey("article.id"), primary_key=True, index=True)
+    topic_id = db.Column(db.Integer, db.ForeignKey("user_topic.id"), nullable=False, index=True)
+
+
+# number of stored articles each keyword lemma appears in, for TF-IDF keyword ranking
+class TermDocumentFrequency(db.Model):
+    term = db.Column(db.String(64), primary_key=True)
+    doc_count = db.Column(db.Integer, nullable=False, default=0)
+
+
+# named counters about the stored corpus ("documents" = articles counted in the table above)
+class CorpusStat(db.Model):
+    name = db.Column(db.String(50), primary_key=True)
+    value = db.Column(db.Integer, nullable=False, default=0)
+
+
+# running per-user totals behind the analytics endpoints, kept in step with the
+# reading lists by save_analysis, move_article, recategorize and account deletion
+class UserCategoryRollup(db.Model):
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), primary_key=True)
+    # "" for articles without a category
+    category = db.Column(db.String(50), primary_key=True)
+    article_count = db.Column(db.Integer, nullable=False, default=0)
+    # sum and number of the articles that have a sentiment score
+    sentiment_sum = db.Column(db.Float, nullable=False, default=0.0)
+    sentiment_count = db.Column(db.Integer, nullable=False, default=0)
+
+
+class UserDayRollup(db.Model):
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), primary_key=True)
+    # YYYY-MM-DD of Article.retrieved_at
+    day = db.Column(db.String(10), primary_key=True)
+    article_count = db.Column(db.Integer, nullable=False, default=0)
+    sentiment_sum = db.Column(db.Float, nullable=False, default=0.0)
+    sentiment_count = db.Column(db.Integer, nullable=False, default=0)
+
+
+class UserDomainRollup(db.Model):
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), primary_key=True)
+    domain = db.Column(db.String(255), primary_key=True)
+    article_count = db.Column(db.Integer, nullable=False, default=0)
+    sentiment_sum = db.Column(db.Float, nullable=False, default=0.0)
+    sentiment_count = db.Column(db.Integer, nullable=False, default=0)
+
+
+# kind in rollups.ROLLUP_KINDS -> model, the bucket column has the same name as the kind
+ROLLUP_MODELS = {
+    "category": UserCategoryRollup,
+    "day": UserDayRollup,
+    "domain": UserDomainRollup,
+}
+
+
 # custom topics created by user
 class UserTopic(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -249,165 +388,33 @@ DEFAULT_TOPICS = [
 ]
 
 
-# find article from soup
-def extract_article_text(soup, url=None):
-    # Remove irrelevant tags
-    irrelevant_tags = [
-        "script",
-        "style",
-        "header",
-        "footer",
-        "nav",
-        "aside",
-        "form",
-        "noscript",
-    ]
-    for tag in irrelevant_tags:
-        for s in soup.select(tag):
-            s.decompose()
-
-    # Primary selectors that often contain article content
-    selectors = [
-        "article",
-        "[role='main']",
-        "#main",
-        "#main-content",
-        ".main-content",
-        ".article",
-        ".article-body",
-        "div.article-body",
-        ".article-content",
-        ".post-content",
-        ".entry-content",
-        ".content__article-body",
-        ".story-body",
-        ".StandardArticleBody_body",
-        ".content-body",
-        "[data-testid='article-body']",
-        "[itemprop='articleBody']",
-        "[class*='article-body']",
-        "[class*='story-body']",
-        "[class*='post-body']",
-    ]
-
-    for selector in selectors:
-        element = soup.select_one(selector)
-        if element:
-            text = element.get_text(separator="\n", strip=True)
-            if len(text) > 250:
-                return text
-
-    # helper function to score divs to find most likely article text
-    def score_candidate(tag):
-        text = tag.get_text(separator="\n", strip=True)
-        p_tags = tag.find_all("p")
-        a_tags = tag.find_all("a")
-        img_tags = tag.find_all("img")
-        score = len(text) + len(p_tags) * 20 - len(a_tags) * 10 - len(img_tags) * 10
-        return score, text
-
-    best_score = 0
-    best_text = ""
-    for container in soup.find_all(["div", "section"]):
-        score, text = score_candidate(container)
-        if score > best_score and len(text) > 250:
-            best_score = score
-            best_text = text
-
-    if best_text:
-        return best_text
-
-    # plan b if text is not in one of primary selectors, look for div with largest block of text
-    divs = soup.find_all("div")
-    longest_text = ""
-    max_len = 0
-    for div in divs:
-        if div:
-            text = div.get_text(separator="\n", strip=True)
-            if len(text) > max_len:
-                max_len = len(text)
-                longest_text = text
-
-    # return if larger than 250 characters
-    if len(longest_text) > 250:
-        return longest_text
-
-    #
-    paragraphs = soup.find_all("p")
-    combined_paragraphs = "\n".join([p.get_text(strip=True) for p in paragraphs])
-    if len(combined_paragraphs) > 250:
-        return combined_paragraphs
-
-    # can't find container for text body, return all text
-    return soup.get_text(separator="\n", strip=True)
-
-
-import re
+def load_pytorch_pipeline():
+    # Robust absolute model path
+    model_path = MODEL_PATH
 
+    print(f"--- Attempting to load model from: {model_path} ---", flush=True)
 
-def clean_article_text(text):
-    # Normalize line endings and whitespace
-    text = re.sub(r"\r\n|\r", "\n", text)  # normalize newlines
-    text = re.sub(r"\s+", " ", text)  # collapse excessive spaces
-    text = re.sub(r"\n{2,}", "\n\n", text)  # collapse >2 newlines to 2
-
-    # Generic phrases that usually indicate non-article content
-    cutoff_phrases = [
-        "Related Articles",
-        "Related Stories",
-        "Read More",
-        "Recommended for You",
-        "More from",
-        "You might also like",
-        "Top Stories",
-        "Sponsored Content",
-        "Advertisement",
-        "Leave a comment",
-        "Share this article",
-        "See All Newsletters",
-        "All rights reserved",
-        "Click to copy link",
-        "Most Popular",
-        "Join the conversation",
-        "Subscribe to our newsletter",
-        "TRENDING NOW",
-        "Presented by",
-        "Sponsored Links",
-        "Terms of Service",
-        "Privacy Policy",
-        "Give feedback",
-    ]
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer, pipeline
 
-    # Cut off the article at the earliest occurrence of any boilerplate phrase
-    for phrase in cutoff_phrases:
-        index = text.lower().find(phrase.lower())
-        if index != -1 and index > 200:  # avoid false positives at the top
-            text = text[:index]
-            break
+    # Explicit loading with local_files_only here (safe)
+    model = AutoModelForSequenceClassification.from_pretrained(
+        model_path, local_files_only=True
+    )
+    tokenizer = AutoTokenizer.from_pretrained(model_path, local_files_only=True)
 
-    # Remove common inline ad or UI junk
-    removal_patterns = [
-        r"^\s*Advertisement\s*$",
-        r"^\s*Sponsored\s*$",
-        r"^\s*Undo\s*$",
-        r"^\s*Newsletter.*$",
-        r"^\s*Follow us on.*$",
-        r"^\s*Read full story at.*$",
-        r"^\s*More coverage:.*$",
-        r"^\s*Watch now.*$",
-        r"^\s*Tap here.*$",
-        r"^\s*Trending.*$",
-    ]
+    # Create the pipeline without passing local_files_only again
+    return pipeline("sentiment-analysis", model=model, tokenizer=tokenizer)
 
-    for pattern in removal_patterns:
-        text = re.sub(pattern, "", text, flags=re.IGNORECASE | re.MULTILINE)
 
-    # Remove repeated junk like "AP News" or "CNN" showing up multiple times
-    text = re.sub(r"\b(?:AP News|CNN|Fox News|Reuters|NBC News)\b", "", text)
+def load_onnx_pipeline():
+    # quantized export built by export_onnx.py
+    from onnx_backend import OnnxSentimentPipeline
 
-    # Final strip and cleanup
-    text = text.strip()
-    return text
+    model_dir = app.config["ONNX_MODEL_DIR"]
+    print(f"--- Attempting to load ONNX model from: {model_dir} ---", flush=True)
+    return OnnxSentimentPipeline(
+        model_dir, num_threads=app.config["ONNX_NUM_THREADS"] or None
+    )
 
 
 # load large AI model into memory efficiently (lazy loading)
@@ -420,92 +427,386 @@ def get_sentiment_pipeline():
                 "--- First request: Loading custom sentiment model... ---", flush=True
             )
 
-            # Robust absolute model path
-            basedir = os.path.abspath(os.path.dirname(__file__))
-            model_path = os.path.join(basedir, "out-of-the-loop-production-model")
+            if app.config["SENTIMENT_BACKEND"] == "onnx":
+                sentiment_pipeline = load_onnx_pipeline()
+            else:
+                sentiment_pipeline = load_pytorch_pipeline()
+
+            print("--- Sentiment model loaded successfully. ---", flush=True)
+    return sentiment_pipeline
+
+
+# run one padded forward pass over a whole batch of texts
+def run_sentiment_batch(texts):
+    pipeline = get_sentiment_pipeline()
+    return pipeline(texts, batch_size=len(texts), truncation=True)
+
+
+# concurrent /analyze requests are grouped into batches by a background worker
+sentiment_batcher = MicroBatcher(
+    run_sentiment_batch,
+    max_batch_size=app.config["SENTIMENT_BATCH_MAX_SIZE"],
+    max_wait_ms=app.config["SENTIMENT_BATCH_MAX_WAIT_MS"],
+)
+
+
+def score_sentiment(text):
+    """Returns the pipeline result dict for a single text, batched with concurrent callers."""
+    if app.config["SENTIMENT_BATCHING"]:
+        return sentiment_batcher.submit(text)
+    return run_sentiment_batch([text])[0]
+
+
+# map the model's confidence (0 to 1) to a clamped sentiment score (-1 to 1)
+def to_sentiment_score(raw_score):
+    return max(-1.0, min(1.0, (raw_score * 2) - 1))
+
+
+def score_token_windows(pipeline, windows):
+    """Runs every token window through the model in one padded batch, returns top-label scores."""
+    if hasattr(pipeline, "score_token_windows"):
+        # ONNX backend handles its own tensors
+        return pipeline.score_token_windows(windows)
+
+    import torch
+
+    tokenizer = pipeline.tokenizer
+    encoded = tokenizer.pad(
+        {"input_ids": [tokenizer.build_inputs_with_special_tokens(w) for w in windows]},
+        return_tensors="pt",
+    )
+    encoded = {k: v.to(pipeline.model.device) for k, v in encoded.items()}
+    with torch.no_grad():
+        logits = pipeline.model(**encoded).logits
+    # same post-processing as the text-classification pipeline
+    if logits.shape[-1] == 1:
+        probs = torch.sigmoid(logits).squeeze(-1)
+    else:
+        probs = torch.softmax(logits, dim=-1).max(dim=-1).values
+    return probs.tolist()
+
+
+def pipeline_max_length(pipeline):
+    """Longest input (special tokens included) the loaded model accepts, for either backend."""
+    if hasattr(pipeline, "max_length"):
+        # the ONNX wrapper has no .model, it works this out from its config on load
+        return pipeline.max_length
+    return min(
+        pipeline.tokenizer.model_max_length,
+        getattr(pipeline.model.config, "max_position_embeddings", 512),
+    )
+
+
+def get_chunked_sentiment(text):
+    """Scores the whole article in overlapping token windows and aggregates the results."""
+    pipeline = get_sentiment_pipeline()
+    tokenizer = pipeline.tokenizer
+
+    # room left in each window once [CLS]/[SEP] style tokens are added
+    window_size = pipeline_max_length(pipeline) - tokenizer.num_special_tokens_to_add(pair=False)
+
+    # tokenize the full article once
+    token_ids = tokenizer(text, add_special_tokens=False, verbose=False)["input_ids"]
+    windows = split_token_windows(
+        token_ids,
+        window_size,
+        overlap=app.config["SENTIMENT_WINDOW_OVERLAP"],
+        max_windows=app.config["SENTIMENT_MAX_WINDOWS"],
+    )
+
+    raw_scores = score_token_windows(pipeline, windows)
+    return aggregate_window_scores(
+        [to_sentiment_score(s) for s in raw_scores],
+        [len(w) for w in windows],
+        app.config["SENTIMENT_AGGREGATION"],
+    )
+
+
+def dialect_insert(model):
+    """INSERT that supports on_conflict_do_update/do_nothing on SQLite and Postgres."""
+    if db.engine.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(model)
+
+
+# keeps every statement under SQLite's bound-parameter limit
+SQL_CHUNK = 400
+# longer "words" are junk (URLs, run-together text) and do not fit the term column
+MAX_TERM_LENGTH = 64
+
 
-            print(f"--- Attempting to load model from: {model_path} ---", flush=True)
+def corpus_terms(text):
+    return sorted(t for t in nlp.keywords.terms(text) if len(t) <= MAX_TERM_LENGTH)
 
-            # Explicit loading with local_files_only here (safe)
-            model = AutoModelForSequenceClassification.from_pretrained(
-                model_path, local_files_only=True
+
+def add_document_frequencies(texts):
+    """
+    Counts newly stored articles in the document-frequency table. Runs in the
+    caller's transaction, so the counts only change if the articles are committed.
+    """
+    doc_freqs = Counter()
+    for text in texts:
+        doc_freqs.update(corpus_terms(text))
+    # sorted terms keep row-lock order consistent between concurrent saves
+    terms = sorted(doc_freqs)
+    for start in range(0, len(terms), SQL_CHUNK):
+        stmt = dialect_insert(TermDocumentFrequency).values(
+            [
+                {"term": term, "doc_count": doc_freqs[term]}
+                for term in terms[start : start + SQL_CHUNK]
+            ]
+        )
+        db.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["term"],
+                set_={"doc_count": TermDocumentFrequency.doc_count + stmt.excluded.doc_count},
             )
-            tokenizer = AutoTokenizer.from_pretrained(model_path, local_files_only=True)
+        )
+    stmt = dialect_insert(CorpusStat).values(name="documents", value=len(texts))
+    db.session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["name"], set_={"value": CorpusStat.value + stmt.excluded.value}
+        )
+    )
+
 
-            # Create the pipeline without passing local_files_only again
-            sentiment_pipeline = pipeline(
-                "sentiment-analysis", model=model, tokenizer=tokenizer
+def remove_document_frequencies(texts):
+    """
+    Takes deleted articles back out of the document-frequency table, the reverse of
+    add_document_frequencies. Runs in the caller's transaction.
+    """
+    doc_freqs = Counter()
+    for text in texts:
+        doc_freqs.update(corpus_terms(text))
+    # one UPDATE per chunk of terms that drop by the same amount (nearly always 1)
+    by_count = {}
+    for term in sorted(doc_freqs):
+        by_count.setdefault(doc_freqs[term], []).append(term)
+    for count, terms in sorted(by_count.items()):
+        for start in range(0, len(terms), SQL_CHUNK):
+            db.session.execute(
+                db.update(TermDocumentFrequency)
+                .where(TermDocumentFrequency.term.in_(terms[start : start + SQL_CHUNK]))
+                .values(doc_count=TermDocumentFrequency.doc_count - count)
+            )
+    # terms no stored article contains any more
+    terms = sorted(doc_freqs)
+    for start in range(0, len(terms), SQL_CHUNK):
+        db.session.execute(
+            db.delete(TermDocumentFrequency).where(
+                TermDocumentFrequency.term.in_(terms[start : start + SQL_CHUNK]),
+                TermDocumentFrequency.doc_count <= 0,
             )
+        )
+    db.session.execute(
+        db.update(CorpusStat)
+        .where(CorpusStat.name == "documents")
+        .values(value=CorpusStat.value - len(texts))
+    )
 
-            print("--- Sentiment model loaded successfully. ---", flush=True)
-    return sentiment_pipeline
+
+def corpus_document_frequencies(terms):
+    """(documents in the corpus, {term: doc_count}) for the given terms only."""
+    stat = db.session.get(CorpusStat, "documents")
+    n_docs = stat.value if stat else 0
+    terms = sorted(t for t in terms if len(t) <= MAX_TERM_LENGTH)
+    doc_freqs = {}
+    for start in range(0, len(terms), SQL_CHUNK):
+        rows = db.session.query(
+            TermDocumentFrequency.term, TermDocumentFrequency.doc_count
+        ).filter(TermDocumentFrequency.term.in_(terms[start : start + SQL_CHUNK]))
+        doc_freqs.update(rows)
+    return n_docs, doc_freqs
 
 
-# extract keywords from raw text
+def rank_keywords(counts_list, max_keywords):
+    """TF-IDF against the stored corpus once it is big enough, raw frequency otherwise."""
+    if app.config["KEYWORD_RANKING"] == "tfidf":
+        try:
+            n_docs, doc_freqs = corpus_document_frequencies(
+                set().union(*counts_list) if counts_list else set()
+            )
+        except Exception as e:
+            db.session.rollback()
+            print(f"--- Document frequencies unavailable, ranking by frequency: {e} ---")
+            n_docs = 0
+        if n_docs >= app.config["KEYWORD_MIN_CORPUS_DOCS"]:
+            return [
+                tfidf_keywords(counts, doc_freqs, n_docs, max_keywords)
+                for counts in counts_list
+            ]
+    return [
+        [word for word, _ in counts.most_common(max_keywords)] for counts in counts_list
+    ]
+
+
+# extract keywords from raw text: lemmas that are not stopwords, ranked by rank_keywords
 def extract_keywords(text, max_keywords=7):
-    text = text.lower()
-    # find all words (tokenize text)
-    words = re.findall(r"\b[a-z]+\b", text)
-    words = [w for w in words if w not in stop_words and len(w) > 3]
-    # reduce words to root form
-    words = [lemmatizer.lemmatize(w) for w in words]
-    # dict for frequency of words
-    keyword_counts = Counter(words)
-    # return most frequent words sorted from most to least frequent counts
-    return [word for word, _ in keyword_counts.most_common(max_keywords)]
-
-
-# Category Texts with buzzwords for Cosine Similarity
-CATEGORY_TEXTS = {
-    "Technology": "apple google microsoft amazon facebook meta tesla spacex ai artificial intelligence software hardware crypto bitcoin blockchain phone laptop app",
-    "Politics": "senate congress white house president biden trump republican democrat election vote law policy government senator governor",
-    "Sports": "nba nfl mlb nhl soccer football basketball baseball playoffs championship lebron messi ronaldo game match team",
-    "Business": "stocks market wall street dow jones nasdaq economy business company ceo earnings profit investor shares ipo",
-    "Health": "health medical doctor hospital fda cdc virus vaccine disease medicine study",
-    "Entertainment": "movie film hollywood celebrity music album song grammy oscar actor actress tv show",
-    "Science": "science nasa space research discovery study climate environment planet mars",
-    "World News": "china russia ukraine europe asia africa middle east un united nations war conflict diplomacy",
-}
+    return rank_keywords([nlp.keywords.count_lemmas(text)], max_keywords)[0]
 
-vectorizer = TfidfVectorizer(
-    stop_words="english",  # drop common words
-    ngram_range=(1, 2),  # include bigrams
-    sublinear_tf=True,  # dampen very frequent terms
-)
-CATEGORY_FINGERPRINTS = list(CATEGORY_TEXTS.values())
-CATEGORY_NAMES = list(CATEGORY_TEXTS.keys())
-# fit only on the fingerprints -> fixed IDF space
-fingerprint_matrix = vectorizer.fit_transform(CATEGORY_FINGERPRINTS)
+
+def extract_keywords_batch(texts, max_keywords=7):
+    # one document-frequency lookup for the whole batch
+    return rank_keywords([nlp.keywords.count_lemmas(t) for t in texts], max_keywords)
+
+
+# below this cosine to every fingerprint an article is "Other"
+MIN_CATEGORY_SIMILARITY = 0.02
+
+
+# Category Detection via TF-IDF + Cosine Similarity, many articles at once
+def categorize_articles(texts):
+    if not texts:
+        return []
+    sims = nlp.category_similarities(texts)
+    best = sims.argmax(axis=1)
+    return [
+        CATEGORY_NAMES[idx] if sims[row, idx] >= MIN_CATEGORY_SIMILARITY else "Other"
+        for row, idx in enumerate(best)
+    ]
 
 
-# Category Detection via TF-IDF + Cosine Similarity
 def categorize_article(text):
-    # vectorize the article alone
-    article_vec = vectorizer.transform([text])
-    # compute cosines VS pre-built fingerprints
-    sims = cosine_similarity(article_vec, fingerprint_matrix).flatten()
-    best_idx = sims.argmax()
-    best_score = sims[best_idx]
+    return categorize_articles([text])[0]
+
+
+user_centroids = CentroidCache(
+    max_users=app.config["USER_CENTROID_CACHE_USERS"],
+    ttl=app.config["USER_CENTROID_CACHE_TTL"],
+)
+
+
+def load_user_centroids(user_id):
+    """(custom topic names, sparse centroid matrix) for a user, or None without any."""
+    topics = (
+        db.session.query(UserTopic.id, UserTopic.name)
+        .join(UserTopicCentroid, UserTopicCentroid.topic_id == UserTopic.id)
+        .filter(UserTopicCentroid.user_id == user_id, UserTopicCentroid.doc_count > 0)
+        .order_by(UserTopic.name)
+        .all()
+    )
+    vectors = {topic_id: {} for topic_id, _ in topics}
+    terms = db.session.query(
+        UserTopicCentroidTerm.topic_id, UserTopicCentroidTerm.feature, UserTopicCentroidTerm.weight
+    ).filter(UserTopicCentroidTerm.topic_id.in_(list(vectors)))
+    for topic_id, feature, weight in terms:
+        vectors[topic_id][feature] = weight
+    topics = [t for t in topics if vectors[t.id]]
+    if not topics:
+        return None
+    return [t.name for t in topics], centroid_matrix(
+        [vectors[t.id] for t in topics], HASHING_PARAMS["n_features"]
+    )
+
+
+def add_centroid_terms(topic_id, vector, sign):
+    """Adds sign * vector to a centroid's term rows, touching only the vector's features."""
+    features = sorted(vector)
+    for start in range(0, len(features), SQL_CHUNK):
+        chunk = features[start : start + SQL_CHUNK]
+        stmt = dialect_insert(UserTopicCentroidTerm).values(
+            [{"topic_id": topic_id, "feature": f, "weight": sign * vector[f]} for f in chunk]
+        )
+        db.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["topic_id", "feature"],
+                set_={"weight": UserTopicCentroidTerm.weight + stmt.excluded.weight},
+            )
+        )
+        if sign < 0:
+            # what is left of a removed article's features is float residue
+            db.session.execute(
+                db.delete(UserTopicCentroidTerm).where(
+                    UserTopicCentroidTerm.topic_id == topic_id,
+                    UserTopicCentroidTerm.feature.in_(chunk),
+                    func.abs(UserTopicCentroidTerm.weight) < EPSILON,
+                )
+            )
+
+
+def categorize_for_user(text, user, default_category):
+    """
+    Scores text against the default fingerprints and the user's topic centroids
+    in one product. Custom topics need USER_TOPIC_MIN_SIMILARITY to win.
+    """
+    if user is None:
+        return default_category
+    centroids = user_centroids.get(user.id, load_user_centroids)
+    if centroids is None:
+        return default_category
+    names, weights = centroids
+    sims = nlp.category_similarities([text], weights)[0]
+
+    best, best_score = "Other", -1.0
+    for idx, score in enumerate(sims):
+        is_default = idx < len(CATEGORY_NAMES)
+        threshold = (
+            MIN_CATEGORY_SIMILARITY if is_default else app.config["USER_TOPIC_MIN_SIMILARITY"]
+        )
+        if score >= threshold and score > best_score:
+            best = CATEGORY_NAMES[idx] if is_default else names[idx - len(CATEGORY_NAMES)]
+            best_score = score
+    return best
+
 
-    # low threshold
-    if best_score < 0.02:
-        return "Other"
-    return CATEGORY_NAMES[best_idx]
+def update_topic_centroids(user_id, article, new_category):
+    """
+    Moves the article's vector out of the topic centroid this user last put it in
+    and into new_category's, if that is one of the user's custom topics. O(article)
+    work, runs in the caller's transaction.
+    """
+    member = db.session.get(UserTopicArticle, (user_id, article.id))
+    new_topic = None
+    if new_category:
+        new_topic = UserTopic.query.filter_by(user_id=user_id, name=new_category).first()
+    old_topic_id = member.topic_id if member else None
+    new_topic_id = new_topic.id if new_topic else None
+    if old_topic_id == new_topic_id:
+        return
+
+    vector = nlp.hashed_vector(article.article_text or "")
+    for topic_id, sign in ((old_topic_id, -1), (new_topic_id, 1)):
+        if topic_id is None:
+            continue
+        centroid = (
+            UserTopicCentroid.query.filter_by(topic_id=topic_id).with_for_update().first()
+        )
+        if centroid is None:
+            centroid = UserTopicCentroid(topic_id=topic_id, user_id=user_id, doc_count=0)
+            db.session.add(centroid)
+        if sign < 0 and centroid.doc_count <= 0:
+            continue
+        centroid.doc_count += sign
+        centroid.updated_at = dt.datetime.utcnow()
+        if centroid.doc_count:
+            add_centroid_terms(topic_id, vector, sign)
+        else:
+            UserTopicCentroidTerm.query.filter_by(topic_id=topic_id).delete()
+
+    if new_topic_id is None:
+        db.session.delete(member)
+    elif member is None:
+        db.session.add(
+            UserTopicArticle(user_id=user_id, article_id=article.id, topic_id=new_topic_id)
+        )
+    else:
+        member.topic_id = new_topic_id
+    user_centroids.invalidate(user_id)
 
 
 # local analysis using trained ML model (out-of-the-loop-production-model)
 def get_local_analysis(text):
     print("Getting analysis from local model...", flush=True)
-    # call lazy loader function to load model into memory
-    pipeline = get_sentiment_pipeline()
-
-    # send first 512 tokens to BERT model (due to transformer architecture limit), extract result dictionary from list that pipeline returns
-    result = pipeline(text[:512])[0]
-    raw_score = result["score"]
-    # transform model output (0 to 1) to (-1 to 1)
-    sentiment_score = (raw_score * 2) - 1
-    # clamp score to min and max bounds
-    sentiment_score = max(-1.0, min(1.0, sentiment_score))
+    if app.config["SENTIMENT_MODE"] == "chunked":
+        sentiment_score = get_chunked_sentiment(text)
+    else:
+        # send first 512 characters to BERT model (due to transformer architecture limit),
+        # the batcher lazily loads the model and returns this caller's result dictionary
+        result = score_sentiment(text[:512])
+        # transform model output (0 to 1) to (-1 to 1), clamped to min and max bounds
+        sentiment_score = to_sentiment_score(result["score"])
 
     # Category via cosine similarity
     category = categorize_article(text)
@@ -516,59 +817,610 @@ def get_local_analysis(text):
     return sentiment_score, keywords, category
 
 
+# identifies the model files and every setting that changes analysis output
+def analysis_fingerprint():
+    if app.config["SENTIMENT_BACKEND"] == "onnx":
+        model_dir = app.config["ONNX_MODEL_DIR"]
+    else:
+        model_dir = MODEL_PATH
+    parts = [
+        ANALYSIS_VERSION,
+        directory_fingerprint(model_dir),
+        app.config["SENTIMENT_BACKEND"],
+        app.config["SENTIMENT_MODE"],
+        app.config["SENTIMENT_AGGREGATION"],
+        str(app.config["SENTIMENT_WINDOW_OVERLAP"]),
+        str(app.config["SENTIMENT_MAX_WINDOWS"]),
+        app.config["KEYWORD_RANKING"],
+        app.config["CATEGORIZER_MODE"],
+        json.dumps(CATEGORY_TEXTS, sort_keys=True),
+    ]
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()
+
+
+analysis_cache = None
+if app.config["ANALYSIS_CACHE_ENABLED"]:
+    analysis_cache = AnalysisCache(
+        app.config["ANALYSIS_CACHE_PATH"],
+        analysis_fingerprint,
+        memory_items=app.config["ANALYSIS_CACHE_MEMORY_ITEMS"],
+        max_disk_bytes=app.config["ANALYSIS_CACHE_MAX_MB"] * 1024 * 1024,
+    )
+
+
+# same as get_local_analysis, but identical article text is only analyzed once per host
+def get_cached_analysis(text):
+    if analysis_cache is None:
+        return get_local_analysis(text)
+
+    try:
+        cached = analysis_cache.get(text)
+    except sqlite3.Error as e:
+        # a broken cache must never break analysis
+        print(f"--- Analysis cache read failed: {e} ---", flush=True)
+        cached = None
+    if cached is not None:
+        return cached["sentiment"], cached["keywords"], cached["category"]
+
+    sentiment, keywords, category = get_local_analysis(text)
+    try:
+        analysis_cache.set(
+            text, {"sentiment": sentiment, "keywords": keywords, "category": category}
+        )
+    except sqlite3.Error as e:
+        print(f"--- Analysis cache write failed: {e} ---", flush=True)
+    return sentiment, keywords, category
+
+
+@app.cli.command("analysis-cache")
+@click.argument("action", type=click.Choice(["stats", "clear"]))
+def analysis_cache_command(action):
+    """Show hit/miss statistics for the shared analysis cache, or empty it."""
+    if analysis_cache is None:
+        print("Analysis cache is disabled (ANALYSIS_CACHE_ENABLED=false).")
+        return
+    if action == "clear":
+        analysis_cache.clear()
+        print("Analysis cache cleared.")
+        return
+    for name, value in analysis_cache.stats().items():
+        print(f"{name:>16}: {value}")
+
+
+@app.cli.command("recategorize")
+@click.option("--batch-size", default=500, show_default=True, help="articles per transform/update")
+@click.option("--dry-run", is_flag=True, help="count the changes without writing them")
+def recategorize_command(batch_size, dry_run):
+    """
+    Re-runs the categorizer over every stored article, for after CATEGORY_TEXTS changes.
+    Articles a user moved into a custom topic keep their category.
+    """
+    start = time.perf_counter()
+    seen = changed = 0
+    last_id = 0
+    while True:
+        # keyset pagination, so updates never shift the next page
+        rows = (
+            db.session.query(Article.id, ArticleBody.codec, ArticleBody.data, Article.category)
+            .outerjoin(ArticleBody, ArticleBody.article_id == Article.id)
+            .filter(Article.id > last_id)
+            .order_by(Article.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not rows:
+            break
+        last_id = rows[-1].id
+        rows = [r for r in rows if r.category is None or r.category in DEFAULT_TOPICS]
+        categories = categorize_articles([decode_text(r.codec, r.data) for r in rows])
+        updates = [
+            {"id": r.id, "category": category}
+            for r, category in zip(rows, categories)
+            if category != r.category
+        ]
+        if updates and not dry_run:
+            ids = [u["id"] for u in updates]
+            move_category_rollups(ids, {u["id"]: u["category"] for u in updates})
+            db.session.execute(db.update(Article), updates)
+            bump_history_version(article_readers(ids))
+            db.session.commit()
+        seen += len(rows)
+        changed += len(updates)
+        elapsed = time.perf_counter() - start
+        print(
+            f"  {seen} articles, {changed} changed ({seen / elapsed:.0f} rows/sec)", flush=True
+        )
+    elapsed = time.perf_counter() - start
+    print(
+        f"{'Would change' if dry_run else 'Changed'} {changed} of {seen} articles "
+        f"in {elapsed:.1f}s ({seen / elapsed if elapsed else 0:.0f} rows/sec)"
+    )
+
+
+@app.cli.command("keyword-df")
+@click.argument("action", type=click.Choice(["stats", "rebuild"]))
+@click.option("--batch-size", default=200, show_default=True, help="articles loaded per round trip")
+def keyword_df_command(action, batch_size):
+    """Show the keyword document-frequency table, or recompute it from all stored articles."""
+    if action == "stats":
+        stat = db.session.get(CorpusStat, "documents")
+        terms = db.session.query(db.func.count(TermDocumentFrequency.term)).scalar()
+        print(f"documents counted: {stat.value if stat else 0}")
+        print(f"articles stored:   {db.session.query(db.func.count(Article.id)).scalar()}")
+        print(f"distinct terms:    {terms}")
+        top = TermDocumentFrequency.query.order_by(
+            TermDocumentFrequency.doc_count.desc()
+        ).limit(10)
+        for row in top:
+            print(f"  {row.term:30}{row.doc_count:>8}")
+        return
+
+    # one streaming pass over the article texts, only the counts are kept in memory
+    start = time.perf_counter()
+    doc_freqs = Counter()
+    n_docs = 0
+    query = db.session.query(ArticleBody.codec, ArticleBody.data).execution_options(
+        yield_per=batch_size
+    )
+    for codec, data in query:
+        doc_freqs.update(corpus_terms(decode_text(codec, data)))
+        n_docs += 1
+        if n_docs % 1000 == 0:
+            print(f"  {n_docs} articles...", flush=True)
+
+    # replace the table in one transaction, readers see either the old or new counts
+    # (articles saved while the rebuild runs may be missed: run it again if in doubt)
+    TermDocumentFrequency.query.delete()
+    CorpusStat.query.filter_by(name="documents").delete()
+    rows = [{"term": term, "doc_count": count} for term, count in sorted(doc_freqs.items())]
+    for chunk_start in range(0, len(rows), SQL_CHUNK):
+        db.session.execute(
+            db.insert(TermDocumentFrequency), rows[chunk_start : chunk_start + SQL_CHUNK]
+        )
+    db.session.add(CorpusStat(name="documents", value=n_docs))
+    db.session.commit()
+    print(
+        f"Rebuilt document frequencies: {n_docs} articles, {len(rows)} terms "
+        f"in {time.perf_counter() - start:.1f}s"
+    )
+
+
+@app.cli.command("topic-centroids")
+@click.argument("action", type=click.Choice(["rebuild"]))
+@click.option("--batch-size", default=200, show_default=True, help="articles loaded per round trip")
+def topic_centroids_command(action, batch_size):
+    """Recompute every custom-topic centroid from the articles its user moved into it."""
+    start = time.perf_counter()
+    # topic_id -> [user_id, articles, summed vector]
+    totals = {}
+    query = (
+        db.session.query(
+            UserTopicArticle.user_id,
+            UserTopicArticle.topic_id,
+            ArticleBody.codec,
+            ArticleBody.data,
+        )
+        .outerjoin(ArticleBody, ArticleBody.article_id == UserTopicArticle.article_id)
+        .execution_options(yield_per=batch_size)
+    )
+    n_articles = 0
+    for user_id, topic_id, codec, data in query:
+        entry = totals.setdefault(topic_id, [user_id, 0, {}])
+        entry[1] += 1
+        text = decode_text(codec, data) if codec else ""
+        for feature, weight in nlp.hashed_vector(text).items():
+            entry[2][feature] = entry[2].get(feature, 0.0) + weight
+        n_articles += 1
+        if n_articles % 1000 == 0:
+            print(f"  {n_articles} articles...", flush=True)
+
+    # one transaction, readers see either the old or the new centroids
+    now = dt.datetime.utcnow()
+    UserTopicCentroidTerm.query.delete()
+    UserTopicCentroid.query.delete()
+    rows = [
+        {"topic_id": topic_id, "user_id": user_id, "doc_count": count, "updated_at": now}
+        for topic_id, (user_id, count, _) in sorted(totals.items())
+    ]
+    term_rows = [
+        {"topic_id": topic_id, "feature": feature, "weight": weight}
+        for topic_id, (_, _, vector) in sorted(totals.items())
+        for feature, weight in sorted(vector.items())
+    ]
+    for model, values in ((UserTopicCentroid, rows), (UserTopicCentroidTerm, term_rows)):
+        for chunk_start in range(0, len(values), SQL_CHUNK):
+            db.session.execute(db.insert(model), values[chunk_start : chunk_start + SQL_CHUNK])
+    db.session.commit()
+    print(
+        f"Rebuilt {len(rows)} topic centroids ({len(term_rows)} terms) from {n_articles} articles "
+        f"in {time.perf_counter() - start:.1f}s"
+    )
+
+
+@app.cli.command("rollups")
+@click.argument("action", type=click.Choice(["check", "rebuild"]))
+@click.option("--batch-size", default=1000, show_default=True, help="rows loaded per round trip")
+def rollups_command(action, batch_size):
+    """Diff the analytics rollups against the reading lists, or rebuild them from scratch."""
+    start = time.perf_counter()
+    live = RollupDeltas()
+    n_rows = 0
+    for row in reading_list_rows().execution_options(yield_per=batch_size):
+        live.add(*row)
+        n_rows += 1
+
+    if action == "rebuild":
+        # one transaction, readers see either the old or the new rollups
+        for kind in ROLLUP_KINDS:
+            model = ROLLUP_MODELS[kind]
+            model.query.delete()
+            rows = [dict(zip(("user_id", kind) + ROLLUP_COLUMNS, r)) for r in live.rows(kind)]
+            for chunk_start in range(0, len(rows), SQL_CHUNK):
+                db.session.execute(db.insert(model), rows[chunk_start : chunk_start + SQL_CHUNK])
+            print(f"  {kind}: {len(rows)} buckets")
+        db.session.commit()
+        print(
+            f"Rebuilt rollups from {n_rows} reading list entries "
+            f"in {time.perf_counter() - start:.1f}s"
+        )
+        return
+
+    # entries saved while the check runs can show up as false mismatches
+    mismatches = 0
+    for kind in ROLLUP_KINDS:
+        model = ROLLUP_MODELS[kind]
+        expected = {(r[0], r[1]): r[2:] for r in live.rows(kind)}
+        stored = {
+            (r.user_id, getattr(r, kind)): (r.article_count, r.sentiment_sum, r.sentiment_count)
+            for r in model.query.filter(model.article_count > 0)
+        }
+        for key in sorted(expected.keys() | stored.keys()):
+            want = expected.get(key, (0, 0.0, 0))
+            have = stored.get(key, (0, 0.0, 0))
+            # the sums pick up float rounding as articles come and go
+            if want[0] != have[0] or want[2] != have[2] or abs(want[1] - have[1]) > 1e-6:
+                mismatches += 1
+                if mismatches <= 20:
+                    print(f"  {kind} user={key[0]} {key[1]!r}: stored {have}, expected {want}")
+    print(
+        f"Checked rollups against {n_rows} reading list entries: {mismatches} mismatches "
+        f"in {time.perf_counter() - start:.1f}s"
+    )
+    if mismatches:
+        print("Run `flask rollups rebuild` to fix them.")
+        raise SystemExit(1)
+
+
+def current_analysis_fingerprint():
+    # the cache re-checks the model files at most every fingerprint_ttl seconds
+    if analysis_cache is not None:
+        try:
+            return analysis_cache.fingerprint()
+        except sqlite3.Error as e:
+            print(f"--- Analysis cache fingerprint failed: {e} ---", flush=True)
+    return analysis_fingerprint()
+
+
+def is_analysis_fresh(stored):
+    """Stored results are reused while younger than ANALYSIS_MAX_AGE_HOURS and from the current model."""
+    max_age = app.config["ANALYSIS_MAX_AGE_HOURS"]
+    if max_age <= 0:
+        return False
+    if dt.datetime.utcnow() - stored.analyzed_at >= dt.timedelta(hours=max_age):
+        return False
+    return stored.fingerprint == current_analysis_fingerprint()
+
+
+# look up the server's own analysis of a url
+def get_fresh_analysis(url):
+    if not url or url == "Unknown URL" or app.config["ANALYSIS_MAX_AGE_HOURS"] <= 0:
+        return None
+    # the fetched url (after redirects) or the canonical url the result was returned under
+    stored = (
+        PageAnalysis.query.filter(
+            or_(PageAnalysis.url == url, PageAnalysis.canonical_url == url)
+        )
+        .order_by(PageAnalysis.analyzed_at.desc())
+        .first()
+    )
+    if stored and is_analysis_fresh(stored):
+        return stored
+    return None
+
+
+def store_page_analysis(url, canonical_url, title, text, sentiment, keywords, category):
+    """Saves (or refreshes) the analysis of a page the server fetched itself."""
+    codec, data = encode_text(
+        text, app.config["ARTICLE_TEXT_CODEC"], app.config["ARTICLE_TEXT_LEVEL"]
+    )
+    values = {
+        "canonical_url": canonical_url[:500],
+        "title": (title or "No Title")[:500],
+        "sentiment_score": sentiment,
+        "keywords": keywords,
+        "category": category,
+        "codec": codec,
+        "data": data,
+        "analyzed_at": dt.datetime.utcnow(),
+        "fingerprint": current_analysis_fingerprint(),
+    }
+    stmt = dialect_insert(PageAnalysis).values(url=url[:500], **values)
+    stmt = stmt.on_conflict_do_update(index_elements=["url"], set_=values)
+    try:
+        db.session.execute(stmt)
+        db.session.commit()
+    except Exception as e:
+        # the reader still gets the result, the next one analyzes again
+        db.session.rollback()
+        print(f"--- Could not store analysis for {url}: {e} ---", flush=True)
+
+
+def url_domain(url):
+    netloc = urlparse(url).netloc.lower() if url else ""
+    return netloc or None
+
+
+def get_domain_strategy(domain):
+    if not domain:
+        return None
+    # a column query, so a row re-learned in record_domain_strategy's own session
+    # is not served stale from this session's identity map
+    return db.session.query(DomainStrategy.strategy).filter_by(domain=domain).scalar()
+
+
+# consecutive failures of each domain's remembered strategy, kept in memory so a
+# failing request does not write; counted per worker process
+strategy_failures = Counter()
+strategy_failures_lock = threading.Lock()
+
+
+def record_domain_strategy(domain, preferred, used):
+    """
+    Learns which selector strategy extracts a site's articles. A remembered
+    strategy that fails STRATEGY_RELEARN_AFTER times in a row (site redesign) is
+    replaced by the selector that worked instead, or forgotten if only a fallback
+    did. Only those changes are written, in their own session, so the request's
+    session is never committed here.
+    """
+    if not domain or not used:
+        return
+    learnable = is_learnable(used)
+    if preferred is None and not learnable:
+        # nothing remembered and nothing worth remembering
+        return
+    if preferred is not None and is_learnable(preferred):
+        with strategy_failures_lock:
+            if preferred == used:
+                strategy_failures.pop(domain, None)
+                return
+            strategy_failures[domain] += 1
+            if strategy_failures[domain] < app.config["STRATEGY_RELEARN_AFTER"]:
+                return
+            del strategy_failures[domain]
+    try:
+        with Session(db.engine) as writer, writer.begin():
+            row = writer.query(DomainStrategy).filter_by(domain=domain).first()
+            if row is None:
+                if learnable:
+                    writer.add(DomainStrategy(domain=domain, strategy=used, successes=1))
+                return
+            if not is_learnable(row.strategy):
+                # remembered before fallbacks stopped being learned
+                print(f"--- Dropped fallback extraction strategy {row.strategy} for {domain} ---")
+            elif row.strategy == used:
+                # another worker already re-learned it
+                return
+            elif learnable:
+                print(f"--- Re-learned extraction for {domain}: {row.strategy} -> {used} ---")
+            else:
+                print(f"--- Forgot extraction strategy {row.strategy} for {domain} ---")
+            if learnable:
+                row.strategy, row.successes, row.failures = used, row.successes + 1, 0
+                row.updated_at = dt.datetime.utcnow()
+            else:
+                writer.delete(row)
+    except Exception as e:
+        # two workers learning the same new domain at once, or the db is unavailable
+        print(f"--- Could not record extraction strategy for {domain}: {e} ---")
+
+
+def stored_analysis_data(stored, user=None):
+    text = stored.article_text
+    return {
+        "url": stored.canonical_url,
+        "title": stored.title,
+        "sentiment": stored.sentiment_score,
+        "keywords": stored.keywords,
+        "category": categorize_for_user(text, user, stored.category),
+        "article_text": text,
+    }
+
+
 # API routes
 
 
+payload_metrics = PayloadMetrics()
+
+
+def read_analyze_payload():
+    """Decodes the /analyze body, which the extension may send gzip/deflate compressed."""
+    return read_json_body(
+        request.stream,
+        request.content_length,
+        request.headers.get("Content-Encoding"),
+        app.config["MAX_ANALYZE_BODY_KB"] * 1024,
+        app.config["MAX_ANALYZE_DECODED_KB"] * 1024,
+    )
+
+
 @app.route("/analyze", methods=["POST"])
 @token_required
 def analyze(current_user):
-    html_content = request.get_json().get("html_content")
-    if not html_content:
-        return jsonify({"message": "HTML content is required"}), 400
-
+    started = time.perf_counter()
+    mode, wire_bytes, decoded_bytes = "unknown", 0, 0
+    encoding = (request.headers.get("Content-Encoding") or "identity").lower()
     try:
-        data = request.get_json()
-        html_content = data.get("html_content", "")
-        visible_text = data.get("visible_text", "")
+        data, wire_bytes, decoded_bytes, encoding = read_analyze_payload()
+        # "html" sends the whole page, "extracted" only the head metadata and
+        # the main text the content script already pulled out
+        mode = data.get("mode", "html")
+        response = analyze_payload(mode, data, current_user)
+    except PayloadError as e:
+        response = jsonify({"message": e.message}), e.status
+    status = response[1] if isinstance(response, tuple) else 200
+    payload_metrics.record(
+        mode, encoding, wire_bytes, decoded_bytes, time.perf_counter() - started, status
+    )
+    return response
 
-        print("📥 Received analyze request")
-        soup = BeautifulSoup(html_content, "html.parser")
 
-        text = visible_text or extract_article_text(soup)
-        print(f"✅ Text: {text[:80]}")
+# optional /analyze fields, each must be a string when it is sent
+ANALYZE_STRING_FIELDS = ("text", "url", "title", "html_content", "visible_text")
 
-        title_tag = soup.find("title")
-        if title_tag and title_tag.get_text(strip=True):
-            title = title_tag.get_text(strip=True)
-        else:
-            title = text.split("\n")[0][:80] if text else "No Title"
 
-        url_element = soup.find("link", rel="canonical")
-        url = url_element["href"] if url_element else "Unknown URL"
+def analyze_payload(mode, data, user):
+    for field in ANALYZE_STRING_FIELDS:
+        if data.get(field) is not None and not isinstance(data[field], str):
+            return jsonify({"message": f"{field} must be a string"}), 400
+    if mode == "extracted":
+        text = data.get("text", "")
+        if not text:
+            return jsonify({"message": "Article text is required"}), 400
+    elif mode == "html":
+        if not data.get("html_content"):
+            return jsonify({"message": "HTML content is required"}), 400
+    else:
+        return jsonify({"message": "Unknown analyze mode"}), 400
+
+    try:
+        print(f"📥 Received analyze request ({mode})")
+        if mode == "extracted":
+            url = data.get("url") or "Unknown URL"
+            return analysis_response(url, data.get("title", ""), text, user=user)
+
+        page = ParsedPage(data["html_content"], fast=app.config["FAST_HTML_PARSER"])
+        url = page.canonical_url or "Unknown URL"
+        return analysis_response(url, page.title, data.get("visible_text", ""), page, user)
+
+    except Exception as e:
+        import traceback
+        print("❌ UNHANDLED EXCEPTION IN /analyze:", e)
+        traceback.print_exc()
+        return jsonify({
+            "message": "A server error occurred during analysis.",
+            "details": str(e)
+        }), 500
+
 
-        if not text or len(text.strip()) < 100:
-            return jsonify({
-                "message": "Failed to extract article content. The page may be protected or rendered with JavaScript.",
-                "data": None
-            }), 400
+def page_text(page):
+    """Main text of a parsed page, trying the strategy that worked for its site last time first."""
+    domain = url_domain(page.canonical_url)
+    preferred = get_domain_strategy(domain)
+    text = page.article_text(preferred)
+    record_domain_strategy(domain, preferred, page.strategy)
+    print(f"✅ Text ({page.parser}, {page.strategy}): {text[:80]}")
+    return text
 
-        sentiment, keywords, category = get_local_analysis(text)
 
+def analysis_response(url, title, text, page=None, user=None, fetched_url=None):
+    """
+    Shared tail of /analyze and /analyze_url: stored result, or extract and analyze.
+    fetched_url is set when the server fetched the page itself, only those results
+    are stored for other readers.
+    """
+    # popular articles are analyzed once, later readers get the stored result
+    stored = get_fresh_analysis(url)
+    if stored:
+        print(f"♻️ Reusing stored analysis for {url}")
         return jsonify({
             "message": "Analysis complete",
-            "data": {
-                "url": url,
-                "title": title,
-                "sentiment": sentiment,
-                "keywords": keywords,
-                "category": category,
-                "article_text": text,
-            }
+            "data": stored_analysis_data(stored, user),
         })
 
+    if not text and page is not None:
+        text = page_text(page)
+
+    if not title:
+        title = text.split("\n")[0][:80] if text else "No Title"
+
+    if text and app.config["CLEAN_ARTICLE_TEXT"]:
+        text = clean_article_text(text, source_domain(url))
+
+    if not text or len(text.strip()) < 100:
+        return jsonify({
+            "message": "Failed to extract article content. The page may be protected or rendered with JavaScript.",
+            "data": None
+        }), 400
+
+    sentiment, keywords, category = get_cached_analysis(text)
+    if fetched_url and app.config["ANALYSIS_MAX_AGE_HOURS"] > 0:
+        # a page may only claim a canonical url on its own site, or it could take
+        # over the stored result of any other article
+        canonical_url = url if source_domain(url) == source_domain(fetched_url) else fetched_url
+        store_page_analysis(
+            fetched_url, canonical_url, title, text, sentiment, keywords, category
+        )
+    # the cached result is shared by everyone, custom topics are per user
+    category = categorize_for_user(text, user, category)
+
+    return jsonify({
+        "message": "Analysis complete",
+        "data": {
+            "url": url,
+            "title": title,
+            "sentiment": sentiment,
+            "keywords": keywords,
+            "category": category,
+            "article_text": text,
+        }
+    })
+
+
+page_fetcher = PageFetcher(
+    max_bytes=app.config["FETCH_MAX_KB"] * 1024,
+    connect_timeout=app.config["FETCH_CONNECT_TIMEOUT"],
+    read_timeout=app.config["FETCH_READ_TIMEOUT"],
+    per_host_limit=app.config["FETCH_PER_HOST_LIMIT"],
+    pool_size=app.config["FETCH_POOL_SIZE"],
+    cache_bytes=app.config["FETCH_CACHE_MAX_MB"] * 1024 * 1024,
+    user_agent=app.config["FETCH_USER_AGENT"],
+    allow_private_hosts=app.config["FETCH_ALLOW_PRIVATE_HOSTS"],
+)
+
+
+@app.route("/analyze_url", methods=["POST"])
+@token_required
+def analyze_url(current_user):
+    data = request.get_json(silent=True) or {}
+    url = (data.get("url") or "").strip()
+    if not url:
+        return jsonify({"message": "URL is required"}), 400
+
+    # skip the fetch entirely when this exact URL was analyzed recently
+    stored = get_fresh_analysis(url)
+    if stored:
+        print(f"♻️ Reusing stored analysis for {url}")
+        return jsonify({"message": "Analysis complete", "data": stored_analysis_data(stored, current_user)})
+
+    try:
+        fetched = page_fetcher.fetch(url)
+    except FetchError as e:
+        print(f"--- Fetch failed for {url}: {e.message} ---")
+        return jsonify({"message": e.message}), e.status
+    print(f"🌐 Fetched {fetched.url} ({fetched.cache_status}, {fetched.elapsed * 1000:.0f} ms)")
+
+    try:
+        page = ParsedPage(fetched.html, fast=app.config["FAST_HTML_PARSER"])
+        return analysis_response(
+            page.canonical_url or fetched.url,
+            page.title,
+            "",
+            page,
+            current_user,
+            fetched_url=fetched.url,
+        )
     except Exception as e:
-        import traceback
-        print("❌ UNHANDLED EXCEPTION IN /analyze:", e)
+        print("❌ UNHANDLED EXCEPTION IN /analyze_url:", e)
         traceback.print_exc()
         return jsonify({
             "message": "A server error occurred during analysis.",
@@ -576,46 +1428,192 @@ def analyze(current_user):
         }), 500
 
 
+@app.route("/analyze/metrics", methods=["GET"])
+@token_required
+def analyze_metrics(current_user):
+    # counters are per worker process
+    return jsonify({"pid": os.getpid(), "modes": payload_metrics.snapshot()})
+
+
+def history_count(user):
+    return (
+        db.session.query(func.count())
+        .select_from(reading_list)
+        .filter(reading_list.c.user_id == user.id)
+        .scalar()
+    )
+
+
+def save_analyses(user, analyses):
+    """
+    Stores analyses (dicts shaped like the /save_analysis body) and adds them to the
+    user's history, in the caller's transaction. Articles and reading list entries are
+    written with INSERT ... ON CONFLICT DO NOTHING, so concurrent saves of the same URL
+    never fail on the unique constraints. Returns {url: status} with status "created"
+    (new article), "added" (existing article, new to the user) or "already_saved".
+    """
+    by_url = {}
+    for item in analyses:
+        by_url.setdefault(item["url"], item)
+    # sorted keys keep row-lock order consistent between concurrent batches
+    urls = sorted(by_url)
+    now = dt.datetime.utcnow()
+
+    created = {}
+    for start in range(0, len(urls), SQL_CHUNK):
+        rows = [
+            {
+                "url": url,
+                "title": by_url[url]["title"],
+                "sentiment_score": by_url[url].get("sentiment"),
+                "keywords": by_url[url].get("keywords"),
+                "category": by_url[url].get("category"),
+                "retrieved_at": now,
+                # core inserts skip fill_article_derived_columns
+                "retrieved_day": now.date(),
+                "domain": source_domain(url),
+            }
+            for url in urls[start : start + SQL_CHUNK]
+        ]
+        stmt = (
+            dialect_insert(Article)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=["url"])
+            .returning(Article.id, Article.url)
+        )
+        created.update({url: article_id for article_id, url in db.session.execute(stmt)})
+
+    if created:
+        bodies = []
+        for url, article_id in sorted(created.items()):
+            codec, data = encode_text(
+                by_url[url]["article_text"],
+                app.config["ARTICLE_TEXT_CODEC"],
+                app.config["ARTICLE_TEXT_LEVEL"],
+            )
+            bodies.append({"article_id": article_id, "codec": codec, "data": data})
+        for start in range(0, len(bodies), SQL_CHUNK):
+            db.session.execute(db.insert(ArticleBody), bodies[start : start + SQL_CHUNK])
+        add_document_frequencies([by_url[url]["article_text"] for url in sorted(created)])
+
+    # the stored rows (a concurrent save may have created them first), for the rollups
+    articles = {}
+    for start in range(0, len(urls), SQL_CHUNK):
+        rows = db.session.query(
+            Article.id,
+            Article.url,
+            Article.category,
+            Article.retrieved_day,
+            Article.domain,
+            Article.sentiment_score,
+        ).filter(Article.url.in_(urls[start : start + SQL_CHUNK]))
+        articles.update({r.url: r for r in rows})
+
+    ids = sorted(r.id for r in articles.values())
+    added = set()
+    for start in range(0, len(ids), SQL_CHUNK):
+        stmt = (
+            dialect_insert(reading_list)
+            .values([{"user_id": user.id, "article_id": i} for i in ids[start : start + SQL_CHUNK]])
+            .on_conflict_do_nothing()
+            .returning(reading_list.c.article_id)
+        )
+        added.update(article_id for (article_id,) in db.session.execute(stmt))
+
+    if added:
+        deltas = RollupDeltas()
+        for r in articles.values():
+            if r.id in added:
+                deltas.add(user.id, r.category, r.retrieved_day, r.domain, r.sentiment_score)
+        apply_rollup_deltas(deltas)
+        bump_history_version([user.id])
+
+    statuses = {}
+    for url in urls:
+        if url in created:
+            statuses[url] = "created"
+        elif articles[url].id in added:
+            statuses[url] = "added"
+        else:
+            statuses[url] = "already_saved"
+    return statuses
+
+
+def invalid_analysis(item):
+    """Error message for a malformed analysis to save, or None."""
+    if not isinstance(item, dict):
+        return "Each analysis must be an object."
+    for field in ("url", "title", "article_text"):
+        if not isinstance(item.get(field), str) or not item[field]:
+            return f"Missing or invalid {field}."
+    return None
+
+
 @app.route("/save_analysis", methods=["POST"])
 @token_required
 def save_analysis(current_user):
     data = request.get_json()
     if not data.get("save_to_history"):
         return (
-            jsonify({"message": "Not saved.", "count": len(current_user.articles)}),
+            jsonify({"message": "Not saved.", "count": history_count(current_user)}),
             200,
         )
+    error = invalid_analysis(data)
+    if error:
+        return jsonify({"message": error}), 400
 
     try:
-        existing = Article.query.filter_by(url=data["url"]).first()
-        if existing:
-            if existing not in current_user.articles:
-                current_user.articles.append(existing)
-                db.session.commit()
-            message = "Article added to history."
-        else:
-            new_article = Article(
-                url=data["url"],
-                title=data["title"],
-                article_text=data["article_text"],
-                sentiment_score=data["sentiment"],
-                keywords=data["keywords"],
-                category=data["category"],
-            )
-            db.session.add(new_article)
-            current_user.articles.append(new_article)
-            db.session.commit()
+        status = save_analyses(current_user, [data])[data["url"]]
+        db.session.commit()
+        if status == "created":
             message = "New article saved and added to history."
+        else:
+            message = "Article added to history."
 
         # Now count them
-        count = len(current_user.articles)
+        count = history_count(current_user)
         return jsonify({"message": message, "count": count}), 200
 
     except Exception as e:
         db.session.rollback()
+        print(f"--- ERROR saving analysis: {e} ---", flush=True)
         return jsonify({"message": "A server error occurred while saving."}), 500
 
 
+@app.route("/save_analysis/batch", methods=["POST"])
+@token_required
+def save_analysis_batch(current_user):
+    """
+    Saves many analyses in one transaction: {"analyses": [<save_analysis body>, ...]}.
+    Either all of them are stored or none are.
+    """
+    data = request.get_json(silent=True) or {}
+    analyses = data.get("analyses")
+    max_items = app.config["SAVE_BATCH_MAX_ITEMS"]
+    if not isinstance(analyses, list) or not analyses:
+        return jsonify({"message": "analyses must be a non-empty list"}), 400
+    if len(analyses) > max_items:
+        return jsonify({"message": f"At most {max_items} analyses per batch."}), 413
+    for index, item in enumerate(analyses):
+        error = invalid_analysis(item)
+        if error:
+            return jsonify({"message": f"analyses[{index}]: {error}"}), 400
+
+    try:
+        statuses = save_analyses(current_user, analyses)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        print(f"--- ERROR saving analysis batch: {e} ---", flush=True)
+        return jsonify({"message": "A server error occurred while saving."}), 500
+    return jsonify(
+        {
+            "results": [{"url": url, "status": status} for url, status in statuses.items()],
+            "count": history_count(current_user),
+        }
+    )
+
+
 # Single Sign-On (SSO) Routes
 @app.route("/generate_sso_ticket", methods=["POST"])
 @token_required
@@ -771,7 +1769,41 @@ def delete_account(current_user):
         # Before deleting the user, SQLAlchemy with our setup will handle
         # deleting their entries from the reading_list. We will also
         # manually delete their custom topics.
+        UserTopicArticle.query.filter_by(user_id=current_user.id).delete()
+        own_topics = db.select(UserTopic.id).where(UserTopic.user_id == current_user.id)
+        UserTopicCentroidTerm.query.filter(UserTopicCentroidTerm.topic_id.in_(own_topics)).delete(
+            synchronize_session=False
+        )
+        UserTopicCentroid.query.filter_by(user_id=current_user.id).delete()
         UserTopic.query.filter_by(user_id=current_user.id).delete()
+        for model in ROLLUP_MODELS.values():
+            model.query.filter_by(user_id=current_user.id).delete()
+
+        # the cascade deletes the user's articles, which also takes them out of
+        # other readers' lists, so those readers' rollups and centroids shrink too
+        own_articles = db.select(reading_list.c.article_id).where(
+            reading_list.c.user_id == current_user.id
+        )
+        # and leave the keyword corpus, the same way saving them added them
+        own_ids = [article_id for (article_id,) in db.session.execute(own_articles)]
+        for start in range(0, len(own_ids), SQL_CHUNK):
+            bodies = db.session.query(ArticleBody.codec, ArticleBody.data).filter(
+                ArticleBody.article_id.in_(own_ids[start : start + SQL_CHUNK])
+            )
+            remove_document_frequencies([decode_text(codec, data) for codec, data in bodies])
+        members = UserTopicArticle.query.filter(UserTopicArticle.article_id.in_(own_articles))
+        for member in members.all():
+            update_topic_centroids(member.user_id, db.session.get(Article, member.article_id), None)
+        others = reading_list_rows().filter(
+            reading_list.c.article_id.in_(own_articles),
+            reading_list.c.user_id != current_user.id,
+        )
+        deltas = RollupDeltas()
+        for row in others:
+            deltas.add(*row, sign=-1)
+        if deltas.user_ids():
+            apply_rollup_deltas(deltas)
+            bump_history_version(deltas.user_ids())
 
         # Now, delete the user itself
         db.session.delete(current_user)
@@ -1079,88 +2111,333 @@ def google_callback():
 
 
 # Dashboard Data Endpoints
-@app.route("/dashboard", methods=["GET"])
-@token_required
-def dashboard(current_user):
+DASHBOARD_PAGE_SIZE = 50
+DASHBOARD_MAX_PAGE_SIZE = 200
+
+
+def bump_history_version(user_ids):
+    """
+    Marks the reading history of user_ids (a list or a select of ids) as changed,
+    so their cached dashboard responses stop matching. Runs in the caller's transaction.
+    """
+    db.session.execute(
+        db.update(User)
+        .where(User.id.in_(user_ids))
+        .values(history_version=User.history_version + 1)
+    )
+
+
+def article_readers(article_ids):
+    """Select of the ids of every user with one of article_ids in their reading list."""
+    return db.select(reading_list.c.user_id).where(reading_list.c.article_id.in_(article_ids))
+
+
+def in_reading_list(user_id, article_id):
+    # primary key lookup instead of loading the whole reading list
+    return db.session.query(
+        db.exists().where(
+            reading_list.c.user_id == user_id, reading_list.c.article_id == article_id
+        )
+    ).scalar()
+
+
+def reading_list_rows(*extra_columns):
+    """
+    Query of (user_id, category, retrieved_day, domain, sentiment, *extra_columns) for
+    reading list entries, the fields the rollups are built from.
+    """
+    return (
+        db.session.query(
+            reading_list.c.user_id,
+            Article.category,
+            Article.retrieved_day,
+            Article.domain,
+            Article.sentiment_score,
+            *extra_columns,
+        )
+        .select_from(reading_list)
+        .join(Article, Article.id == reading_list.c.article_id)
+    )
+
+
+def apply_rollup_deltas(deltas):
+    """Adds RollupDeltas to the rollup tables with upserts, in the caller's transaction."""
+    for kind in ROLLUP_KINDS:
+        model = ROLLUP_MODELS[kind]
+        # sorted rows keep row-lock order consistent between concurrent writers
+        rows = [
+            dict(zip(("user_id", kind) + ROLLUP_COLUMNS, row)) for row in deltas.rows(kind)
+        ]
+        for start in range(0, len(rows), SQL_CHUNK):
+            stmt = dialect_insert(model).values(rows[start : start + SQL_CHUNK])
+            db.session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=["user_id", kind],
+                    set_={c: getattr(model, c) + stmt.excluded[c] for c in ROLLUP_COLUMNS},
+                )
+            )
+    user_ids = deltas.user_ids()
+    for start in range(0, len(user_ids), SQL_CHUNK):
+        chunk = user_ids[start : start + SQL_CHUNK]
+        for model in ROLLUP_MODELS.values():
+            # buckets whose last article left
+            db.session.execute(
+                db.delete(model).where(model.user_id.in_(chunk), model.article_count <= 0)
+            )
+
+
+def move_category_rollups(article_ids, new_categories):
+    """
+    Moves articles to new categories ({article id: category}) in the category rollups
+    of every reader. Call before the articles are updated.
+    """
+    deltas = RollupDeltas()
+    for start in range(0, len(article_ids), SQL_CHUNK):
+        rows = reading_list_rows(Article.id).filter(
+            reading_list.c.article_id.in_(article_ids[start : start + SQL_CHUNK])
+        )
+        for user_id, category, day, domain, sentiment, article_id in rows:
+            fields = (day, domain, sentiment)
+            deltas.add(user_id, category, *fields, sign=-1, kinds=("category",))
+            deltas.add(user_id, new_categories[article_id], *fields, kinds=("category",))
+    apply_rollup_deltas(deltas)
+
+
+def history_response(user, build):
+    """
+    JSON response from build() with an ETag derived from the user's history version and
+    the request URL. A matching If-None-Match gets a 304 without calling build().
+    """
+    raw = f"{user.id}:{user.history_version}:{request.full_path}"
+    etag = hashlib.sha256(raw.encode()).hexdigest()[:32]
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        response = jsonify(build())
+    response.set_etag(etag)
+    # browsers revalidate every time instead of showing a stale history
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def encode_cursor(retrieved_at, article_id):
+    raw = json.dumps([retrieved_at.isoformat(), article_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """(retrieved_at, article id) of a cursor from encode_cursor, ValueError if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        retrieved_at, article_id = json.loads(raw)
+        return dt.datetime.fromisoformat(retrieved_at), int(article_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def parse_day(value, name):
+    try:
+        return dt.datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        raise ValueError(f"{name} must be a YYYY-MM-DD date")
+
+
+def parse_page_args(args):
+    """
+    Listing options from the query parameters: limit, cursor (next_cursor of the
+    previous page), category, domain and from/to (YYYY-MM-DD, inclusive).
+    Raises ValueError with a message for the client.
+    """
+    domain = args.get("domain", "").strip().replace("www.", "")
+    return {
+        "limit": min(max(int(args.get("limit", DASHBOARD_PAGE_SIZE)), 1), DASHBOARD_MAX_PAGE_SIZE),
+        "cursor": decode_cursor(args["cursor"]) if args.get("cursor") else None,
+        "category": args.get("category") or None,
+        "domain": domain or None,
+        "start": parse_day(args["from"], "from") if args.get("from") else None,
+        "end": parse_day(args["to"], "to") if args.get("to") else None,
+    }
+
+
+def history_page(user, limit, cursor, category, domain, start, end):
+    """One page of the user's reading history, newest first."""
+    query = reading_list_query(
+        user.id,
+        Article.id,
+        Article.title,
+        Article.url,
+        Article.sentiment_score,
+        Article.keywords,
+        Article.category,
+        Article.retrieved_at,
+    )
+    if category:
+        query = query.filter(Article.category == category)
+    if domain:
+        query = query.filter(Article.domain == domain)
+    if start is not None:
+        query = query.filter(Article.retrieved_at >= start)
+    if end is not None:
+        query = query.filter(Article.retrieved_at < end + dt.timedelta(days=1))
+    if cursor is not None:
+        # keyset pagination: strictly after the last row of the previous page
+        retrieved_at, article_id = cursor
+        query = query.filter(
+            or_(
+                Article.retrieved_at < retrieved_at,
+                and_(Article.retrieved_at == retrieved_at, Article.id < article_id),
+            )
+        )
+    rows = (
+        query.order_by(Article.retrieved_at.desc(), Article.id.desc())
+        .limit(limit + 1)
+        .all()
+    )
+    page = rows[:limit]
     articles = [
         {
-            "id": a.id,
-            "title": a.title,
-            "url": a.url,
-            "sentiment": a.sentiment_score,
-            "keywords": a.keywords,
-            "category": a.category,
+            "id": r.id,
+            "title": r.title,
+            "url": r.url,
+            "sentiment": r.sentiment_score,
+            "keywords": r.keywords,
+            "category": r.category,
+            "retrieved_at": r.retrieved_at.isoformat(),
         }
-        for a in current_user.articles
+        for r in page
     ]
-    return jsonify(articles)
+    next_cursor = None
+    if len(rows) > limit:
+        next_cursor = encode_cursor(page[-1].retrieved_at, page[-1].id)
+    return {"articles": articles, "next_cursor": next_cursor}
 
 
-@app.route("/category_analysis", methods=["GET"])
+@app.route("/dashboard", methods=["GET"])
 @token_required
-def category_analysis(current_user):
-    category_sentiments = defaultdict(lambda: {"total_score": 0, "count": 0})
-    for article in current_user.articles:
-        if article.category and article.sentiment_score is not None:
-            category_sentiments[article.category][
-                "total_score"
-            ] += article.sentiment_score
-            category_sentiments[article.category]["count"] += 1
+def dashboard(current_user):
+    """One page of the user's reading history, see parse_page_args for the parameters."""
+    try:
+        options = parse_page_args(request.args)
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+    return history_response(current_user, lambda: history_page(current_user, **options))
+
+
+def reading_list_query(user_id, *columns):
+    """Query over the user's reading list joined to Article, selecting only columns."""
+    return (
+        db.session.query(*columns)
+        .select_from(reading_list)
+        .join(Article, Article.id == reading_list.c.article_id)
+        .filter(reading_list.c.user_id == user_id)
+    )
+
+
+def category_analysis_data(user):
+    rows = UserCategoryRollup.query.filter(
+        UserCategoryRollup.user_id == user.id,
+        UserCategoryRollup.category != "",
+        UserCategoryRollup.sentiment_count > 0,
+    )
+    # article_count has always been the number of scored articles in the category
     analysis_results = [
         {
-            "category": cat,
-            "average_sentiment": data["total_score"] / data["count"],
-            "article_count": data["count"],
+            "category": r.category,
+            "average_sentiment": r.sentiment_sum / r.sentiment_count,
+            "article_count": r.sentiment_count,
         }
-        for cat, data in category_sentiments.items()
-        if data["count"] > 0
+        for r in rows
     ]
     analysis_results.sort(key=lambda x: (-x["article_count"], x["category"]))
-    return jsonify(analysis_results)
+    return analysis_results
+
+
+@app.route("/category_analysis", methods=["GET"])
+@token_required
+def category_analysis(current_user):
+    return jsonify(category_analysis_data(current_user))
+
+
+def source_analysis_data(user):
+    rows = UserDomainRollup.query.filter(
+        UserDomainRollup.user_id == user.id, UserDomainRollup.article_count > 0
+    )
+    sorted_domains = sorted(rows, key=lambda r: (-r.article_count, r.domain))
+    return [{"domain": r.domain, "count": r.article_count} for r in sorted_domains]
 
 
 @app.route("/source_analysis", methods=["GET"])
 @token_required
 def source_analysis(current_user):
-    domains = [
-        urlparse(article.url).netloc.replace("www.", "")
-        for article in current_user.articles
-    ]
-    domain_counts = Counter(domains)
-    sorted_domains = sorted(domain_counts.items(), key=lambda item: (-item[1], item[0]))
-    result = [{"domain": domain, "count": count} for domain, count in sorted_domains]
-    return jsonify(result)
+    return jsonify(source_analysis_data(current_user))
 
 
-@app.route("/sentiment_timeline", methods=["GET"])
-@token_required
-def sentiment_timeline(current_user):
+def sentiment_timeline_data(user):
     """
     Groups articles by date and calculates the average sentiment
     and article count for each day.
     """
-    daily_data = defaultdict(lambda: {"scores": [], "count": 0})
-
-    for article in current_user.articles:
-        day = article.retrieved_at.strftime("%Y-%m-%d")
-        daily_data[day]["scores"].append(article.sentiment_score)
-        daily_data[day]["count"] += 1
+    rows = UserDayRollup.query.filter(
+        UserDayRollup.user_id == user.id, UserDayRollup.article_count > 0
+    ).order_by(UserDayRollup.day)
 
     analysis_results = []
-    for day, data in daily_data.items():
-        if data["count"] > 0:
-            average = sum(data["scores"]) / len(data["scores"])
-            analysis_results.append(
-                {
-                    "date": day,
-                    "average_sentiment": average,
-                    "article_count": data["count"],  # Add the article count
-                }
-            )
+    for r in rows:
+        analysis_results.append(
+            {
+                "date": r.day,
+                # articles saved without a score do not count towards the average
+                "average_sentiment": (
+                    r.sentiment_sum / r.sentiment_count if r.sentiment_count else None
+                ),
+                "article_count": r.article_count,  # Add the article count
+            }
+        )
+
+    return analysis_results
+
+
+@app.route("/sentiment_timeline", methods=["GET"])
+@token_required
+def sentiment_timeline(current_user):
+    return jsonify(sentiment_timeline_data(current_user))
 
-    analysis_results.sort(key=lambda item: item["date"])
 
-    return jsonify(analysis_results)
+DASHBOARD_SECTIONS = ("articles", "categories", "sources", "timeline", "topics")
+
+
+@app.route("/dashboard_bundle", methods=["GET"])
+@token_required
+def dashboard_bundle(current_user):
+    """
+    Every dashboard view in one response, so a page load is one request instead of five.
+    sections is a comma-separated subset of articles, categories, sources, timeline and
+    topics (all by default); articles takes the same parameters as /dashboard.
+    """
+    sections = request.args.get("sections")
+    if sections:
+        sections = [s.strip() for s in sections.split(",") if s.strip()]
+    else:
+        sections = list(DASHBOARD_SECTIONS)
+    unknown = [s for s in sections if s not in DASHBOARD_SECTIONS]
+    if unknown:
+        return jsonify({"message": f"Unknown sections: {', '.join(unknown)}"}), 400
+    try:
+        options = parse_page_args(request.args)
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    def build():
+        builders = {
+            "articles": lambda: history_page(current_user, **options),
+            "categories": lambda: category_analysis_data(current_user),
+            "sources": lambda: source_analysis_data(current_user),
+            "timeline": lambda: sentiment_timeline_data(current_user),
+            "topics": lambda: topics_data(current_user),
+        }
+        return {name: builders[name]() for name in sections}
+
+    return history_response(current_user, build)
 
 
 @app.route("/move_article", methods=["POST"])
@@ -1181,9 +2458,15 @@ def move_article(current_user):
 
     article = db.session.get(Article, article_id)
 
-    if not article or article not in current_user.articles:
+    if not article or not in_reading_list(current_user.id, article.id):
         return jsonify({"message": "Article not found or access denied"}), 404
 
+    # this user's centroids follow their own moves, whatever the shared category is
+    update_topic_centroids(current_user.id, article, new_category)
+    if article.category != new_category:
+        # the category is shared, so every reader's dashboard and rollups change
+        bump_history_version(article_readers([article.id]))
+        move_category_rollups([article.id], {article.id: new_category})
     article.category = new_category
     db.session.commit()
     return jsonify(
@@ -1197,12 +2480,12 @@ def move_article(current_user):
 @app.route("/topics", methods=["GET"])
 @token_required
 def get_topics(current_user):
-    custom_topics = [
-        topic.name for topic in UserTopic.query.filter_by(user_id=current_user.id).all()
-    ]
-    return jsonify(
-        {"default_topics": DEFAULT_TOPICS, "custom_topics": sorted(custom_topics)}
-    )
+    return jsonify(topics_data(current_user))
+
+
+def topics_data(user):
+    custom_topics = [topic.name for topic in UserTopic.query.filter_by(user_id=user.id).all()]
+    return {"default_topics": DEFAULT_TOPICS, "custom_topics": sorted(custom_topics)}
 
 
 @app.route("/topics", methods=["POST"])
@@ -1219,6 +2502,8 @@ def create_topic(current_user):
         return jsonify({"message": "Topic already exists"}), 409
     topic = UserTopic(name=new_topic_name, user_id=current_user.id)
     db.session.add(topic)
+    # the topic list is part of /dashboard_bundle
+    bump_history_version([current_user.id])
     db.session.commit()
     return jsonify({"message": "Topic created successfully"}), 201
 
@@ -1233,9 +2518,11 @@ def delete_topic(current_user, topic_name):
     ).first()
     if not topic_to_delete:
         return jsonify({"message": "Custom topic not found"}), 404
-    articles_in_topic = Article.query.filter(
-        Article.readers.any(id=current_user.id), Article.category == topic_name
-    ).first()
+    articles_in_topic = (
+        reading_list_query(current_user.id, Article.id)
+        .filter(Article.category == topic_name)
+        .first()
+    )
     if articles_in_topic:
         return (
             jsonify(
@@ -1243,8 +2530,13 @@ def delete_topic(current_user, topic_name):
             ),
             409,
         )
+    UserTopicArticle.query.filter_by(topic_id=topic_to_delete.id).delete()
+    UserTopicCentroidTerm.query.filter_by(topic_id=topic_to_delete.id).delete()
+    UserTopicCentroid.query.filter_by(topic_id=topic_to_delete.id).delete()
     db.session.delete(topic_to_delete)
+    bump_history_version([current_user.id])
     db.session.commit()
+    user_centroids.invalidate(current_user.id)
     return jsonify({"message": "Topic deleted successfully"})
 
 
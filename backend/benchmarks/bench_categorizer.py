@@ -0,0 +1,132 @@
+# Compares the vocabulary-based TfidfVectorizer categorizer with the hashing
+# categorizer (CATEGORIZER_MODE=hashing) on the labelled news CSV: accuracy
+# against the Type column, agreement, latency and memory.
+#
+# Two setups are measured: the hand-written CATEGORY_TEXTS fingerprints used in
+# production, and fingerprints built from the first half of the CSV (one big
+# document per label), which is where the vocabulary grows.
+#
+#   python benchmarks/bench_categorizer.py
+import argparse
+import csv
+import os
+import pickle
+import statistics
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+from nlp import CATEGORIZER_MODES, CATEGORY_TEXTS, fit_categorizer, normalized_fingerprints  # noqa: E402
+
+CSV_PATH = os.path.join(BACKEND_DIR, "news_sentiment_analysis.csv")
+# same cut-off as categorize_articles in app.py
+MIN_CATEGORY_SIMILARITY = 0.02
+
+
+def load_rows():
+    with open(CSV_PATH, encoding="utf-8") as f:
+        return [(f"{r['Title']}. {r['Description']}", r["Type"]) for r in csv.DictReader(f)]
+
+
+def fit(mode, category_texts):
+    """Fits a categorizer, returns (names, vectorizer, weights, bytes allocated, pickled bytes)."""
+    tracemalloc.start()
+    vectorizer, matrix = fit_categorizer(mode, category_texts)
+    weights = normalized_fingerprints(matrix)
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    size = len(pickle.dumps((vectorizer, weights)))
+    return list(category_texts), vectorizer, weights, retained, size
+
+
+def predict(names, vectorizer, weights, texts):
+    sims = vectorizer.transform(texts) @ weights
+    sims = sims.toarray() if hasattr(sims, "toarray") else sims
+    best = sims.argmax(axis=1)
+    return [
+        names[idx] if sims[row, idx] >= MIN_CATEGORY_SIMILARITY else "Other"
+        for row, idx in enumerate(best)
+    ]
+
+
+def evaluate(setup, category_texts, rows, single_rows):
+    texts = [t for t, _ in rows]
+    labels = [label for _, label in rows]
+    # "General" has no matching category, so it is left out of the accuracy
+    scored = [i for i, label in enumerate(labels) if label in category_texts]
+
+    results = {}
+    for mode in CATEGORIZER_MODES:
+        names, vectorizer, weights, retained, size = fit(mode, category_texts)
+        predict(names, vectorizer, weights, texts[:10])  # warm up
+
+        single = []
+        for text in texts[:single_rows]:
+            start = time.perf_counter()
+            predict(names, vectorizer, weights, [text])
+            single.append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        predictions = predict(names, vectorizer, weights, texts)
+        batch_s = time.perf_counter() - start
+
+        vocabulary = getattr(vectorizer, "vocabulary_", None)
+        results[mode] = {
+            "predictions": predictions,
+            "accuracy": sum(predictions[i] == labels[i] for i in scored) / len(scored),
+            "vocabulary terms": len(vocabulary) if vocabulary is not None else 0,
+            "fitted state (MB)": retained / 1e6,
+            "pickled size (MB)": size / 1e6,
+            "p50 single (ms)": statistics.median(single),
+            "batch rows/sec": len(texts) / batch_s,
+        }
+
+    agreement = sum(
+        a == b for a, b in zip(*(results[m]["predictions"] for m in CATEGORIZER_MODES))
+    ) / len(texts)
+    print(f"--- {setup}: {len(texts)} rows, accuracy on {len(scored)} labelled rows ---")
+    print(f"{'':22}" + "".join(f"{mode:>14}" for mode in CATEGORIZER_MODES))
+    for key in [
+        "accuracy",
+        "vocabulary terms",
+        "fitted state (MB)",
+        "pickled size (MB)",
+        "p50 single (ms)",
+        "batch rows/sec",
+    ]:
+        cells = "".join(f"{results[mode][key]:>14.3f}" for mode in CATEGORIZER_MODES)
+        print(f"{key:22}{cells}")
+    print(f"{'prediction agreement':22}{agreement:>14.3f}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark TF-IDF vs hashing categorizers.")
+    parser.add_argument(
+        "--single-rows", type=int, default=300, help="rows timed one at a time for latency"
+    )
+    args = parser.parse_args()
+    rows = load_rows()
+    # import sklearn/scipy before anything is traced, so only fitted state is counted
+    for mode in CATEGORIZER_MODES:
+        fit(mode, {"a": "warm up", "b": "imports"})
+
+    evaluate("CATEGORY_TEXTS fingerprints", CATEGORY_TEXTS, rows, args.single_rows)
+
+    # fingerprints fitted on half the corpus, evaluated on the other half
+    train, test = rows[::2], rows[1::2]
+    corpus_texts = defaultdict(list)
+    for text, label in train:
+        if label != "General":
+            corpus_texts[label].append(text)
+    evaluate(
+        "corpus-fitted fingerprints",
+        {label: " ".join(texts) for label, texts in sorted(corpus_texts.items())},
+        test,
+        args.single_rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+# Checks that extract_article_text matches the previous quadratic heuristic on a
+# fixture corpus and measures the speedup on large synthetic pages.
+#
+#   python benchmarks/bench_extraction.py
+#   python benchmarks/bench_extraction.py --corpus path/to/saved/pages --nodes 20000
+import argparse
+import glob
+import os
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from extraction import extract_article_text, find_candidates  # noqa: E402
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def legacy_extract_article_text(soup, url=None):
+    """The original implementation, kept here as the reference output."""
+    for tag in ["script", "style", "header", "footer", "nav", "aside", "form", "noscript"]:
+        for s in soup.select(tag):
+            s.decompose()
+
+    selectors = [
+        "article", "[role='main']", "#main", "#main-content", ".main-content",
+        ".article", ".article-body", "div.article-body", ".article-content",
+        ".post-content", ".entry-content", ".content__article-body", ".story-body",
+        ".StandardArticleBody_body", ".content-body", "[data-testid='article-body']",
+        "[itemprop='articleBody']", "[class*='article-body']", "[class*='story-body']",
+        "[class*='post-body']",
+    ]
+    for selector in selectors:
+        element = soup.select_one(selector)
+        if element:
+            text = element.get_text(separator="\n", strip=True)
+            if len(text) > 250:
+                return text
+
+    text = legacy_heuristic(soup)
+    if text:
+        return text
+
+    paragraphs = soup.find_all("p")
+    combined_paragraphs = "\n".join([p.get_text(strip=True) for p in paragraphs])
+    if len(combined_paragraphs) > 250:
+        return combined_paragraphs
+    return soup.get_text(separator="\n", strip=True)
+
+
+def legacy_heuristic(soup):
+    """Per-container get_text/find_all scoring, then the longest div as plan b."""
+
+    def score_candidate(tag):
+        text = tag.get_text(separator="\n", strip=True)
+        p_tags = tag.find_all("p")
+        a_tags = tag.find_all("a")
+        img_tags = tag.find_all("img")
+        score = len(text) + len(p_tags) * 20 - len(a_tags) * 10 - len(img_tags) * 10
+        return score, text
+
+    best_score = 0
+    best_text = ""
+    for container in soup.find_all(["div", "section"]):
+        score, text = score_candidate(container)
+        if score > best_score and len(text) > 250:
+            best_score = score
+            best_text = text
+    if best_text:
+        return best_text
+
+    longest_text = ""
+    max_len = 0
+    for div in soup.find_all("div"):
+        if div:
+            text = div.get_text(separator="\n", strip=True)
+            if len(text) > max_len:
+                max_len = len(text)
+                longest_text = text
+    if len(longest_text) > 250:
+        return longest_text
+    return ""
+
+
+def single_pass_heuristic(soup):
+    best_candidate, longest_div = find_candidates(soup)
+    if best_candidate is not None:
+        return best_candidate.get_text(separator="\n", strip=True)
+    if longest_div is not None:
+        text = longest_div.get_text(separator="\n", strip=True)
+        if len(text) > 250:
+            return text
+    return ""
+
+
+def synthetic_page(target_nodes, depth=12):
+    """Deeply nested div soup with no article selectors, so the heuristic does the work."""
+    sentence = "Officials said the measure would take effect next spring after a final vote. "
+    parts = ["<html><head><title>Synthetic</title></head><body>"]
+    nodes = 0
+    block = 0
+    while nodes < target_nodes:
+        parts.append("<div class='wrap'>" * depth)
+        parts.append(f"<p>{sentence * (1 + block % 4)}</p><a href='/l{block}'>link</a>")
+        if block % 5 == 0:
+            parts.append("<img src='x.png'>")
+        parts.append("</div>" * depth)
+        nodes += depth + 3
+        block += 1
+    parts.append("</body></html>")
+    return "".join(parts)
+
+
+def timed(fn, html, repeat):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        # parsing is excluded, both versions get a fresh tree since extraction mutates it
+        soup = BeautifulSoup(html, "html.parser")
+        start = time.perf_counter()
+        result = fn(soup)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare extraction against the legacy heuristic.")
+    parser.add_argument("--corpus", default=FIXTURES_DIR, help="directory of saved .html pages")
+    parser.add_argument("--nodes", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    mismatches = 0
+    paths = sorted(glob.glob(os.path.join(args.corpus, "*.html")))
+    print(f"--- Parity on {len(paths)} pages from {args.corpus} ---")
+    for path in paths:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            html = f.read()
+        expected, legacy_s = timed(legacy_extract_article_text, html, 1)
+        actual, new_s = timed(extract_article_text, html, 1)
+        ok = expected == actual
+        mismatches += not ok
+        print(f"{'ok  ' if ok else 'DIFF'} {os.path.basename(path):40} "
+              f"legacy {legacy_s * 1000:8.1f} ms   new {new_s * 1000:8.1f} ms")
+
+    print("\n--- Synthetic nested pages (full extraction / heuristic only) ---")
+    for target in args.nodes:
+        html = synthetic_page(target)
+        expected, legacy_s = timed(legacy_extract_article_text, html, args.repeat)
+        actual, new_s = timed(extract_article_text, html, args.repeat)
+        expected_h, legacy_h = timed(legacy_heuristic, html, args.repeat)
+        actual_h, new_h = timed(single_pass_heuristic, html, args.repeat)
+        ok = expected == actual and expected_h == actual_h
+        mismatches += not ok
+        print(f"{'ok  ' if ok else 'DIFF'} ~{target:>6} nodes   "
+              f"full {legacy_s * 1000:9.1f} -> {new_s * 1000:8.1f} ms ({legacy_s / new_s:5.1f}x)   "
+              f"heuristic {legacy_h * 1000:9.1f} -> {new_h * 1000:7.1f} ms ({legacy_h / new_h:5.1f}x)")
+
+    if mismatches:
+        print(f"\n{mismatches} page(s) differ from the legacy output")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# Import-time report for app.py built from `python -X importtime`, to catch
+# startup regressions (a heavy library creeping back into module import).
+#
+#   python benchmarks/bench_import.py                        # report
+#   python benchmarks/bench_import.py --save baseline.json   # record a baseline
+#   python benchmarks/bench_import.py --compare baseline.json --max-regression-ms 150
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# libraries that must only be imported by the code path that needs them
+HEAVY_PACKAGES = ("torch", "transformers", "sklearn", "scipy", "nltk", "selenium", "onnxruntime")
+
+LINE_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def parse_importtime(stderr):
+    """Returns {module: (self_us, cumulative_us, depth)} from -X importtime output."""
+    modules = {}
+    for line in stderr.splitlines():
+        match = LINE_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules[name] = (int(self_us), int(cumulative_us), len(indent) // 2)
+    return modules
+
+
+def run_once(module):
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="0")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        sys.exit(f"import {module} failed:\n{proc.stderr[-2000:]}")
+    return parse_importtime(proc.stderr)
+
+
+def measure(module, runs):
+    """Median self/cumulative time per module over several interpreter starts."""
+    samples = [run_once(module) for _ in range(runs)]
+    names = set().union(*samples)
+    report = {}
+    for name in names:
+        rows = [s[name] for s in samples if name in s]
+        report[name] = {
+            "self_ms": statistics.median(r[0] for r in rows) / 1000,
+            "cumulative_ms": statistics.median(r[1] for r in rows) / 1000,
+            "depth": rows[0][2],
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report import time of the backend app.")
+    parser.add_argument("--module", default="app")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--save", help="write the report to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON written by --save")
+    parser.add_argument(
+        "--max-regression-ms",
+        type=float,
+        default=None,
+        help="exit non-zero if the total grew by more than this against --compare",
+    )
+    args = parser.parse_args()
+
+    run_once(args.module)  # warm the bytecode and OS file caches
+    report = measure(args.module, args.runs)
+    total = report[args.module]["cumulative_ms"]
+
+    print(f"--- import {args.module}: {total:.0f} ms (median of {args.runs} runs) ---\n")
+    direct = sorted(
+        (r["cumulative_ms"], name) for name, r in report.items() if r["depth"] == 1
+    )
+    print(f"slowest direct imports of {args.module}")
+    for ms, name in reversed(direct[-args.top:]):
+        print(f"  {name:40}{ms:>9.1f} ms")
+
+    print("\nslowest modules by self time")
+    by_self = sorted((r["self_ms"], name) for name, r in report.items())
+    for ms, name in reversed(by_self[-args.top:]):
+        print(f"  {name:40}{ms:>9.1f} ms")
+
+    heavy = sorted(
+        name for name in report if name.split(".")[0] in HEAVY_PACKAGES and "." not in name
+    )
+    print(f"\nheavy packages imported at startup: {', '.join(heavy) or 'none'}")
+
+    failed = False
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        base_total = baseline[args.module]["cumulative_ms"]
+        print(f"\nbaseline {base_total:.0f} ms -> now {total:.0f} ms ({total - base_total:+.0f} ms)")
+        added = sorted(n for n in report if n not in baseline and "." not in n)
+        if added:
+            print(f"new top-level packages: {', '.join(added)}")
+        if args.max_regression_ms is not None and total - base_total > args.max_regression_ms:
+            print(f"--- IMPORT TIME REGRESSION: more than {args.max_regression_ms:.0f} ms slower ---")
+            failed = True
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=1, sort_keys=True)
+        print(f"\nreport written to {args.save}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# Compares the original per-token keyword extraction with the memoized
+# KeywordEngine (one call per text and extract_batch) on the labelled news CSV,
+# and checks both return the same keywords for every row.
+#
+#   python benchmarks/bench_keywords.py --repeat 3
+import argparse
+import csv
+import os
+import re
+import sys
+import time
+from collections import Counter
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+from keywords import KeywordEngine  # noqa: E402
+from nlp import NlpResources, artifact_path  # noqa: E402
+
+CSV_PATH = os.path.join(BACKEND_DIR, "news_sentiment_analysis.csv")
+
+
+def legacy_extract_keywords(text, stop_words, lemmatizer, max_keywords=7):
+    """extract_keywords as it was before the keyword engine."""
+    text = text.lower()
+    words = re.findall(r"\b[a-z]+\b", text)
+    words = [w for w in words if w not in stop_words and len(w) > 3]
+    words = [lemmatizer.lemmatize(w) for w in words]
+    keyword_counts = Counter(words)
+    return [word for word, _ in keyword_counts.most_common(max_keywords)]
+
+
+def load_texts():
+    with open(CSV_PATH, encoding="utf-8") as f:
+        return [f"{row['Title']}. {row['Description']}" for row in csv.DictReader(f)]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark keyword extraction.")
+    parser.add_argument("--repeat", type=int, default=3, help="passes over the CSV")
+    parser.add_argument("--memo-size", type=int, default=50000)
+    args = parser.parse_args()
+
+    nlp = NlpResources(artifact_path())
+    stop_words = nlp.stop_words
+    lemmatizer = nlp.lemmatizer
+    lemmatizer.lemmatize("warmup")  # load WordNet outside the timings
+
+    texts = load_texts() * args.repeat
+    print(f"--- {len(texts)} texts ({len(texts) // args.repeat} rows x {args.repeat}) ---\n")
+
+    legacy, legacy_s = timed(
+        lambda: [legacy_extract_keywords(t, stop_words, lemmatizer) for t in texts]
+    )
+    engine = KeywordEngine(stop_words, lemmatizer.lemmatize, args.memo_size)
+    single, single_s = timed(lambda: [engine.extract(t) for t in texts])
+    engine = KeywordEngine(stop_words, lemmatizer.lemmatize, args.memo_size)
+    batch, batch_s = timed(lambda: engine.extract_batch(texts))
+
+    print(f"{'':28}{'seconds':>10}{'texts/sec':>12}{'speedup':>10}")
+    for label, seconds in [
+        ("legacy", legacy_s),
+        ("engine.extract", single_s),
+        ("engine.extract_batch", batch_s),
+    ]:
+        print(f"{label:28}{seconds:>10.3f}{len(texts) / seconds:>12.0f}{legacy_s / seconds:>9.1f}x")
+    print(f"\nmemoized words: {len(engine._memo)}")
+
+    mismatches = sum(a != b or a != c for a, b, c in zip(legacy, single, batch))
+    print(f"rows with different keywords: {mismatches}")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
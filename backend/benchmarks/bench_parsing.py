@@ -0,0 +1,176 @@
+# Compares the BeautifulSoup html.parser path, with and without the pre-parse
+# irrelevant-markup filter, against the lxml fast path used by /analyze (which
+# never runs the filter): parse + title/canonical/main-text extraction time and
+# peak memory.
+#
+#   python benchmarks/bench_parsing.py --corpus path/to/saved/news/pages
+import argparse
+import glob
+import multiprocessing as mp
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+from bs4 import BeautifulSoup
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+from extraction import ParsedPage, extract_article_text  # noqa: E402
+from bench_extraction import FIXTURES_DIR, synthetic_page  # noqa: E402
+
+
+def soup_path(html):
+    soup = BeautifulSoup(html, "html.parser")
+    title_tag = soup.find("title")
+    title = title_tag.get_text(strip=True) if title_tag else ""
+    url_element = soup.find("link", rel="canonical")
+    url = url_element["href"] if url_element else None
+    return title, url, extract_article_text(soup)
+
+
+def page_path(fast, prefilter):
+    def run(html):
+        page = ParsedPage(html, fast=fast, prefilter=prefilter)
+        return page.title, page.canonical_url, page.article_text()
+
+    return run
+
+
+PATHS = {
+    "html.parser": soup_path,
+    "html.parser+filter": page_path(fast=False, prefilter=True),
+    "lxml": page_path(fast=True, prefilter=True),
+}
+
+
+def script_heavy_page(script_kb, paragraphs=12):
+    """News-like page where inline JS/JSON is most of the bytes."""
+    blob = "window.__STATE__ = " + '{"items": [' + ",".join(
+        f'{{"id": {i}, "html": "<div class=\\"card\\">item {i}</div>"}}'
+        for i in range(script_kb * 12)
+    ) + "]};"
+    sentence = "The committee released its findings on Thursday after a year-long review. "
+    body = "".join(f"<p>{sentence * 4}</p>" for _ in range(paragraphs))
+    return (
+        "<html><head><title>Script heavy</title>"
+        "<link rel='canonical' href='https://example.com/story'>"
+        f"<script>{blob}</script><style>.a{{color:red}}</style></head><body>"
+        "<header><nav>" + "<a href='/s'>Section</a>" * 50 + "</nav></header>"
+        f"<div class='story'>{body}</div>"
+        f"<script>{blob}</script><footer>" + "<a href='/f'>Footer</a>" * 30 + "</footer>"
+        "</body></html>"
+    )
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # not available on Windows
+        return float("nan")
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _run(name, pages, queue):
+    """Runs in a fresh process so each path's peak RSS is measured on its own."""
+    fn = PATHS[name]
+    # warm up lazy imports and selector compilation (including the fallback
+    # path, which a page with no article exercises) outside the timed loop
+    fn(pages[0])
+    fn("<html><head><title>warm up</title></head><body><p>x</p></body></html>")
+    rss_before = peak_rss_mb()
+    timings = []
+    outputs = []
+    for html in pages:
+        start = time.perf_counter()
+        outputs.append(fn(html))
+        timings.append((time.perf_counter() - start) * 1000)
+
+    # second pass for the Python heap peak, tracemalloc slows everything down
+    heap_peaks = []
+    for html in pages:
+        tracemalloc.start()
+        fn(html)
+        heap_peaks.append(tracemalloc.get_traced_memory()[1] / 1e6)
+        tracemalloc.stop()
+    queue.put(
+        {
+            "timings": timings,
+            "outputs": outputs,
+            "heap_peaks_mb": heap_peaks,
+            "rss_growth_mb": peak_rss_mb() - rss_before,
+        }
+    )
+
+
+def measure(name, pages):
+    ctx = mp.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_run, args=(name, pages, queue))
+    proc.start()
+    report = queue.get()
+    proc.join()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark html.parser vs lxml page parsing.")
+    parser.add_argument("--corpus", default=FIXTURES_DIR, help="directory of saved .html pages")
+    parser.add_argument(
+        "--synthetic-nodes",
+        type=int,
+        default=50000,
+        help="also add a synthetic page of roughly this many nodes (0 to skip)",
+    )
+    parser.add_argument(
+        "--script-kb",
+        type=int,
+        default=2000,
+        help="also add a script-heavy page with about this much inline JS (0 to skip)",
+    )
+    args = parser.parse_args()
+
+    names = []
+    pages = []
+    for path in sorted(glob.glob(os.path.join(args.corpus, "*.html"))):
+        with open(path, encoding="utf-8", errors="replace") as f:
+            pages.append(f.read())
+        names.append(os.path.basename(path))
+    if args.synthetic_nodes:
+        pages.append(synthetic_page(args.synthetic_nodes))
+        names.append(f"synthetic-{args.synthetic_nodes}-nodes")
+    if args.script_kb:
+        pages.append(script_heavy_page(args.script_kb))
+        names.append(f"script-heavy-{args.script_kb}kb")
+
+    total_mb = sum(len(p.encode("utf-8")) for p in pages) / 1e6
+    print(f"--- {len(pages)} pages, {total_mb:.1f} MB of HTML ---\n")
+    reports = {name: measure(name, pages) for name in PATHS}
+    baseline = reports["html.parser"]
+
+    # per-page milliseconds, '*' marks text that differs from the html.parser baseline
+    print(f"{'page':34}" + "".join(f"{name:>20}" for name in PATHS))
+    for i, name in enumerate(names):
+        row = f"{name[:32]:34}"
+        for report in reports.values():
+            same = report["outputs"][i][2] == baseline["outputs"][i][2]
+            row += f"{report['timings'][i]:>19.1f}{' ' if same else '*'}"
+        print(row)
+
+    print("\nper-page Python heap peak (MB)")
+    for i, name in enumerate(names):
+        print(f"{name[:32]:34}" + "".join(f"{r['heap_peaks_mb'][i]:>19.2f} " for r in reports.values()))
+
+    print()
+    summary = [
+        ("total ms", lambda r: sum(r["timings"])),
+        ("median ms", lambda r: statistics.median(r["timings"])),
+        ("max python heap peak (MB)", lambda r: max(r["heap_peaks_mb"])),
+        ("RSS growth (MB)", lambda r: r["rss_growth_mb"]),
+    ]
+    for label, value in summary:
+        print(f"{label:34}" + "".join(f"{value(r):>19.1f} " for r in reports.values()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# Local HTTP server for exercising PageFetcher and /analyze_url without the
+# internet: serves the saved pages in benchmarks/fixtures with ETag and
+# Last-Modified headers and answers conditional GETs with 304.
+#
+#   python benchmarks/fixture_server.py --port 8765          # just serve
+#   python benchmarks/fixture_server.py --check              # fetch every page twice and report
+#
+# /analyze_url refuses loopback hosts unless FETCH_ALLOW_PRIVATE_HOSTS=true.
+import argparse
+import email.utils
+import hashlib
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+from bench_extraction import FIXTURES_DIR  # noqa: E402
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so pooled connections are reused
+    directory = FIXTURES_DIR
+    delay = 0.0
+    counts = {}  # status code -> responses sent, shared by all handler threads
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body=b"", headers=None):
+        FixtureHandler.counts[status] = FixtureHandler.counts.get(status, 0) + 1
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def do_GET(self):
+        if self.delay:
+            time.sleep(self.delay)
+        path = self.path.split("?")[0].lstrip("/")
+        if path.startswith("redirect/"):
+            return self._send(302, headers={"Location": "/" + path[len("redirect/"):]})
+        full = os.path.join(self.directory, os.path.basename(path))
+        if not path or not os.path.isfile(full):
+            return self._send(404, b"not found", {"Content-Type": "text/plain"})
+
+        with open(full, "rb") as f:
+            body = f.read()
+        mtime = int(os.path.getmtime(full))
+        validators = {
+            "ETag": '"' + hashlib.sha1(body).hexdigest() + '"',
+            "Last-Modified": email.utils.formatdate(mtime, usegmt=True),
+        }
+        if self.headers.get("If-None-Match") == validators["ETag"]:
+            return self._send(304, headers=validators)
+        since = self.headers.get("If-Modified-Since")
+        if since and not self.headers.get("If-None-Match"):
+            parsed = email.utils.parsedate_to_datetime(since)
+            if parsed and mtime <= parsed.timestamp():
+                return self._send(304, headers=validators)
+        self._send(200, body, {"Content-Type": "text/html; charset=utf-8", **validators})
+
+
+def serve(port=0, directory=FIXTURES_DIR, delay=0.0):
+    """Starts the server on a daemon thread, returns (server, base_url)."""
+    handler = type("Handler", (FixtureHandler,), {"directory": directory, "delay": delay})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def check(base_url, directory):
+    from fetcher import PageFetcher
+
+    fetcher = PageFetcher(allow_private_hosts=True)
+    names = sorted(n for n in os.listdir(directory) if n.endswith(".html"))
+    print(f"{'page':34}{'first':>22}{'second':>22}")
+    for name in names:
+        first = fetcher.fetch(f"{base_url}/{name}")
+        second = fetcher.fetch(f"{base_url}/{name}")
+        print(
+            f"{name[:32]:34}{first.cache_status:>13}{first.elapsed * 1000:>7.1f} ms"
+            f"{second.cache_status:>13}{second.elapsed * 1000:>7.1f} ms"
+        )
+        assert first.html == second.html
+    redirected = fetcher.fetch(f"{base_url}/redirect/{names[0]}")
+    print(f"redirect -> {redirected.url} ({redirected.cache_status})")
+    print(f"responses by status: {dict(sorted(FixtureHandler.counts.items()))}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve saved pages with ETag/Last-Modified support.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--directory", default=FIXTURES_DIR)
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds to wait before each response")
+    parser.add_argument("--check", action="store_true", help="run PageFetcher against the server and exit")
+    args = parser.parse_args()
+
+    server, base_url = serve(0 if args.check else args.port, args.directory, args.delay)
+    if args.check:
+        check(base_url, args.directory)
+        server.shutdown()
+        return
+    print(f"Serving {args.directory} at {base_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
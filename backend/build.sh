@@ -6,4 +6,6 @@ pip install -r requirements.txt
 
 python download_nltk_data.py
 
+python build_nlp_artifacts.py
+
 flask --app app db upgrade
\ No newline at end of file
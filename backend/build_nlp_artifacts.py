@@ -0,0 +1,19 @@
+# Fits the category vectorizer and collects the stopword set once at build time,
+# so app workers load them from a pickle instead of importing NLTK and fitting
+# on boot. Run after download_nltk_data.py.
+import os
+import sys
+
+from nlp import ARTIFACT_DIR, artifact_path, build_artifact
+
+directory = sys.argv[1] if len(sys.argv) > 1 else ARTIFACT_DIR
+path = artifact_path(directory)
+
+print(f"--- Building NLP artifact at {path}... ---")
+artifact = build_artifact(path)
+vectorizer, _ = artifact["categorizers"]["tfidf"]
+print(
+    f"--- NLP artifact built: {len(artifact['category_names'])} categories, "
+    f"{len(vectorizer.vocabulary_)} terms, {len(artifact['stop_words'])} stopwords, "
+    f"{os.path.getsize(path) / 1024:.1f} KB ---"
+)
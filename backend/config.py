@@ -20,6 +20,92 @@ class Config:
     GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
     GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET")
 
+    # Prebuilt vectorizer/fingerprint/stopword pickle written by build_nlp_artifacts.py
+    # (unset: nlp_artifacts/nlp-v<ARTIFACT_VERSION>.pkl next to the app)
+    NLP_ARTIFACT_PATH = os.getenv("NLP_ARTIFACT_PATH")
+    # "tfidf" (vocabulary-based vectorizer) or "hashing" (fixed buckets, constant memory)
+    CATEGORIZER_MODE = os.getenv("CATEGORIZER_MODE", "tfidf")
+    # distinct words whose stopword/lemma result is memoized by the keyword engine
+    KEYWORD_LEMMA_MEMO_SIZE = int(os.getenv("KEYWORD_LEMMA_MEMO_SIZE", "50000"))
+    # "tfidf" ranks keywords against the document frequencies of all stored articles,
+    # "frequency" by raw counts; tfidf falls back to counts until the corpus has
+    # KEYWORD_MIN_CORPUS_DOCS articles
+    KEYWORD_RANKING = os.getenv("KEYWORD_RANKING", "tfidf")
+    KEYWORD_MIN_CORPUS_DOCS = int(os.getenv("KEYWORD_MIN_CORPUS_DOCS", "20"))
+
+    # Custom topics are predicted from centroids of the articles a user moved into them
+    USER_TOPIC_MIN_SIMILARITY = float(os.getenv("USER_TOPIC_MIN_SIMILARITY", "0.15"))
+    USER_CENTROID_CACHE_USERS = int(os.getenv("USER_CENTROID_CACHE_USERS", "1000"))
+    USER_CENTROID_CACHE_TTL = float(os.getenv("USER_CENTROID_CACHE_TTL", "60"))
+
+    # Micro-batching of concurrent sentiment requests into one forward pass
+    SENTIMENT_BATCHING = os.getenv("SENTIMENT_BATCHING", "true").lower() == "true"
+    SENTIMENT_BATCH_MAX_SIZE = int(os.getenv("SENTIMENT_BATCH_MAX_SIZE", "16"))
+    SENTIMENT_BATCH_MAX_WAIT_MS = float(os.getenv("SENTIMENT_BATCH_MAX_WAIT_MS", "10"))
+
+    # "head" scores the first 512 characters, "chunked" scores the whole article
+    # in overlapping token windows combined with SENTIMENT_AGGREGATION
+    # (mean, length_weighted or max_magnitude)
+    SENTIMENT_MODE = os.getenv("SENTIMENT_MODE", "head")
+    SENTIMENT_AGGREGATION = os.getenv("SENTIMENT_AGGREGATION", "length_weighted")
+    SENTIMENT_WINDOW_OVERLAP = int(os.getenv("SENTIMENT_WINDOW_OVERLAP", "64"))
+    SENTIMENT_MAX_WINDOWS = int(os.getenv("SENTIMENT_MAX_WINDOWS", "8"))
+
+    # "pytorch" loads the fp32 transformers model, "onnx" loads the int8 model
+    # produced by export_onnx.py and runs it on ONNX Runtime CPU
+    SENTIMENT_BACKEND = os.getenv("SENTIMENT_BACKEND", "pytorch")
+    ONNX_MODEL_DIR = os.getenv(
+        "ONNX_MODEL_DIR", os.path.join(basedir, "out-of-the-loop-production-model-onnx")
+    )
+    ONNX_NUM_THREADS = int(os.getenv("ONNX_NUM_THREADS", "0"))
+
+    # Content-addressed cache of analysis results (per-process LRU + SQLite file
+    # shared by all workers on the host)
+    ANALYSIS_CACHE_ENABLED = os.getenv("ANALYSIS_CACHE_ENABLED", "true").lower() == "true"
+    ANALYSIS_CACHE_PATH = os.getenv(
+        "ANALYSIS_CACHE_PATH", os.path.join(basedir, "instance", "analysis_cache.sqlite3")
+    )
+    ANALYSIS_CACHE_MEMORY_ITEMS = int(os.getenv("ANALYSIS_CACHE_MEMORY_ITEMS", "1024"))
+    ANALYSIS_CACHE_MAX_MB = int(os.getenv("ANALYSIS_CACHE_MAX_MB", "256"))
+
+    # /analyze and /analyze_url reuse the server's own analysis of a page it fetched
+    # while it is younger than this and the model is unchanged (0 disables the shortcut)
+    ANALYSIS_MAX_AGE_HOURS = float(os.getenv("ANALYSIS_MAX_AGE_HOURS", "72"))
+
+    # Stored article bodies live in the article_body table, compressed with "zlib",
+    # "zstd" (needs the zstandard package, zlib otherwise) or "raw"
+    ARTICLE_TEXT_CODEC = os.getenv("ARTICLE_TEXT_CODEC", "zlib")
+    ARTICLE_TEXT_LEVEL = int(os.getenv("ARTICLE_TEXT_LEVEL", "6"))
+
+    # Most analyses accepted by one /save_analysis/batch request
+    SAVE_BATCH_MAX_ITEMS = int(os.getenv("SAVE_BATCH_MAX_ITEMS", "100"))
+
+    # Parse uploaded pages with lxml first, BeautifulSoup html.parser is the fallback
+    FAST_HTML_PARSER = os.getenv("FAST_HTML_PARSER", "true").lower() == "true"
+
+    # Cut boilerplate (related links, newsletter prompts, ...) off the article text
+    # before it is analyzed, see extraction.CUTOFF_PHRASES
+    CLEAN_ARTICLE_TEXT = os.getenv("CLEAN_ARTICLE_TEXT", "true").lower() == "true"
+
+    # A site's remembered extraction strategy is replaced after failing this many times in a row
+    STRATEGY_RELEARN_AFTER = int(os.getenv("STRATEGY_RELEARN_AFTER", "3"))
+
+    # /analyze body limits: bytes on the wire (possibly gzip/deflate compressed)
+    # and bytes after decompression
+    MAX_ANALYZE_BODY_KB = int(os.getenv("MAX_ANALYZE_BODY_KB", "4096"))
+    MAX_ANALYZE_DECODED_KB = int(os.getenv("MAX_ANALYZE_DECODED_KB", "16384"))
+
+    # Server-side page fetching for /analyze_url
+    FETCH_CONNECT_TIMEOUT = float(os.getenv("FETCH_CONNECT_TIMEOUT", "5"))
+    FETCH_READ_TIMEOUT = float(os.getenv("FETCH_READ_TIMEOUT", "15"))
+    FETCH_MAX_KB = int(os.getenv("FETCH_MAX_KB", "5120"))
+    FETCH_PER_HOST_LIMIT = int(os.getenv("FETCH_PER_HOST_LIMIT", "4"))
+    FETCH_POOL_SIZE = int(os.getenv("FETCH_POOL_SIZE", "20"))
+    FETCH_CACHE_MAX_MB = int(os.getenv("FETCH_CACHE_MAX_MB", "64"))
+    FETCH_USER_AGENT = os.getenv("FETCH_USER_AGENT", "EchoEscapeBot/1.0")
+    # only for local testing against a fixture server on 127.0.0.1
+    FETCH_ALLOW_PRIVATE_HOSTS = os.getenv("FETCH_ALLOW_PRIVATE_HOSTS", "false").lower() == "true"
+
 
 class DevelopmentConfig(Config):
     """Development-specific configuration."""
@@ -0,0 +1,168 @@
+# Exports the production sentiment model to a quantized ONNX model and checks it
+# against PyTorch before it is allowed to be used with SENTIMENT_BACKEND=onnx.
+#
+#   python export_onnx.py                 # export + parity + latency/RSS report
+#   python export_onnx.py --skip-export   # re-run the checks on an existing export
+import argparse
+import csv
+import multiprocessing as mp
+import os
+import statistics
+import sys
+import time
+
+from onnx_backend import INT8_MODEL_FILE, export_onnx
+
+basedir = os.path.abspath(os.path.dirname(__file__))
+MODEL_PATH = os.path.join(basedir, "out-of-the-loop-production-model")
+ONNX_DIR = os.path.join(basedir, "out-of-the-loop-production-model-onnx")
+CSV_PATH = os.path.join(basedir, "news_sentiment_analysis.csv")
+
+
+def load_labelled_texts(limit=None):
+    """Title + description of every labelled row, cut to 512 chars like /analyze does."""
+    texts = []
+    with open(CSV_PATH, encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            if not row.get("Sentiment"):
+                continue
+            text = f"{row['Title']}. {row['Description']}".strip()
+            texts.append(text[:512])
+            if limit and len(texts) >= limit:
+                break
+    return texts
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # not available on Windows
+        return float("nan")
+    # ru_maxrss is reported in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _measure_backend(backend, texts, batch_size, queue):
+    """Runs in a fresh process so RSS numbers are not polluted by the other backend."""
+    rss_before = peak_rss_mb()
+    load_start = time.perf_counter()
+    if backend == "pytorch":
+        from transformers import (
+            AutoModelForSequenceClassification,
+            AutoTokenizer,
+            pipeline,
+        )
+
+        model = AutoModelForSequenceClassification.from_pretrained(
+            MODEL_PATH, local_files_only=True
+        )
+        tokenizer = AutoTokenizer.from_pretrained(MODEL_PATH, local_files_only=True)
+        pipe = pipeline("sentiment-analysis", model=model, tokenizer=tokenizer)
+    else:
+        from onnx_backend import OnnxSentimentPipeline
+
+        pipe = OnnxSentimentPipeline(ONNX_DIR, INT8_MODEL_FILE)
+    load_seconds = time.perf_counter() - load_start
+
+    # single-item latency, the shape of an unbatched /analyze call
+    single = []
+    for text in texts[:100]:
+        start = time.perf_counter()
+        pipe(text, truncation=True)
+        single.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    results = pipe(texts, batch_size=batch_size, truncation=True)
+    batch_seconds = time.perf_counter() - start
+
+    queue.put(
+        {
+            "backend": backend,
+            "results": [(r["label"], r["score"]) for r in results],
+            "load_s": load_seconds,
+            "p50_ms": statistics.median(single),
+            "p95_ms": sorted(single)[int(len(single) * 0.95) - 1],
+            "throughput": len(texts) / batch_seconds,
+            "rss_base_mb": rss_before,
+            "rss_peak_mb": peak_rss_mb(),
+        }
+    )
+
+
+def measure(backend, texts, batch_size):
+    ctx = mp.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_measure_backend, args=(backend, texts, batch_size, queue))
+    proc.start()
+    report = queue.get()
+    proc.join()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Export the sentiment model to quantized ONNX and check parity."
+    )
+    parser.add_argument("--skip-export", action="store_true")
+    parser.add_argument("--limit", type=int, default=None, help="max labelled rows")
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.05,
+        help="max allowed mean |score difference| between PyTorch and ONNX",
+    )
+    parser.add_argument(
+        "--min-agreement",
+        type=float,
+        default=0.98,
+        help="min fraction of rows where both backends pick the same label",
+    )
+    args = parser.parse_args()
+
+    if not args.skip_export:
+        print(f"--- Exporting {MODEL_PATH} to {ONNX_DIR} ---", flush=True)
+        fp32_path, int8_path = export_onnx(MODEL_PATH, ONNX_DIR)
+        print(f"fp32 model: {os.path.getsize(fp32_path) / 1e6:.1f} MB")
+        print(f"int8 model: {os.path.getsize(int8_path) / 1e6:.1f} MB")
+
+    texts = load_labelled_texts(args.limit)
+    print(f"--- Comparing backends on {len(texts)} labelled rows ---", flush=True)
+    torch_report = measure("pytorch", texts, args.batch_size)
+    onnx_report = measure("onnx", texts, args.batch_size)
+
+    # parity on the same (score*2)-1 scale the API returns
+    diffs = []
+    agree = 0
+    for (t_label, t_score), (o_label, o_score) in zip(
+        torch_report["results"], onnx_report["results"]
+    ):
+        diffs.append(abs((t_score * 2 - 1) - (o_score * 2 - 1)))
+        agree += t_label == o_label
+    mean_diff = statistics.mean(diffs)
+    max_diff = max(diffs)
+    agreement = agree / len(diffs)
+
+    print()
+    print(f"{'':22}{'pytorch':>12}{'onnx int8':>12}")
+    for key, label in [
+        ("load_s", "load time (s)"),
+        ("p50_ms", "p50 latency (ms)"),
+        ("p95_ms", "p95 latency (ms)"),
+        ("throughput", "batch rows/sec"),
+        ("rss_base_mb", "base RSS (MB)"),
+        ("rss_peak_mb", "peak RSS (MB)"),
+    ]:
+        print(f"{label:22}{torch_report[key]:>12.1f}{onnx_report[key]:>12.1f}")
+    print()
+    print(f"mean |score diff|: {mean_diff:.4f}  max: {max_diff:.4f}")
+    print(f"label agreement:   {agreement:.2%}")
+
+    if mean_diff > args.tolerance or agreement < args.min_agreement:
+        print("--- PARITY CHECK FAILED: do not enable SENTIMENT_BACKEND=onnx ---")
+        sys.exit(1)
+    print("--- Parity check passed. ---")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,635 @@
+import functools
+import re
+
+from bs4 import BeautifulSoup
+from bs4.element import NavigableString, Tag
+
+
+def _preorder_tags(root):
+    """All tags under root in document order (the order find_all returns them)."""
+    order = []
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        order.append(node)
+        stack.extend(reversed([c for c in node.contents if isinstance(c, Tag)]))
+    return order
+
+
+def find_candidates(soup):
+    """
+    Finds the best scoring div/section and the div with the longest text.
+
+    Text length and p/a/img counts of every node are built from its children's
+    totals (children are visited before parents), so the whole tree is walked
+    once instead of once per nested container. Scores and tie-breaking match
+    calling get_text/find_all on each container:
+
+        score = len(text) + 20 * <p> - 10 * <a> - 10 * <img>
+
+    Returns (best_candidate, longest_div); either may be None.
+    """
+    string_types = soup.interesting_string_types or Tag.MAIN_CONTENT_STRING_TYPES
+    order = _preorder_tags(soup)
+
+    # id(tag) -> (chars, strings, p, a, img) over all descendants
+    stats = {}
+    for node in reversed(order):
+        chars = strings = p = a = img = 0
+        for child in node.contents:
+            if isinstance(child, Tag):
+                c_chars, c_strings, c_p, c_a, c_img = stats[id(child)]
+                chars += c_chars
+                strings += c_strings
+                p += c_p + (child.name == "p")
+                a += c_a + (child.name == "a")
+                img += c_img + (child.name == "img")
+            elif isinstance(child, NavigableString) and type(child) in string_types:
+                stripped_length = len(child.strip())
+                if stripped_length:
+                    chars += stripped_length
+                    strings += 1
+        stats[id(node)] = (chars, strings, p, a, img)
+
+    best_score = 0
+    best_candidate = None
+    max_len = 0
+    longest_div = None
+    # skip the root itself, find_all only looks at descendants
+    for node in order[1:]:
+        if node.name not in ("div", "section"):
+            continue
+        chars, strings, p, a, img = stats[id(node)]
+        # get_text joins the stripped strings with a one character separator
+        text_length = chars + max(0, strings - 1)
+        score = text_length + p * 20 - a * 10 - img * 10
+        if score > best_score and text_length > MIN_ARTICLE_LENGTH:
+            best_score = score
+            best_candidate = node
+        if node.name == "div" and text_length > max_len:
+            max_len = text_length
+            longest_div = node
+    return best_candidate, longest_div
+
+
+# tags whose content is never part of the article body
+IRRELEVANT_TAGS = [
+    "script",
+    "style",
+    "header",
+    "footer",
+    "nav",
+    "aside",
+    "form",
+    "noscript",
+]
+
+# Primary selectors that often contain article content
+ARTICLE_SELECTORS = [
+    "article",
+    "[role='main']",
+    "#main",
+    "#main-content",
+    ".main-content",
+    ".article",
+    ".article-body",
+    "div.article-body",
+    ".article-content",
+    ".post-content",
+    ".entry-content",
+    ".content__article-body",
+    ".story-body",
+    ".StandardArticleBody_body",
+    ".content-body",
+    "[data-testid='article-body']",
+    "[itemprop='articleBody']",
+    "[class*='article-body']",
+    "[class*='story-body']",
+    "[class*='post-body']",
+]
+
+# extracted text shorter than this is treated as a failed extraction
+MIN_ARTICLE_LENGTH = 250
+
+# elements whose content is raw text: markup inside them is not markup
+_RAW_TEXT_TAGS = ("script", "style", "title", "textarea")
+_FILTERED_TAGS = frozenset(IRRELEVANT_TAGS) | frozenset(_RAW_TEXT_TAGS)
+# next comment or start/end tag. Every tag is matched, not just the filtered ones,
+# so the scan steps over attribute values and never sees "<nav" inside one.
+_TOKEN_RE = re.compile(r"<!--|<(/?)([a-zA-Z][^\s/>]*)")
+# rest of a start tag, allowing '>' inside quoted attribute values
+_START_TAG_END_RE = re.compile(r"""(?:[^>"']|"[^"]*"|'[^']*')*>""")
+_RAW_TEXT_END_RE = {
+    name: re.compile(rf"</{name}\s*>", re.IGNORECASE) for name in _RAW_TEXT_TAGS
+}
+# removed subtrees leave an empty comment so neighbouring text is not merged
+_PLACEHOLDER = "<!---->"
+
+
+def _skip_raw_text(html, name, pos):
+    """Index just past the end tag of a raw text element whose content starts at pos."""
+    match = _RAW_TEXT_END_RE[name].search(html, pos)
+    # parsers treat an unclosed script/style as running to the end of the document
+    return match.end() if match else len(html)
+
+
+def _find_subtree_end(html, name, pos):
+    """Index just past the end tag matching an already opened <name>, or None."""
+    depth = 1
+    while True:
+        match = _TOKEN_RE.search(html, pos)
+        if not match:
+            return None
+        if match.group(0) == "<!--":
+            end = html.find("-->", match.end())
+            if end == -1:
+                return None
+            pos = end + 3
+            continue
+        closing, tag = match.group(1), match.group(2).lower()
+        tag_end = _START_TAG_END_RE.match(html, match.end())
+        if not tag_end:
+            return None
+        pos = tag_end.end()
+        if tag != name:
+            if not closing and tag in _RAW_TEXT_TAGS:
+                pos = _skip_raw_text(html, tag, pos)
+            continue
+        depth += -1 if closing else 1
+        if depth == 0:
+            return pos
+
+
+def strip_irrelevant_markup(html):
+    """
+    Removes IRRELEVANT_TAGS subtrees from raw HTML before it is parsed.
+
+    A regex-driven tokenizer pass finds each script/style/nav/footer/... element
+    and its matching end tag, so those subtrees never become tree nodes and the
+    parser never has to tokenize inline JS. Comments and raw text elements are
+    skipped so markup inside them is not mistaken for tags. An element whose end
+    tag cannot be found is left in place for the post-parse cleanup to remove.
+    """
+    out = []
+    copied_to = 0
+    pos = 0
+    while True:
+        match = _TOKEN_RE.search(html, pos)
+        if not match:
+            break
+        if match.group(0) == "<!--":
+            end = html.find("-->", match.end())
+            if end == -1:
+                break
+            pos = end + 3
+            continue
+
+        closing, name = match.group(1), match.group(2).lower()
+        tag_end = _START_TAG_END_RE.match(html, match.end())
+        if not tag_end:
+            break
+        pos = tag_end.end()
+        if closing or name not in _FILTERED_TAGS:
+            # kept element or a stray end tag, leave it to the parser
+            continue
+
+        if name in _RAW_TEXT_TAGS:
+            end = _skip_raw_text(html, name, pos)
+            if name not in IRRELEVANT_TAGS:
+                # title/textarea are kept, only their content is skipped over
+                pos = end
+                continue
+        else:
+            end = _find_subtree_end(html, name, pos)
+            if end is None:
+                continue
+
+        out.append(html[copied_to : match.start()])
+        out.append(_PLACEHOLDER)
+        copied_to = pos = end
+
+    if not out:
+        return html
+    out.append(html[copied_to:])
+    return "".join(out)
+
+
+# Extraction strategies in the order they are tried by default. A strategy
+# name is what gets remembered per domain (see ParsedPage.article_text).
+SELECTOR_PREFIX = "selector:"
+STRATEGIES = [SELECTOR_PREFIX + selector for selector in ARTICLE_SELECTORS] + [
+    "heuristic",  # best scoring div/section
+    "longest_div",  # plan b, div with the largest block of text
+    "paragraphs",  # every <p> joined
+    "full_text",  # can't find container for text body, all text
+]
+
+
+def _accept(text):
+    return text if len(text) > MIN_ARTICLE_LENGTH else None
+
+
+def is_learnable(strategy):
+    """
+    Only selector strategies are remembered per domain. The fallbacks (heuristic
+    and below) accept almost any page, so one short or paywalled page would
+    otherwise pin a site to nav and boilerplate text.
+    """
+    return strategy in STRATEGIES and strategy.startswith(SELECTOR_PREFIX)
+
+
+def strategy_order(preferred=None):
+    """
+    Default strategy order, with preferred moved to the front if it is a selector
+    strategy. The fallbacks always run last, in their default order.
+    """
+    if is_learnable(preferred):
+        return [preferred] + [s for s in STRATEGIES if s != preferred]
+    return STRATEGIES
+
+
+class _SoupStrategies:
+    """Runs one named strategy over a BeautifulSoup tree, returns accepted text or None."""
+
+    def __init__(self, soup):
+        self.soup = soup
+        self._candidates = None
+
+    def candidates(self):
+        # score every div/section and find the longest div in one bottom-up pass
+        if self._candidates is None:
+            self._candidates = find_candidates(self.soup)
+        return self._candidates
+
+    def __call__(self, strategy):
+        if strategy.startswith(SELECTOR_PREFIX):
+            element = self.soup.select_one(strategy[len(SELECTOR_PREFIX) :])
+            return _accept(element.get_text(separator="\n", strip=True)) if element else None
+        if strategy == "heuristic":
+            best_candidate, _ = self.candidates()
+            if best_candidate is None:
+                return None
+            return best_candidate.get_text(separator="\n", strip=True)
+        if strategy == "longest_div":
+            _, longest_div = self.candidates()
+            if longest_div is None:
+                return None
+            return _accept(longest_div.get_text(separator="\n", strip=True))
+        if strategy == "paragraphs":
+            paragraphs = self.soup.find_all("p")
+            return _accept("\n".join([p.get_text(strip=True) for p in paragraphs]))
+        return self.soup.get_text(separator="\n", strip=True)
+
+
+def _run_strategies(run, preferred):
+    for strategy in strategy_order(preferred):
+        text = run(strategy)
+        if text is not None:
+            return text, strategy
+    raise AssertionError("full_text strategy always returns text")
+
+
+def extract_with_strategy(soup, preferred=None):
+    """Returns (text, strategy name) trying preferred first, then the default order."""
+    # Remove irrelevant tags (usually already dropped by strip_irrelevant_markup)
+    for s in soup.find_all(IRRELEVANT_TAGS):
+        # nested matches disappear with their decomposed ancestor
+        if not s.decomposed:
+            s.decompose()
+    return _run_strategies(_SoupStrategies(soup), preferred)
+
+
+# find article from soup
+def extract_article_text(soup, url=None):
+    return extract_with_strategy(soup)[0]
+
+
+# Generic phrases that usually indicate non-article content
+CUTOFF_PHRASES = [
+    "Related Articles",
+    "Related Stories",
+    "Read More",
+    "Recommended for You",
+    "More from",
+    "You might also like",
+    "Top Stories",
+    "Sponsored Content",
+    "Advertisement",
+    "Leave a comment",
+    "Share this article",
+    "See All Newsletters",
+    "All rights reserved",
+    "Click to copy link",
+    "Most Popular",
+    "Join the conversation",
+    "Subscribe to our newsletter",
+    "TRENDING NOW",
+    "Presented by",
+    "Sponsored Links",
+    "Terms of Service",
+    "Privacy Policy",
+    "Give feedback",
+]
+
+# Extra cutoff phrases for individual sites, keyed on the domain without "www.",
+# e.g. {"example.com": ["Continue reading on the app"]}
+DOMAIN_CUTOFF_PHRASES = {}
+
+# Common inline ad or UI junk (matched case-insensitively on whole lines)
+REMOVAL_PATTERNS = [
+    r"\s*Advertisement\s*",
+    r"\s*Sponsored\s*",
+    r"\s*Undo\s*",
+    r"\s*Newsletter.*",
+    r"\s*Follow us on.*",
+    r"\s*Read full story at.*",
+    r"\s*More coverage:.*",
+    r"\s*Watch now.*",
+    r"\s*Tap here.*",
+    r"\s*Trending.*",
+]
+
+# cutoffs in the first 200 characters are usually navigation, not the article end
+CUTOFF_MIN_INDEX = 200
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_REMOVAL_RE = re.compile(
+    "^(?:" + "|".join(REMOVAL_PATTERNS) + ")$", re.IGNORECASE | re.MULTILINE
+)
+# Remove repeated junk like "AP News" or "CNN" showing up multiple times
+_OUTLET_NAMES_RE = re.compile(r"\b(?:AP News|CNN|Fox News|Reuters|NBC News)\b")
+
+
+def _trie_pattern(phrases):
+    """
+    Regex alternation built from a character trie of the phrases.
+
+    Phrases sharing a prefix share one branch ("re(?:lated (?:articles|stories)|ad more)"),
+    so matching at a position costs one walk down the trie instead of one
+    attempt per phrase - adding phrases does not make the scan slower.
+    """
+    trie = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node):
+        ends_here = "" in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        if len(branches) == 1 and not ends_here:
+            return branches[0]
+        body = "(?:" + "|".join(branches) + ")"
+        return body + "?" if ends_here else body
+
+    return build(trie)
+
+
+class CleanupEngine:
+    """Precompiled clean_article_text for one set of cutoff phrases."""
+
+    def __init__(self, cutoff_phrases):
+        phrases = sorted({p.lower() for p in cutoff_phrases if p})
+        self.cutoff_re = None
+        if phrases:
+            pattern = _trie_pattern(phrases)
+            # scanning a lowercased copy is much faster than re.IGNORECASE
+            self.cutoff_re = re.compile(pattern)
+            self.cutoff_re_ignorecase = re.compile(pattern, re.IGNORECASE)
+
+    def clean(self, text):
+        # Normalize line endings and collapse all whitespace runs to single spaces
+        text = _WHITESPACE_RE.sub(" ", text)
+
+        # Cut off the article at the earliest occurrence of any boilerplate phrase,
+        # found in one case-insensitive scan
+        if self.cutoff_re is not None:
+            lowered = text.lower()
+            if len(lowered) == len(text):
+                match = self.cutoff_re.search(lowered, CUTOFF_MIN_INDEX + 1)
+            else:
+                # a few characters change length when lowercased, so indexes would drift
+                match = self.cutoff_re_ignorecase.search(text, CUTOFF_MIN_INDEX + 1)
+            if match:
+                text = text[: match.start()]
+
+        text = _REMOVAL_RE.sub("", text)
+        text = _OUTLET_NAMES_RE.sub("", text)
+
+        # Final strip and cleanup
+        return text.strip()
+
+
+def _domain_key(domain):
+    return domain.lower().replace("www.", "") if domain else None
+
+
+def _build_cleanup_engines():
+    """One engine for the generic phrases, plus one per domain with extra phrases."""
+    engines = {None: CleanupEngine(CUTOFF_PHRASES)}
+    for domain, phrases in DOMAIN_CUTOFF_PHRASES.items():
+        engines[_domain_key(domain)] = CleanupEngine(CUTOFF_PHRASES + list(phrases))
+    return engines
+
+
+_cleanup_engines = _build_cleanup_engines()
+
+
+def reload_cleanup_phrases():
+    """Rebuilds the engines, call after changing CUTOFF_PHRASES or DOMAIN_CUTOFF_PHRASES."""
+    global _cleanup_engines
+    _cleanup_engines = _build_cleanup_engines()
+
+
+def add_domain_cutoff_phrases(domain, phrases):
+    DOMAIN_CUTOFF_PHRASES.setdefault(_domain_key(domain), []).extend(phrases)
+    reload_cleanup_phrases()
+
+
+def cleanup_engine_for(domain=None):
+    """Engine with the generic phrases plus any phrases registered for domain."""
+    engines = _cleanup_engines
+    return engines.get(_domain_key(domain)) or engines[None]
+
+
+def clean_article_text(text, domain=None):
+    return cleanup_engine_for(domain).clean(text)
+
+
+# lxml fast path
+# lxml (libxml2) builds the tree in C and is many times faster than html.parser,
+# so /analyze tries it first and only falls back to BeautifulSoup when it fails.
+
+
+def _lxml_text(element):
+    """Equivalent of get_text(separator="\\n", strip=True) for an lxml element."""
+    return "\n".join(s.strip() for s in element.itertext() if s.strip())
+
+
+def _lxml_find_candidates(root):
+    """Same single-pass div/section scoring as find_candidates, over an lxml tree."""
+    # comments and processing instructions are skipped, their tails still count
+    order = [el for el in root.iter() if isinstance(el.tag, str)]
+
+    stats = {}
+    for node in reversed(order):
+        chars = strings = p = a = img = 0
+        texts = [node.text]
+        for child in node:
+            texts.append(child.tail)
+            if not isinstance(child.tag, str):
+                continue
+            c_chars, c_strings, c_p, c_a, c_img = stats[child]
+            chars += c_chars
+            strings += c_strings
+            p += c_p + (child.tag == "p")
+            a += c_a + (child.tag == "a")
+            img += c_img + (child.tag == "img")
+        for text in texts:
+            if text:
+                stripped_length = len(text.strip())
+                if stripped_length:
+                    chars += stripped_length
+                    strings += 1
+        stats[node] = (chars, strings, p, a, img)
+
+    best_score = 0
+    best_candidate = None
+    max_len = 0
+    longest_div = None
+    for node in order[1:]:
+        if node.tag not in ("div", "section"):
+            continue
+        chars, strings, p, a, img = stats[node]
+        text_length = chars + max(0, strings - 1)
+        score = text_length + p * 20 - a * 10 - img * 10
+        if score > best_score and text_length > MIN_ARTICLE_LENGTH:
+            best_score = score
+            best_candidate = node
+        if node.tag == "div" and text_length > max_len:
+            max_len = text_length
+            longest_div = node
+    return best_candidate, longest_div
+
+
+@functools.lru_cache(maxsize=1)
+def _compiled_selectors():
+    # translating CSS to XPath is expensive, do it once per process
+    from lxml.cssselect import CSSSelector
+
+    return {selector: CSSSelector(selector) for selector in ARTICLE_SELECTORS}
+
+
+class _LxmlStrategies:
+    """Same strategies as _SoupStrategies, over an lxml tree."""
+
+    def __init__(self, root):
+        self.root = root
+        self._candidates = None
+
+    def candidates(self):
+        if self._candidates is None:
+            self._candidates = _lxml_find_candidates(self.root)
+        return self._candidates
+
+    def __call__(self, strategy):
+        if strategy.startswith(SELECTOR_PREFIX):
+            matches = _compiled_selectors()[strategy[len(SELECTOR_PREFIX) :]](self.root)
+            return _accept(_lxml_text(matches[0])) if matches else None
+        if strategy == "heuristic":
+            best_candidate, _ = self.candidates()
+            return _lxml_text(best_candidate) if best_candidate is not None else None
+        if strategy == "longest_div":
+            _, longest_div = self.candidates()
+            return _accept(_lxml_text(longest_div)) if longest_div is not None else None
+        if strategy == "paragraphs":
+            return _accept(
+                "\n".join("".join(s.strip() for s in p.itertext()) for p in self.root.iter("p"))
+            )
+        return _lxml_text(self.root)
+
+
+def extract_with_strategy_lxml(root, preferred=None):
+    """Main-content extraction over an lxml tree, mirroring extract_with_strategy."""
+    # collect first, removing while iterating skips siblings
+    for element in list(root.iter(*IRRELEVANT_TAGS)):
+        if element.getparent() is not None:
+            element.drop_tree()
+    return _run_strategies(_LxmlStrategies(root), preferred)
+
+
+class ParsedPage:
+    """
+    Title, canonical url and main text of an uploaded HTML snapshot.
+
+    With fast=True the page is parsed with lxml. The BeautifulSoup html.parser
+    path is used when lxml is unavailable or fails, and for the article text
+    whenever the fast extraction comes back shorter than MIN_ARTICLE_LENGTH.
+    With prefilter=True irrelevant subtrees are cut out before html.parser runs.
+    lxml input is left alone: its C parser builds those nodes faster than the
+    filter can cut them out, and they are dropped after parsing anyway.
+    """
+
+    def __init__(self, html_content, fast=True, prefilter=True):
+        self.html_content = html_content
+        self.prefilter = prefilter
+        self.parser = "html.parser"
+        self.strategy = None
+        self._soup = None
+        self._root = None
+        if fast:
+            try:
+                import lxml.html
+
+                self._root = lxml.html.document_fromstring(html_content)
+                self.parser = "lxml"
+            except Exception as e:
+                # lxml missing, empty document, or an encoding declaration lxml rejects
+                print(f"--- lxml parse failed, falling back to html.parser: {e!r} ---")
+
+    @property
+    def soup(self):
+        if self._soup is None:
+            html = self.html_content
+            if self.prefilter:
+                html = strip_irrelevant_markup(html)
+            self._soup = BeautifulSoup(html, "html.parser")
+        return self._soup
+
+    @property
+    def title(self):
+        if self._root is not None:
+            title_tag = self._root.find(".//title")
+            return "".join(s.strip() for s in title_tag.itertext()) if title_tag is not None else ""
+        title_tag = self.soup.find("title")
+        return title_tag.get_text(strip=True) if title_tag else ""
+
+    @property
+    def canonical_url(self):
+        if self._root is not None:
+            hrefs = self._root.xpath(
+                "//link[contains(concat(' ', normalize-space(@rel), ' '), ' canonical ')]/@href"
+            )
+            return hrefs[0] if hrefs else None
+        url_element = self.soup.find("link", rel="canonical")
+        return url_element["href"] if url_element else None
+
+    def article_text(self, preferred=None):
+        """
+        Main text of the page. preferred is a strategy name that worked for this
+        site before and is tried first; the one that produced the text is left in
+        self.strategy.
+        """
+        if self._root is not None:
+            try:
+                text, self.strategy = extract_with_strategy_lxml(self._root, preferred)
+                if len(text) > MIN_ARTICLE_LENGTH:
+                    return text
+            except Exception as e:
+                print(f"--- lxml extraction failed, falling back to html.parser: {e!r} ---")
+            self.parser = "html.parser"
+        text, self.strategy = extract_with_strategy(self.soup, preferred)
+        return text
@@ -0,0 +1,320 @@
+import ipaddress
+import os
+import socket
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urljoin, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError
+
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+MAX_REDIRECTS = 5
+READ_CHUNK = 64 * 1024
+
+
+class FetchError(Exception):
+    """Page could not be fetched, carries the HTTP status /analyze_url should answer with."""
+
+    def __init__(self, message, status=502):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+class FetchResult:
+    def __init__(self, url, html, cache_status, elapsed):
+        self.url = url  # final URL after redirects
+        self.html = html
+        self.cache_status = cache_status  # "miss", "revalidated" or "refetched"
+        self.elapsed = elapsed
+
+
+class PageCache:
+    """
+    Per-process LRU of fetched pages with their ETag/Last-Modified validators,
+    bounded by the total size of the stored bodies.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, url):
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                self._entries.move_to_end(url)
+            return entry
+
+    def set(self, url, body, encoding, etag, last_modified):
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(url, None)
+            if old is not None:
+                self._size -= len(old["body"])
+            self._entries[url] = {
+                "body": body,
+                "encoding": encoding,
+                "etag": etag,
+                "last_modified": last_modified,
+            }
+            self._size += len(body)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted["body"])
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def _charset(content_type):
+    """Explicit charset of a Content-Type header, None when the page does not declare one."""
+    for part in content_type.split(";")[1:]:
+        key, _, value = part.partition("=")
+        if key.strip().lower() == "charset":
+            return value.strip().strip("\"'") or None
+    return None
+
+
+def _is_public_address(ip):
+    return not (
+        ip.is_private or ip.is_loopback or ip.is_link_local or ip.is_reserved or ip.is_multicast
+    )
+
+
+def _public_addresses(host, port):
+    """Resolves host once, refusing it if any address is loopback/private/link-local."""
+    try:
+        infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    except socket.gaierror:
+        raise FetchError(f"Could not resolve host: {host}", 400)
+    addresses = []
+    for info in infos:
+        address = info[4][0].split("%")[0]
+        if not _is_public_address(ipaddress.ip_address(address)):
+            raise FetchError(f"Refusing to fetch from a non-public address: {host}", 400)
+        if address not in addresses:
+            addresses.append(address)
+    return addresses
+
+
+class _PublicAddressMixin:
+    """
+    Connects to the addresses that were checked, instead of letting urllib3 resolve
+    the name again (a second lookup could return an internal address, DNS rebinding).
+    The Host header, SNI and certificate check still use the name.
+    """
+
+    def _new_conn(self):
+        host = self._dns_host
+        error = None
+        for address in _public_addresses(host, self.port):
+            self._dns_host = address
+            try:
+                return super()._new_conn()
+            except ConnectTimeoutError as e:  # also covers NewConnectionError
+                error = e
+            finally:
+                self._dns_host = host
+        raise error
+
+
+class _PublicHTTPConnection(_PublicAddressMixin, HTTPConnection):
+    pass
+
+
+class _PublicHTTPSConnection(_PublicAddressMixin, HTTPSConnection):
+    pass
+
+
+class _PublicHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _PublicHTTPConnection
+
+
+class _PublicHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _PublicHTTPSConnection
+
+
+class PublicHostAdapter(HTTPAdapter):
+    """HTTPAdapter whose connections only ever reach public addresses."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _PublicHTTPConnectionPool,
+            "https": _PublicHTTPSConnectionPool,
+        }
+
+
+class PageFetcher:
+    """
+    Fetches article pages over a shared keep-alive requests.Session.
+
+    Every body is streamed with a byte cap, each host gets at most per_host_limit
+    requests in flight from this process, and pages are kept in a PageCache so a
+    re-fetch of an unchanged article is a conditional GET answered with a 304.
+    """
+
+    def __init__(
+        self,
+        max_bytes=5 * 1024 * 1024,
+        connect_timeout=5,
+        read_timeout=15,
+        per_host_limit=4,
+        host_wait=10,
+        pool_size=20,
+        cache_bytes=64 * 1024 * 1024,
+        user_agent="EchoEscapeBot/1.0",
+        allow_private_hosts=False,
+    ):
+        self.max_bytes = max_bytes
+        self.timeout = (connect_timeout, read_timeout)
+        self.per_host_limit = per_host_limit
+        self.host_wait = host_wait
+        self.pool_size = pool_size
+        self.user_agent = user_agent
+        self.allow_private_hosts = allow_private_hosts
+        self.cache = PageCache(cache_bytes)
+
+        self._lock = threading.Lock()
+        self._host_slots = {}
+        self._session = None
+        self._pid = None
+
+    # connection pools must not be shared with a forked gunicorn worker
+    @property
+    def session(self):
+        if self._session is None or self._pid != os.getpid():
+            with self._lock:
+                if self._session is None or self._pid != os.getpid():
+                    session = requests.Session()
+                    adapter_cls = HTTPAdapter if self.allow_private_hosts else PublicHostAdapter
+                    adapter = adapter_cls(
+                        pool_connections=self.pool_size, pool_maxsize=self.pool_size
+                    )
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    session.headers["User-Agent"] = self.user_agent
+                    session.headers["Accept"] = "text/html,application/xhtml+xml"
+                    self._session = session
+                    self._pid = os.getpid()
+        return self._session
+
+    def _host_slot(self, host):
+        """The host's semaphore, counted as in use until _release_host_slot."""
+        with self._lock:
+            entry = self._host_slots.get(host)
+            if entry is None:
+                entry = self._host_slots[host] = [
+                    threading.BoundedSemaphore(self.per_host_limit), 0
+                ]
+            entry[1] += 1
+            return entry[0]
+
+    def _release_host_slot(self, host, acquired):
+        with self._lock:
+            entry = self._host_slots[host]
+            if acquired:
+                entry[0].release()
+            entry[1] -= 1
+            # idle hosts are forgotten, so only hosts being fetched are kept
+            if not entry[1]:
+                del self._host_slots[host]
+
+    def _validate(self, url):
+        # the address itself is checked when connecting (see PublicHostAdapter)
+        parsed = urlparse(url)
+        if parsed.scheme not in ("http", "https") or not parsed.hostname:
+            raise FetchError("Only absolute http(s) URLs can be analyzed.", 400)
+        return parsed.hostname
+
+    def _read_body(self, response):
+        length = response.headers.get("Content-Length")
+        if length and length.isdigit() and int(length) > self.max_bytes:
+            raise FetchError(f"Page is larger than the {self.max_bytes // 1024} KB limit.", 413)
+        body = bytearray()
+        for chunk in response.iter_content(READ_CHUNK):
+            body += chunk
+            if len(body) > self.max_bytes:
+                raise FetchError(f"Page is larger than the {self.max_bytes // 1024} KB limit.", 413)
+        return bytes(body)
+
+    def _get(self, url, headers):
+        """One GET with the host's concurrency slot held until the body is read."""
+        host = self._validate(url)
+        slot = self._host_slot(host)
+        acquired = slot.acquire(timeout=self.host_wait)
+        try:
+            if not acquired:
+                raise FetchError(f"Too many concurrent fetches for {host}, try again shortly.", 503)
+            response = self.session.get(
+                url, headers=headers, timeout=self.timeout, stream=True, allow_redirects=False
+            )
+            try:
+                if response.status_code in REDIRECT_STATUSES or response.status_code == 304:
+                    return response, b""
+                if response.status_code >= 400:
+                    raise FetchError(f"Page returned HTTP {response.status_code}.", 502)
+                content_type = response.headers.get("Content-Type", "text/html").lower()
+                if not content_type.startswith(HTML_CONTENT_TYPES):
+                    raise FetchError(f"URL is not an HTML page ({content_type}).", 415)
+                return response, self._read_body(response)
+            finally:
+                response.close()
+        except requests.Timeout:
+            raise FetchError(f"Timed out fetching {url}", 504)
+        except requests.RequestException as e:
+            raise FetchError(f"Could not fetch {url}: {e}", 502)
+        finally:
+            self._release_host_slot(host, acquired)
+
+    def fetch(self, url):
+        start = time.perf_counter()
+        # redirects are followed by hand so every hop goes through _validate
+        for _ in range(MAX_REDIRECTS + 1):
+            cached = self.cache.get(url)
+            headers = {}
+            if cached:
+                if cached["etag"]:
+                    headers["If-None-Match"] = cached["etag"]
+                if cached["last_modified"]:
+                    headers["If-Modified-Since"] = cached["last_modified"]
+
+            response, body = self._get(url, headers)
+            if response.status_code in REDIRECT_STATUSES:
+                location = response.headers.get("Location")
+                if not location:
+                    raise FetchError("Redirect without a Location header.", 502)
+                url = urljoin(url, location)
+                continue
+
+            if response.status_code == 304 and cached:
+                body, encoding, status = cached["body"], cached["encoding"], "revalidated"
+            elif response.status_code == 304:
+                raise FetchError("Server answered 304 to an unconditional request.", 502)
+            else:
+                # requests would assume ISO-8859-1 here, but most news pages are UTF-8
+                encoding = _charset(response.headers.get("Content-Type", "")) or "utf-8"
+                status = "refetched" if cached else "miss"
+                self.cache.set(
+                    url,
+                    body,
+                    encoding,
+                    response.headers.get("ETag"),
+                    response.headers.get("Last-Modified"),
+                )
+            try:
+                html = body.decode(encoding, errors="replace")
+            except LookupError:  # unknown charset name in the header
+                html = body.decode("utf-8", errors="replace")
+            return FetchResult(url, html, status, time.perf_counter() - start)
+        raise FetchError("Too many redirects.", 502)
@@ -0,0 +1,143 @@
+import os
+import queue
+import threading
+import time
+
+
+class _PendingRequest:
+    """A single caller waiting on the result of a batched inference call."""
+
+    __slots__ = ("item", "done", "result", "error")
+
+    def __init__(self, item):
+        self.item = item
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class MicroBatcher:
+    """
+    Collects concurrent inference requests into batches.
+
+    Callers block in submit() while a background worker waits for up to
+    max_batch_size items or max_wait_ms milliseconds (whichever comes first),
+    runs batch_fn once over the whole batch and hands each caller its own result.
+    """
+
+    def __init__(self, batch_fn, max_batch_size=16, max_wait_ms=10):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self._queue = queue.Queue()
+        self._worker = None
+        self._worker_pid = None
+        self._start_lock = threading.Lock()
+
+    def submit(self, item):
+        """Queues one item and blocks until its result is ready."""
+        self._ensure_worker()
+        pending = _PendingRequest(item)
+        self._queue.put(pending)
+        pending.done.wait()
+        if pending.error is not None:
+            raise pending.error
+        return pending.result
+
+    def _ensure_worker(self):
+        # gunicorn forks workers after import, so a thread started in the
+        # parent does not exist in the child - restart it per process
+        if self._worker is not None and self._worker_pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._worker is not None and self._worker_pid == os.getpid():
+                return
+            self._queue = queue.Queue()
+            self._worker = threading.Thread(
+                target=self._run, name="sentiment-batcher", daemon=True
+            )
+            self._worker_pid = os.getpid()
+            self._worker.start()
+
+    def _collect_batch(self):
+        # block for the first request, then gather more until full or timed out
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect_batch()
+            try:
+                results = self.batch_fn([pending.item for pending in batch])
+                if len(results) != len(batch):
+                    raise RuntimeError(
+                        f"Batch function returned {len(results)} results for {len(batch)} inputs"
+                    )
+                for pending, result in zip(batch, results):
+                    pending.result = result
+            except Exception as e:
+                for pending in batch:
+                    pending.error = e
+            finally:
+                for pending in batch:
+                    pending.done.set()
+
+
+AGGREGATION_METHODS = ("mean", "length_weighted", "max_magnitude")
+
+
+def split_token_windows(token_ids, window_size, overlap=0, max_windows=None):
+    """
+    Splits a token id sequence into overlapping windows of at most window_size tokens.
+
+    When there are more windows than max_windows, an evenly spaced subset is kept
+    (always including the first and last window) so long articles stay bounded
+    while still being sampled from start to end.
+    """
+    if window_size <= 0:
+        raise ValueError("window_size must be positive")
+    overlap = max(0, min(overlap, window_size - 1))
+    step = window_size - overlap
+
+    windows = []
+    start = 0
+    while True:
+        windows.append(token_ids[start : start + window_size])
+        if start + window_size >= len(token_ids):
+            break
+        start += step
+
+    if max_windows and len(windows) > max_windows:
+        if max_windows == 1:
+            return windows[:1]
+        last = len(windows) - 1
+        picks = sorted({round(i * last / (max_windows - 1)) for i in range(max_windows)})
+        windows = [windows[i] for i in picks]
+    return windows
+
+
+def aggregate_window_scores(scores, lengths, method="mean"):
+    """Combines per-window sentiment scores in [-1, 1] into one article score."""
+    if not scores:
+        raise ValueError("No window scores to aggregate")
+    if method == "mean":
+        return sum(scores) / len(scores)
+    if method == "length_weighted":
+        total = sum(lengths)
+        if total == 0:
+            return sum(scores) / len(scores)
+        return sum(s * n for s, n in zip(scores, lengths)) / total
+    if method == "max_magnitude":
+        return max(scores, key=abs)
+    raise ValueError(
+        f"Unknown aggregation '{method}', expected one of {', '.join(AGGREGATION_METHODS)}"
+    )
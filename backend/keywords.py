@@ -0,0 +1,84 @@
+import math
+import re
+from collections import Counter
+
+WORD_RE = re.compile(r"\b[a-z]+\b")
+
+# memo value for words that are filtered out (stopwords and words of 3 letters or less)
+_SKIP = ""
+
+
+class KeywordEngine:
+    """
+    Frequency-ranked keyword extraction with a memo of per-word results.
+
+    Each distinct word is checked against the stopwords and lemmatized once and
+    the result is remembered, so the WordNet lookup only runs for words the
+    engine has not seen yet. The memo is shared by every document the engine
+    processes and is cleared once it holds memo_size words.
+    """
+
+    def __init__(self, stop_words, lemmatize, memo_size=50000):
+        self.stop_words = stop_words
+        self.lemmatize = lemmatize
+        self.memo_size = memo_size
+        self._memo = {}
+
+    def _resolve(self, word):
+        if word in self.stop_words or len(word) <= 3:
+            lemma = _SKIP
+        else:
+            lemma = self.lemmatize(word)
+        memo = self._memo
+        if len(memo) >= self.memo_size:
+            # dropping everything is cheaper than LRU bookkeeping in the hot loop,
+            # and the common words come straight back
+            memo.clear()
+        memo[word] = lemma
+        return lemma
+
+    def count_lemmas(self, text):
+        """Counts of each kept lemma, in order of first appearance."""
+        counts = Counter()
+        memo = self._memo
+        resolve = self._resolve
+        for word in WORD_RE.findall(text.lower()):
+            lemma = memo.get(word)
+            if lemma is None:
+                lemma = resolve(word)
+            if lemma:
+                counts[lemma] += 1
+        return counts
+
+    def terms(self, text):
+        """Distinct kept lemmas of text, what the document-frequency table counts."""
+        return set(self.count_lemmas(text))
+
+    def extract(self, text, max_keywords=7):
+        # most_common keeps first-appearance order between equal counts
+        return [word for word, _ in self.count_lemmas(text).most_common(max_keywords)]
+
+    def extract_batch(self, texts, max_keywords=7):
+        """extract() for many texts, identical texts are only processed once."""
+        results = {}
+        keywords = []
+        for text in texts:
+            if text not in results:
+                results[text] = self.extract(text, max_keywords)
+            keywords.append(list(results[text]))
+        return keywords
+
+
+def tfidf_keywords(counts, doc_freqs, n_docs, max_keywords=7):
+    """
+    Ranks lemma counts by term frequency times the smoothed IDF of each lemma in
+    a corpus of n_docs documents (same formula as sklearn's smooth_idf), so words
+    that appear in most stored articles sink below the ones specific to this one.
+    """
+    scores = {
+        term: count * (math.log((1 + n_docs) / (1 + doc_freqs.get(term, 0))) + 1)
+        for term, count in counts.items()
+    }
+    # sorted is stable, ties keep first-appearance order like most_common
+    ranked = sorted(scores, key=scores.get, reverse=True)
+    return ranked[:max_keywords]
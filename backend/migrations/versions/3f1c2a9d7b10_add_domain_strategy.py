@@ -0,0 +1,38 @@
+"""add domain_strategy table for per-site extraction strategies
+
+Revision ID: 3f1c2a9d7b10
+Revises: 
+Create Date: 2026-10-18 11:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c2a9d7b10'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'domain_strategy',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('domain', sa.String(length=255), nullable=False),
+        sa.Column('strategy', sa.String(length=100), nullable=False),
+        sa.Column('successes', sa.Integer(), nullable=False),
+        sa.Column('failures', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('domain_strategy', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_domain_strategy_domain'), ['domain'], unique=True)
+
+
+def downgrade():
+    with op.batch_alter_table('domain_strategy', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_domain_strategy_domain'))
+
+    op.drop_table('domain_strategy')
@@ -0,0 +1,37 @@
+"""add term_document_frequency and corpus_stat tables for TF-IDF keywords
+
+Revision ID: 8b2e4d6f1a23
+Revises: 3f1c2a9d7b10
+Create Date: 2026-10-18 12:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b2e4d6f1a23'
+down_revision = '3f1c2a9d7b10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'term_document_frequency',
+        sa.Column('term', sa.String(length=64), nullable=False),
+        sa.Column('doc_count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('term')
+    )
+    op.create_table(
+        'corpus_stat',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('value', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('name')
+    )
+    # fill with `flask keyword-df rebuild` after upgrading an existing database
+
+
+def downgrade():
+    op.drop_table('corpus_stat')
+    op.drop_table('term_document_frequency')
@@ -0,0 +1,80 @@
+"""add article.domain and article.retrieved_day, and indexes for history queries
+
+Revision ID: a9e4c7b2d058
+Revises: f5c8a2d93e61
+Create Date: 2026-10-18 15:05:00.000000
+
+"""
+import datetime as dt
+from urllib.parse import urlparse
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a9e4c7b2d058'
+down_revision = 'f5c8a2d93e61'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+
+article = sa.table(
+    'article',
+    sa.column('id', sa.Integer),
+    sa.column('url', sa.String),
+    sa.column('retrieved_at', sa.DateTime),
+    sa.column('domain', sa.String),
+    sa.column('retrieved_day', sa.Date),
+)
+
+
+def upgrade():
+    with op.batch_alter_table('article', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('domain', sa.String(length=255), nullable=True))
+        batch_op.add_column(sa.Column('retrieved_day', sa.Date(), nullable=True))
+
+    # same values as rollups.source_domain and retrieved_at.date(), in keyset batches
+    conn = op.get_bind()
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(article.c.id, article.c.url, article.c.retrieved_at)
+            .where(article.c.id > last_id)
+            .order_by(article.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        for row in rows:
+            retrieved_at = row.retrieved_at or dt.datetime.utcnow()
+            conn.execute(
+                article.update()
+                .where(article.c.id == row.id)
+                .values(
+                    domain=urlparse(row.url).netloc.replace('www.', '')[:255],
+                    retrieved_day=retrieved_at.date(),
+                )
+            )
+
+    with op.batch_alter_table('article', schema=None) as batch_op:
+        batch_op.alter_column('domain', existing_type=sa.String(length=255), nullable=False)
+        batch_op.alter_column('retrieved_day', existing_type=sa.Date(), nullable=False)
+        batch_op.create_index(batch_op.f('ix_article_category'), ['category'], unique=False)
+        batch_op.create_index(batch_op.f('ix_article_domain'), ['domain'], unique=False)
+        batch_op.create_index(batch_op.f('ix_article_retrieved_at'), ['retrieved_at'], unique=False)
+    op.create_index(
+        'ix_reading_list_article_id_user_id', 'reading_list', ['article_id', 'user_id'], unique=False
+    )
+
+
+def downgrade():
+    op.drop_index('ix_reading_list_article_id_user_id', table_name='reading_list')
+    with op.batch_alter_table('article', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_article_retrieved_at'))
+        batch_op.drop_index(batch_op.f('ix_article_domain'))
+        batch_op.drop_index(batch_op.f('ix_article_category'))
+        batch_op.drop_column('retrieved_day')
+        batch_op.drop_column('domain')
@@ -0,0 +1,39 @@
+"""add page_analysis for server-computed results reused across readers
+
+Revision ID: b6d2f8a41c93
+Revises: a9e4c7b2d058
+Create Date: 2026-10-18 17:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6d2f8a41c93'
+down_revision = 'a9e4c7b2d058'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'page_analysis',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('url', sa.String(length=500), nullable=False),
+        sa.Column('canonical_url', sa.String(length=500), nullable=False),
+        sa.Column('title', sa.String(length=500), nullable=False),
+        sa.Column('sentiment_score', sa.Float(), nullable=True),
+        sa.Column('keywords', sa.JSON(), nullable=True),
+        sa.Column('category', sa.String(length=50), nullable=True),
+        sa.Column('codec', sa.String(length=10), nullable=False),
+        sa.Column('data', sa.LargeBinary(), nullable=False),
+        sa.Column('analyzed_at', sa.DateTime(), nullable=False),
+        sa.Column('fingerprint', sa.String(length=64), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('url')
+    )
+
+
+def downgrade():
+    op.drop_table('page_analysis')
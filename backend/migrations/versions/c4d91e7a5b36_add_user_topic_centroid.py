@@ -0,0 +1,39 @@
+"""add user_topic_centroid table for learned custom topics
+
+Revision ID: c4d91e7a5b36
+Revises: 8b2e4d6f1a23
+Create Date: 2026-10-18 12:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4d91e7a5b36'
+down_revision = '8b2e4d6f1a23'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'user_topic_centroid',
+        sa.Column('topic_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('doc_count', sa.Integer(), nullable=False),
+        sa.Column('vector', sa.JSON(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['topic_id'], ['user_topic.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+        sa.PrimaryKeyConstraint('topic_id')
+    )
+    with op.batch_alter_table('user_topic_centroid', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_user_topic_centroid_user_id'), ['user_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('user_topic_centroid', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_user_topic_centroid_user_id'))
+
+    op.drop_table('user_topic_centroid')
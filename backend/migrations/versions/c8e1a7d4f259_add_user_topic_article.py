@@ -0,0 +1,53 @@
+"""add user_topic_article, the per-user record of which centroid holds an article
+
+Revision ID: c8e1a7d4f259
+Revises: b6d2f8a41c93
+Create Date: 2026-10-18 18:10:00.000000
+
+The centroids now use IDF-weighted vectors, so run `flask topic-centroids rebuild`
+after upgrading.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c8e1a7d4f259'
+down_revision = 'b6d2f8a41c93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'user_topic_article',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('article_id', sa.Integer(), nullable=False),
+        sa.Column('topic_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['article_id'], ['article.id'], ),
+        sa.ForeignKeyConstraint(['topic_id'], ['user_topic.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+        sa.PrimaryKeyConstraint('user_id', 'article_id')
+    )
+    with op.batch_alter_table('user_topic_article', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_user_topic_article_article_id'), ['article_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_user_topic_article_topic_id'), ['topic_id'], unique=False)
+
+    # moves were not recorded per user before, so the best guess is every article
+    # in a reader's list whose shared category is one of that reader's topics
+    op.execute(
+        'INSERT INTO user_topic_article (user_id, article_id, topic_id) '
+        'SELECT reading_list.user_id, reading_list.article_id, user_topic.id '
+        'FROM reading_list '
+        'JOIN article ON article.id = reading_list.article_id '
+        'JOIN user_topic ON user_topic.user_id = reading_list.user_id '
+        'AND user_topic.name = article.category'
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('user_topic_article', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_user_topic_article_topic_id'))
+        batch_op.drop_index(batch_op.f('ix_user_topic_article_article_id'))
+
+    op.drop_table('user_topic_article')
@@ -0,0 +1,25 @@
+"""index page_analysis.canonical_url, which /analyze looks results up by
+
+Revision ID: d3f7b9e2a614
+Revises: c8e1a7d4f259
+Create Date: 2026-10-18 19:20:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'd3f7b9e2a614'
+down_revision = 'c8e1a7d4f259'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('page_analysis', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_page_analysis_canonical_url'), ['canonical_url'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('page_analysis', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_page_analysis_canonical_url'))
@@ -0,0 +1,113 @@
+"""move article.article_text into a compressed article_body table
+
+Revision ID: d7a3e5c18f42
+Revises: c4d91e7a5b36
+Create Date: 2026-10-18 13:20:00.000000
+
+"""
+import zlib
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd7a3e5c18f42'
+down_revision = 'c4d91e7a5b36'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+
+article = sa.table(
+    'article',
+    sa.column('id', sa.Integer),
+    sa.column('article_text', sa.Text),
+)
+article_body = sa.table(
+    'article_body',
+    sa.column('article_id', sa.Integer),
+    sa.column('codec', sa.String),
+    sa.column('data', sa.LargeBinary),
+)
+
+
+def _encode(text):
+    # same output as textstore.encode_text(text, "zlib", 6), kept inline so the
+    # migration does not change when the app code does
+    raw = (text or '').encode('utf-8')
+    data = zlib.compress(raw, 6)
+    return ('zlib', data) if len(data) < len(raw) else ('raw', raw)
+
+
+def _decode(codec, data):
+    data = bytes(data)
+    if codec == 'zlib':
+        data = zlib.decompress(data)
+    elif codec == 'zstd':
+        import zstandard
+
+        data = zstandard.ZstdDecompressor().decompress(data)
+    return data.decode('utf-8')
+
+
+def upgrade():
+    op.create_table(
+        'article_body',
+        sa.Column('article_id', sa.Integer(), nullable=False),
+        sa.Column('codec', sa.String(length=10), nullable=False),
+        sa.Column('data', sa.LargeBinary(), nullable=False),
+        sa.ForeignKeyConstraint(['article_id'], ['article.id'], ),
+        sa.PrimaryKeyConstraint('article_id')
+    )
+
+    # copy the bodies over in keyset-paginated batches
+    conn = op.get_bind()
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(article.c.id, article.c.article_text)
+            .where(article.c.id > last_id)
+            .order_by(article.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        bodies = []
+        for row in rows:
+            codec, data = _encode(row.article_text)
+            bodies.append({'article_id': row.id, 'codec': codec, 'data': data})
+        conn.execute(article_body.insert(), bodies)
+
+    with op.batch_alter_table('article', schema=None) as batch_op:
+        batch_op.drop_column('article_text')
+
+
+def downgrade():
+    with op.batch_alter_table('article', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('article_text', sa.Text(), nullable=True))
+
+    conn = op.get_bind()
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(article_body.c.article_id, article_body.c.codec, article_body.c.data)
+            .where(article_body.c.article_id > last_id)
+            .order_by(article_body.c.article_id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].article_id
+        for row in rows:
+            conn.execute(
+                article.update()
+                .where(article.c.id == row.article_id)
+                .values(article_text=_decode(row.codec, row.data))
+            )
+
+    conn.execute(article.update().where(article.c.article_text.is_(None)).values(article_text=''))
+    with op.batch_alter_table('article', schema=None) as batch_op:
+        batch_op.alter_column('article_text', existing_type=sa.Text(), nullable=False)
+    op.drop_table('article_body')
@@ -0,0 +1,28 @@
+"""add user.history_version for dashboard ETags
+
+Revision ID: e2b6f49a0c17
+Revises: d7a3e5c18f42
+Create Date: 2026-10-18 13:55:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2b6f49a0c17'
+down_revision = 'd7a3e5c18f42'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column('history_version', sa.Integer(), server_default='0', nullable=False)
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.drop_column('history_version')
@@ -0,0 +1,75 @@
+"""move user_topic_centroid.vector into per-feature user_topic_centroid_term rows
+
+Revision ID: e9a4c2f7d318
+Revises: d3f7b9e2a614
+Create Date: 2026-10-18 19:50:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e9a4c2f7d318'
+down_revision = 'd3f7b9e2a614'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 400
+
+centroid = sa.table(
+    'user_topic_centroid',
+    sa.column('topic_id', sa.Integer),
+    sa.column('vector', sa.JSON),
+)
+centroid_term = sa.table(
+    'user_topic_centroid_term',
+    sa.column('topic_id', sa.Integer),
+    sa.column('feature', sa.Integer),
+    sa.column('weight', sa.Float),
+)
+
+
+def upgrade():
+    op.create_table(
+        'user_topic_centroid_term',
+        sa.Column('topic_id', sa.Integer(), nullable=False),
+        sa.Column('feature', sa.Integer(), nullable=False),
+        sa.Column('weight', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['topic_id'], ['user_topic.id'], ),
+        sa.PrimaryKeyConstraint('topic_id', 'feature')
+    )
+
+    conn = op.get_bind()
+    for row in conn.execute(sa.select(centroid.c.topic_id, centroid.c.vector)).all():
+        terms = [
+            {'topic_id': row.topic_id, 'feature': int(feature), 'weight': weight}
+            for feature, weight in sorted((row.vector or {}).items(), key=lambda t: int(t[0]))
+        ]
+        for start in range(0, len(terms), BATCH_SIZE):
+            conn.execute(centroid_term.insert(), terms[start:start + BATCH_SIZE])
+
+    with op.batch_alter_table('user_topic_centroid', schema=None) as batch_op:
+        batch_op.drop_column('vector')
+
+
+def downgrade():
+    with op.batch_alter_table('user_topic_centroid', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('vector', sa.JSON(), nullable=True))
+
+    conn = op.get_bind()
+    vectors = {}
+    for row in conn.execute(
+        sa.select(centroid_term.c.topic_id, centroid_term.c.feature, centroid_term.c.weight)
+    ):
+        vectors.setdefault(row.topic_id, {})[str(row.feature)] = row.weight
+    for topic_id in conn.execute(sa.select(centroid.c.topic_id)).scalars().all():
+        conn.execute(
+            centroid.update()
+            .where(centroid.c.topic_id == topic_id)
+            .values(vector=vectors.get(topic_id, {}))
+        )
+
+    with op.batch_alter_table('user_topic_centroid', schema=None) as batch_op:
+        batch_op.alter_column('vector', existing_type=sa.JSON(), nullable=False)
+    op.drop_table('user_topic_centroid_term')
@@ -0,0 +1,94 @@
+"""add per-user category/day/domain rollup tables for the analytics endpoints
+
+Revision ID: f5c8a2d93e61
+Revises: e2b6f49a0c17
+Create Date: 2026-10-18 14:30:00.000000
+
+"""
+from collections import defaultdict
+from urllib.parse import urlparse
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f5c8a2d93e61'
+down_revision = 'e2b6f49a0c17'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 400
+
+TABLES = {
+    'user_category_rollup': ('category', sa.String(length=50)),
+    'user_day_rollup': ('day', sa.String(length=10)),
+    'user_domain_rollup': ('domain', sa.String(length=255)),
+}
+
+
+def upgrade():
+    for table, (bucket, type_) in TABLES.items():
+        op.create_table(
+            table,
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column(bucket, type_, nullable=False),
+            sa.Column('article_count', sa.Integer(), nullable=False),
+            sa.Column('sentiment_sum', sa.Float(), nullable=False),
+            sa.Column('sentiment_count', sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+            sa.PrimaryKeyConstraint('user_id', bucket)
+        )
+
+    # fill from the existing reading lists, with the same buckets as rollups.bucket_keys
+    # (`flask rollups check` verifies them afterwards)
+    conn = op.get_bind()
+    rows = conn.execute(sa.text(
+        'SELECT reading_list.user_id, article.category, article.retrieved_at, '
+        'article.url, article.sentiment_score '
+        'FROM reading_list JOIN article ON article.id = reading_list.article_id'
+    ))
+    totals = {table: defaultdict(lambda: [0, 0.0, 0]) for table in TABLES}
+    for user_id, category, retrieved_at, url, sentiment in rows:
+        if isinstance(retrieved_at, str):  # SQLite returns the raw text
+            day = retrieved_at[:10]
+        else:
+            day = retrieved_at.strftime('%Y-%m-%d')
+        keys = {
+            'user_category_rollup': category or '',
+            'user_day_rollup': day,
+            'user_domain_rollup': urlparse(url).netloc.replace('www.', '')[:255],
+        }
+        for table, key in keys.items():
+            entry = totals[table][(user_id, key)]
+            entry[0] += 1
+            if sentiment is not None:
+                entry[1] += sentiment
+                entry[2] += 1
+
+    for table, (bucket, type_) in TABLES.items():
+        target = sa.table(
+            table,
+            sa.column('user_id', sa.Integer),
+            sa.column(bucket, type_),
+            sa.column('article_count', sa.Integer),
+            sa.column('sentiment_sum', sa.Float),
+            sa.column('sentiment_count', sa.Integer),
+        )
+        values = [
+            {
+                'user_id': user_id,
+                bucket: key,
+                'article_count': count,
+                'sentiment_sum': total,
+                'sentiment_count': scored,
+            }
+            for (user_id, key), (count, total, scored) in sorted(totals[table].items())
+        ]
+        for start in range(0, len(values), BATCH_SIZE):
+            conn.execute(target.insert(), values[start:start + BATCH_SIZE])
+
+
+def downgrade():
+    for table in reversed(list(TABLES)):
+        op.drop_table(table)
@@ -0,0 +1,347 @@
+import hashlib
+import json
+import os
+import pickle
+import threading
+
+basedir = os.path.abspath(os.path.dirname(__file__))
+NLTK_DATA_DIR = os.path.join(basedir, "nltk_data")
+
+# bump whenever the artifact layout changes, old files are then ignored
+ARTIFACT_VERSION = 2
+ARTIFACT_DIR = os.path.join(basedir, "nlp_artifacts")
+
+
+def artifact_path(directory=ARTIFACT_DIR):
+    return os.path.join(directory, f"nlp-v{ARTIFACT_VERSION}.pkl")
+
+
+CUSTOM_STOPWORDS = {
+    "reuters",
+    "said",
+    "would",
+    "also",
+    "new",
+    "one",
+    "that",
+    "will",
+    "us",
+    "visit",
+    "say",
+    "says",
+    "told",
+    "like",
+    "get",
+    "going",
+    "advertisement",
+}
+
+# Category Texts with buzzwords for Cosine Similarity
+CATEGORY_TEXTS = {
+    "Technology": "apple google microsoft amazon facebook meta tesla spacex ai artificial intelligence software hardware crypto bitcoin blockchain phone laptop app",
+    "Politics": "senate congress white house president biden trump republican democrat election vote law policy government senator governor",
+    "Sports": "nba nfl mlb nhl soccer football basketball baseball playoffs championship lebron messi ronaldo game match team",
+    "Business": "stocks market wall street dow jones nasdaq economy business company ceo earnings profit investor shares ipo",
+    "Health": "health medical doctor hospital fda cdc virus vaccine disease medicine study",
+    "Entertainment": "movie film hollywood celebrity music album song grammy oscar actor actress tv show",
+    "Science": "science nasa space research discovery study climate environment planet mars",
+    "World News": "china russia ukraine europe asia africa middle east un united nations war conflict diplomacy",
+}
+CATEGORY_NAMES = list(CATEGORY_TEXTS.keys())
+
+VECTORIZER_PARAMS = {
+    "stop_words": "english",  # drop common words
+    "ngram_range": (1, 2),  # include bigrams
+    "sublinear_tf": True,  # dampen very frequent terms
+}
+
+# CATEGORIZER_MODE=hashing: same tokens hashed into a fixed number of buckets with a
+# precomputed IDF vector, so memory does not grow with the fingerprint vocabulary
+CATEGORIZER_MODES = ("tfidf", "hashing")
+CATEGORY_HASHING_PARAMS = {
+    "n_features": 2**18,
+    "stop_words": "english",
+    "ngram_range": (1, 2),
+    "alternate_sign": False,
+    "norm": None,  # the TfidfTransformer normalizes after weighting
+}
+
+# hashed TF-IDF space for vectors learned at runtime (per-user topic centroids),
+# which cannot use the fixed fingerprint vocabulary. The IDF comes from the
+# category fingerprints (see fit_topic_vectorizer).
+HASHING_PARAMS = {
+    "n_features": 2**18,
+    "stop_words": "english",
+    "ngram_range": (1, 2),
+    "alternate_sign": False,
+    "norm": None,  # the TfidfTransformer normalizes after weighting
+}
+
+
+def source_fingerprint():
+    """Hash of everything the artifact is built from, a stale artifact is never loaded."""
+    parts = {
+        "version": ARTIFACT_VERSION,
+        "categories": CATEGORY_TEXTS,
+        "vectorizer": VECTORIZER_PARAMS,
+        "hashing": CATEGORY_HASHING_PARAMS,
+        "custom_stopwords": sorted(CUSTOM_STOPWORDS),
+    }
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+
+
+def _nltk():
+    # importing nltk pulls in scipy and takes over a second, so only on first use
+    import nltk
+
+    for path in (NLTK_DATA_DIR, "C:/Users/victo/AppData/Roaming/nltk_data"):
+        if path not in nltk.data.path:
+            nltk.data.path.append(path)
+    return nltk
+
+
+def load_stop_words():
+    nltk = _nltk()
+    from nltk.corpus import stopwords
+
+    try:
+        words = stopwords.words("english")
+    except LookupError:
+        # This is now just a fallback, the build script should handle it.
+        print("Stopwords not found locally, attempting emergency download...")
+        nltk.download("stopwords", download_dir=NLTK_DATA_DIR)
+        words = stopwords.words("english")
+    return set(words) | CUSTOM_STOPWORDS
+
+
+def fit_categorizer(mode="tfidf", category_texts=CATEGORY_TEXTS):
+    """Fits the TF-IDF space on the category fingerprints only (fixed IDF space)."""
+    texts = list(category_texts.values())
+    if mode == "hashing":
+        return fit_hashing_categorizer(texts)
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    vectorizer = TfidfVectorizer(**VECTORIZER_PARAMS)
+    fingerprint_matrix = vectorizer.fit_transform(texts)
+    return vectorizer, fingerprint_matrix
+
+
+def fit_hashing_categorizer(texts):
+    import numpy as np
+    from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+    from sklearn.pipeline import make_pipeline
+
+    vectorizer = make_pipeline(
+        HashingVectorizer(**CATEGORY_HASHING_PARAMS), TfidfTransformer(sublinear_tf=True)
+    )
+    vectorizer.fit(texts)
+    # buckets no fingerprint term hashes to get zero weight, the same way the
+    # TfidfVectorizer ignores words outside its vocabulary
+    hashed = vectorizer[0].transform(texts)
+    seen = np.bincount(hashed.indices, minlength=hashed.shape[1]) > 0
+    transformer = vectorizer[1]
+    transformer.idf_ = np.where(seen, transformer.idf_, 0.0)
+    return vectorizer, vectorizer.transform(texts)
+
+
+def fit_topic_vectorizer(category_texts=CATEGORY_TEXTS):
+    """
+    Hashing + TF-IDF pipeline for custom-topic vectors. Unlike the hashing
+    categorizer, buckets no fingerprint term hashes to keep the (highest) smoothed
+    IDF, since custom topics are mostly about words the defaults never mention.
+    """
+    from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+    from sklearn.pipeline import make_pipeline
+
+    vectorizer = make_pipeline(
+        HashingVectorizer(**HASHING_PARAMS), TfidfTransformer(sublinear_tf=True)
+    )
+    return vectorizer.fit(list(category_texts.values()))
+
+
+def normalized_fingerprints(fingerprint_matrix):
+    """(terms x categories) matrix of unit-length fingerprints, dense unless it is hashed."""
+    import numpy as np
+    from scipy import sparse
+
+    norms = np.sqrt(np.asarray(fingerprint_matrix.multiply(fingerprint_matrix).sum(axis=1)))
+    norms[norms == 0] = 1.0
+    normalized = sparse.csr_matrix(fingerprint_matrix.multiply(1.0 / norms))
+    if normalized.shape[1] > 2**16:
+        # a dense 2^18 x categories array would cost more than the vocabulary it replaces
+        return normalized.T.tocsc()
+    return np.ascontiguousarray(normalized.toarray().T)
+
+
+def build_artifact(path):
+    """Fits everything the NLP helpers need and pickles it to path (atomically)."""
+    import sklearn
+
+    artifact = {
+        "version": ARTIFACT_VERSION,
+        "fingerprint": source_fingerprint(),
+        # pickled estimators are only safe to load with the same sklearn release
+        "sklearn_version": sklearn.__version__,
+        "category_names": CATEGORY_NAMES,
+        # mode -> (fitted vectorizer, fingerprint matrix)
+        "categorizers": {mode: fit_categorizer(mode) for mode in CATEGORIZER_MODES},
+        "stop_words": sorted(load_stop_words()),
+    }
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(artifact, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+    return artifact
+
+
+def read_artifact(path):
+    """Returns the artifact at path, or None (with the reason printed) if it cannot be used."""
+    try:
+        with open(path, "rb") as f:
+            artifact = pickle.load(f)
+    except FileNotFoundError:
+        print(f"--- No NLP artifact at {path}, fitting at runtime ---", flush=True)
+        return None
+    except Exception as e:
+        print(f"--- Could not read NLP artifact {path}: {e} ---", flush=True)
+        return None
+
+    import sklearn
+
+    if artifact.get("version") != ARTIFACT_VERSION:
+        reason = "artifact version changed"
+    elif artifact.get("fingerprint") != source_fingerprint():
+        reason = "category texts or vectorizer settings changed"
+    elif artifact.get("sklearn_version") != sklearn.__version__:
+        reason = f"built with scikit-learn {artifact.get('sklearn_version')}"
+    else:
+        return artifact
+    print(f"--- Ignoring stale NLP artifact {path} ({reason}), fitting at runtime ---", flush=True)
+    return None
+
+
+class NlpResources:
+    """
+    Stopwords, lemmatizer and the category vectorizer, loaded on first use.
+
+    The vectorizer, fingerprint matrix and stopword set come from the artifact
+    written by build_nlp_artifacts.py when it matches the current code, and are
+    fitted on the spot otherwise, so a missing build step only costs time.
+    """
+
+    def __init__(self, path, lemma_memo_size=50000, categorizer_mode="tfidf"):
+        if categorizer_mode not in CATEGORIZER_MODES:
+            raise ValueError(f"Unknown categorizer mode: {categorizer_mode}")
+        self.path = path
+        self.lemma_memo_size = lemma_memo_size
+        self.categorizer_mode = categorizer_mode
+        self._lock = threading.Lock()
+        self._categorizer = None
+        self._stop_words = None
+        self._lemmatizer = None
+        self._keywords = None
+        self._hashing_vectorizer = None
+
+    def _load_categorizer(self):
+        artifact = read_artifact(self.path)
+        if artifact is None:
+            vectorizer, fingerprint_matrix = fit_categorizer(self.categorizer_mode)
+            return vectorizer, fingerprint_matrix, None
+        vectorizer, fingerprint_matrix = artifact["categorizers"][self.categorizer_mode]
+        return vectorizer, fingerprint_matrix, set(artifact["stop_words"])
+
+    def _categorizer_parts(self):
+        with self._lock:
+            if self._categorizer is None:
+                vectorizer, fingerprint_matrix, stop_words = self._load_categorizer()
+                self._categorizer = (
+                    vectorizer,
+                    fingerprint_matrix,
+                    normalized_fingerprints(fingerprint_matrix),
+                )
+                if stop_words is not None and self._stop_words is None:
+                    self._stop_words = stop_words
+            return self._categorizer
+
+    @property
+    def vectorizer(self):
+        return self._categorizer_parts()[0]
+
+    @property
+    def fingerprint_matrix(self):
+        return self._categorizer_parts()[1]
+
+    @property
+    def fingerprint_weights(self):
+        """(terms x categories) matrix of unit-length fingerprints."""
+        return self._categorizer_parts()[2]
+
+    @property
+    def hashing_vectorizer(self):
+        with self._lock:
+            if self._hashing_vectorizer is None:
+                self._hashing_vectorizer = fit_topic_vectorizer()
+            return self._hashing_vectorizer
+
+    def hashed_vector(self, text):
+        """Unit-length hashed TF-IDF vector of text as {feature index: weight}."""
+        row = self.hashing_vectorizer.transform([text])
+        return {int(i): float(v) for i, v in zip(row.indices, row.data)}
+
+    def category_similarities(self, texts, extra_weights=None):
+        """
+        Cosine similarity of every text to every category, shape (len(texts), categories).
+        extra_weights is an optional sparse (hashed features x k) matrix of unit-length
+        vectors, such as a user's topic centroids, scored as k more columns.
+        """
+        import numpy as np
+
+        vectorizer, _, weights = self._categorizer_parts()
+        # one sparse transform for the whole batch; its rows come out L2-normalized,
+        # so a single sparse x dense product gives the cosines
+        features = vectorizer.transform(texts)
+        if extra_weights is None:
+            sims = features @ weights
+            return sims.toarray() if hasattr(sims, "toarray") else np.asarray(sims)
+
+        from scipy import sparse
+
+        # both feature blocks are unit length on their own, so one product against
+        # the block-diagonal weights gives both sets of cosines side by side
+        features = sparse.hstack([features, self.hashing_vectorizer.transform(texts)])
+        combined = sparse.block_diag([sparse.csc_matrix(weights), extra_weights])
+        return (features.tocsr() @ combined.tocsc()).toarray()
+
+    @property
+    def stop_words(self):
+        if self._stop_words is None:
+            # the artifact carries the stopword set, so load it before touching nltk
+            self._categorizer_parts()
+        with self._lock:
+            if self._stop_words is None:
+                self._stop_words = load_stop_words()
+            return self._stop_words
+
+    @property
+    def lemmatizer(self):
+        with self._lock:
+            if self._lemmatizer is None:
+                _nltk()
+                from nltk.stem import WordNetLemmatizer
+
+                self._lemmatizer = WordNetLemmatizer()
+            return self._lemmatizer
+
+    @property
+    def keywords(self):
+        if self._keywords is None:
+            from keywords import KeywordEngine
+
+            engine = KeywordEngine(
+                self.stop_words, self.lemmatizer.lemmatize, self.lemma_memo_size
+            )
+            with self._lock:
+                if self._keywords is None:
+                    self._keywords = engine
+        return self._keywords
@@ -0,0 +1,140 @@
+import os
+
+import numpy as np
+
+# file names produced by export_onnx.py inside the ONNX model directory
+FP32_MODEL_FILE = "model.onnx"
+INT8_MODEL_FILE = "model.int8.onnx"
+
+
+def _top_label_scores(logits):
+    """Same post-processing as the transformers text-classification pipeline."""
+    if logits.shape[-1] == 1:
+        probs = 1.0 / (1.0 + np.exp(-logits[:, 0]))
+        return probs, np.zeros(len(probs), dtype=int)
+    shifted = logits - logits.max(axis=-1, keepdims=True)
+    exp = np.exp(shifted)
+    probs = exp / exp.sum(axis=-1, keepdims=True)
+    return probs.max(axis=-1), probs.argmax(axis=-1)
+
+
+class OnnxSentimentPipeline:
+    """
+    Drop-in replacement for the transformers sentiment pipeline backed by ONNX Runtime.
+
+    Called with a text or list of texts it returns [{"label": ..., "score": ...}]
+    just like the PyTorch pipeline, so the rest of the app does not care which
+    backend is loaded.
+    """
+
+    def __init__(self, model_dir, model_file=INT8_MODEL_FILE, num_threads=None):
+        import onnxruntime as ort
+        from transformers import AutoConfig, AutoTokenizer
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+
+        self.session = ort.InferenceSession(
+            os.path.join(model_dir, model_file),
+            sess_options=options,
+            providers=["CPUExecutionProvider"],
+        )
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir, local_files_only=True)
+        self.config = AutoConfig.from_pretrained(model_dir, local_files_only=True)
+        self.max_length = min(
+            self.tokenizer.model_max_length,
+            getattr(self.config, "max_position_embeddings", 512),
+        )
+
+    def _run(self, encoded):
+        feeds = {}
+        for name in self.input_names:
+            if name in encoded:
+                feeds[name] = np.asarray(encoded[name], dtype=np.int64)
+            elif name == "token_type_ids":
+                feeds[name] = np.zeros_like(encoded["input_ids"], dtype=np.int64)
+        return self.session.run(None, feeds)[0]
+
+    def _to_results(self, logits):
+        scores, labels = _top_label_scores(logits)
+        return [
+            {"label": self.config.id2label[int(label)], "score": float(score)}
+            for score, label in zip(scores, labels)
+        ]
+
+    def __call__(self, texts, batch_size=None, truncation=True, **kwargs):
+        single = isinstance(texts, str)
+        if single:
+            texts = [texts]
+        batch_size = batch_size or len(texts)
+
+        results = []
+        for start in range(0, len(texts), batch_size):
+            encoded = self.tokenizer(
+                texts[start : start + batch_size],
+                padding=True,
+                truncation=truncation,
+                max_length=self.max_length,
+                return_tensors="np",
+            )
+            results.extend(self._to_results(self._run(encoded)))
+        return results
+
+    def score_token_windows(self, windows):
+        """Scores pre-tokenized windows (without special tokens) in one padded batch."""
+        encoded = self.tokenizer.pad(
+            {
+                "input_ids": [
+                    self.tokenizer.build_inputs_with_special_tokens(w) for w in windows
+                ]
+            },
+            return_tensors="np",
+        )
+        scores, _ = _top_label_scores(self._run(encoded))
+        return scores.tolist()
+
+
+def export_onnx(model_path, output_dir, opset=17):
+    """
+    Exports the PyTorch sequence classifier to ONNX and writes a dynamically
+    int8-quantized copy next to it. Returns (fp32_path, int8_path).
+    """
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    os.makedirs(output_dir, exist_ok=True)
+    model = AutoModelForSequenceClassification.from_pretrained(
+        model_path, local_files_only=True
+    )
+    tokenizer = AutoTokenizer.from_pretrained(model_path, local_files_only=True)
+    model.eval()
+
+    sample = tokenizer(["Sample text for export."], return_tensors="pt")
+    input_names = [n for n in ("input_ids", "attention_mask", "token_type_ids") if n in sample]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["logits"] = {0: "batch"}
+
+    fp32_path = os.path.join(output_dir, FP32_MODEL_FILE)
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            tuple(sample[name] for name in input_names),
+            fp32_path,
+            input_names=input_names,
+            output_names=["logits"],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset,
+            do_constant_folding=True,
+        )
+
+    int8_path = os.path.join(output_dir, INT8_MODEL_FILE)
+    quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+
+    # keep tokenizer and label config next to the graph so the ONNX dir is self-contained
+    tokenizer.save_pretrained(output_dir)
+    model.config.save_pretrained(output_dir)
+    return fp32_path, int8_path
@@ -0,0 +1,159 @@
+import json
+import threading
+import zlib
+
+# wbits for zlib.decompressobj: 16+ expects a gzip header, 32+ auto-detects
+# gzip or zlib so "deflate" works whichever wrapper the browser picked
+CONTENT_ENCODINGS = {
+    "gzip": 16 + zlib.MAX_WBITS,
+    "x-gzip": 16 + zlib.MAX_WBITS,
+    "deflate": 32 + zlib.MAX_WBITS,
+}
+READ_CHUNK = 64 * 1024
+
+
+class PayloadError(Exception):
+    """Request body rejected before analysis, carries the HTTP status to answer with."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+def _read_limited(stream, max_bytes):
+    """Yields the raw body in chunks, failing as soon as it grows past max_bytes."""
+    total = 0
+    while True:
+        chunk = stream.read(READ_CHUNK)
+        if not chunk:
+            return
+        total += len(chunk)
+        if total > max_bytes:
+            raise PayloadError(
+                f"Request body is larger than the {max_bytes // 1024} KB limit.", 413
+            )
+        yield chunk
+
+
+def _inflate(chunks, wbits, max_bytes):
+    """
+    Streams compressed chunks through zlib without ever holding more than
+    max_bytes of output, so a small compression bomb cannot exhaust memory.
+    """
+    decoder = zlib.decompressobj(wbits)
+    out = bytearray()
+    try:
+        for chunk in chunks:
+            data = chunk
+            while data:
+                # never ask for more than one byte past the limit
+                piece = decoder.decompress(data, max_bytes - len(out) + 1)
+                out += piece
+                if len(out) > max_bytes:
+                    raise PayloadError(
+                        f"Decompressed body is larger than the {max_bytes // 1024} KB limit.",
+                        413,
+                    )
+                data = decoder.unconsumed_tail
+        out += decoder.flush()
+    except zlib.error as e:
+        raise PayloadError(f"Could not decompress request body: {e}")
+    if len(out) > max_bytes:
+        raise PayloadError(
+            f"Decompressed body is larger than the {max_bytes // 1024} KB limit.", 413
+        )
+    if not decoder.eof:
+        raise PayloadError("Could not decompress request body: stream is truncated.")
+    return bytes(out)
+
+
+def read_json_body(stream, content_length, content_encoding, max_body_bytes, max_decoded_bytes):
+    """
+    Reads a JSON request body that may be gzip/deflate compressed.
+    Returns (data, wire_bytes, decoded_bytes, encoding).
+    """
+    encoding = (content_encoding or "identity").strip().lower()
+    if encoding not in CONTENT_ENCODINGS and encoding != "identity":
+        raise PayloadError(f"Unsupported Content-Encoding: {encoding}", 415)
+    if content_length and content_length > max_body_bytes:
+        raise PayloadError(
+            f"Request body is larger than the {max_body_bytes // 1024} KB limit.", 413
+        )
+
+    wire_bytes = 0
+
+    def counted(chunks):
+        nonlocal wire_bytes
+        for chunk in chunks:
+            wire_bytes += len(chunk)
+            yield chunk
+
+    chunks = counted(_read_limited(stream, max_body_bytes))
+    if encoding == "identity":
+        raw = b"".join(chunks)
+        if len(raw) > max_decoded_bytes:
+            raise PayloadError(
+                f"Request body is larger than the {max_decoded_bytes // 1024} KB limit.", 413
+            )
+    else:
+        raw = _inflate(chunks, CONTENT_ENCODINGS[encoding], max_decoded_bytes)
+
+    try:
+        data = json.loads(raw)
+    except ValueError:
+        raise PayloadError("Request body is not valid JSON.")
+    if not isinstance(data, dict):
+        raise PayloadError("Request body must be a JSON object.")
+    return data, wire_bytes, len(raw), encoding
+
+
+# /analyze modes that get their own metrics; "unknown" is a body that could not be read
+METRIC_MODES = ("html", "extracted", "unknown")
+
+
+class PayloadMetrics:
+    """Per-process request counts, byte totals and latency for each /analyze payload mode."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._modes = {}
+
+    def record(self, mode, encoding, wire_bytes, decoded_bytes, seconds, status):
+        # both come from the client, anything else shares one key so the dict stays bounded
+        if not isinstance(mode, str) or mode not in METRIC_MODES:
+            mode = "invalid"
+        if encoding not in CONTENT_ENCODINGS and encoding != "identity":
+            encoding = "invalid"
+        key = f"{mode}/{encoding}"
+        with self._lock:
+            m = self._modes.setdefault(
+                key,
+                {
+                    "requests": 0,
+                    "errors": 0,
+                    "wire_bytes": 0,
+                    "decoded_bytes": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                },
+            )
+            m["requests"] += 1
+            m["errors"] += status >= 400
+            m["wire_bytes"] += wire_bytes
+            m["decoded_bytes"] += decoded_bytes
+            ms = seconds * 1000
+            m["total_ms"] += ms
+            m["max_ms"] = max(m["max_ms"], ms)
+
+    def snapshot(self):
+        with self._lock:
+            modes = {key: dict(m) for key, m in self._modes.items()}
+        for m in modes.values():
+            n = m["requests"]
+            m["avg_wire_bytes"] = m["wire_bytes"] / n if n else 0
+            m["avg_ms"] = m["total_ms"] / n if n else 0.0
+            m["compression_ratio"] = (
+                m["decoded_bytes"] / m["wire_bytes"] if m["wire_bytes"] else 0.0
+            )
+        return modes
@@ -0,0 +1,51 @@
+from collections import defaultdict
+from urllib.parse import urlparse
+
+# one rollup table per kind, keyed by (user_id, <kind>)
+ROLLUP_KINDS = ("category", "day", "domain")
+ROLLUP_COLUMNS = ("article_count", "sentiment_sum", "sentiment_count")
+
+
+def source_domain(url):
+    """Article.domain of a url, the same normalization the source analysis has always used."""
+    return urlparse(url).netloc.replace("www.", "")[:255]
+
+
+def bucket_keys(category, day, domain):
+    """The category, day and domain buckets an article is counted in."""
+    return {
+        "category": category or "",
+        "day": day.isoformat(),
+        "domain": domain or "",
+    }
+
+
+class RollupDeltas:
+    """
+    Changes to the rollup tables, accumulated per (kind, user_id, bucket) as
+    [articles, sum of sentiment scores, scored articles]. Adding every reading
+    list row with sign=1 to an empty instance gives the full rollups.
+    """
+
+    def __init__(self):
+        self.changes = {kind: defaultdict(lambda: [0, 0.0, 0]) for kind in ROLLUP_KINDS}
+
+    def add(self, user_id, category, day, domain, sentiment, sign=1, kinds=ROLLUP_KINDS):
+        keys = bucket_keys(category, day, domain)
+        for kind in kinds:
+            entry = self.changes[kind][(user_id, keys[kind])]
+            entry[0] += sign
+            if sentiment is not None:
+                entry[1] += sign * sentiment
+                entry[2] += sign
+
+    def rows(self, kind):
+        """(user_id, bucket, articles, sentiment sum, scored) of every bucket that changed."""
+        return [
+            (user_id, key, count, total, scored)
+            for (user_id, key), (count, total, scored) in sorted(self.changes[kind].items())
+            if count or scored
+        ]
+
+    def user_ids(self):
+        return sorted({user_id for changes in self.changes.values() for user_id, _ in changes})
@@ -0,0 +1,9 @@
+import os
+import sys
+import tempfile
+
+# the app reads its configuration at import time, so point it at throwaway storage first
+_tmp = tempfile.mkdtemp(prefix="backend-tests-")
+os.environ.setdefault("DEV_DATABASE_URL", "sqlite:///" + os.path.join(_tmp, "test.db"))
+os.environ.setdefault("ANALYSIS_CACHE_PATH", os.path.join(_tmp, "analysis_cache.sqlite3"))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
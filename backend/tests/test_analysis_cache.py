@@ -0,0 +1,58 @@
+import sqlite3
+
+from analysis_cache import AnalysisCache
+
+RESULT = {"sentiment": 0.5, "keywords": ["x" * 100], "category": "Politics"}
+
+
+def sum_sizes(path):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_running_total_matches_the_entries(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = AnalysisCache(path, lambda: "v1", memory_items=2, max_disk_bytes=2000)
+    for i in range(40):
+        cache.set(f"article {i}", RESULT)
+    cache.set("article 39", {**RESULT, "keywords": []})  # overwrite with a smaller value
+    stats = cache.stats()
+    assert stats["disk_bytes"] == sum_sizes(path) <= 2000
+    assert stats["evictions"] > 0
+    assert cache.get("article 39")["keywords"] == []
+
+
+def test_no_write_scans_the_entries(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = AnalysisCache(path, lambda: "v1", max_disk_bytes=10**6)
+    cache.set("warm up", RESULT)
+    statements = []
+    cache._connect().set_trace_callback(statements.append)
+    for i in range(5):
+        cache.set(f"article {i}", RESULT)
+    assert not [s for s in statements if "SUM(" in s or "!=" in s]
+
+
+def test_stale_entries_are_purged_once_per_model_change(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    AnalysisCache(path, lambda: "v1").set("article", RESULT)
+    # an existing file from before the running total: the total is seeded once
+    conn = sqlite3.connect(path)
+    conn.execute("DELETE FROM meta")
+    conn.execute("DROP TRIGGER entries_size_insert")
+    conn.commit()
+    conn.close()
+
+    worker = AnalysisCache(path, lambda: "v2")
+    assert worker.get("article") is None
+    assert worker.stats()["disk_entries"] == 0
+    assert worker.stats()["disk_bytes"] == 0
+
+    other_worker = AnalysisCache(path, lambda: "v2")
+    statements = []
+    other_worker._connect().set_trace_callback(statements.append)
+    other_worker.get("article")
+    assert not [s for s in statements if s.startswith("DELETE")]
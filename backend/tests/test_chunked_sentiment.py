@@ -0,0 +1,78 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+import app as backend
+from onnx_backend import OnnxSentimentPipeline
+
+CLS, SEP, PAD, POSITIVE, NEGATIVE = 101, 102, 0, 1, 2
+
+
+class FakeTokenizer:
+    model_max_length = 512
+
+    def __call__(self, text, add_special_tokens=True, verbose=True):
+        ids = [POSITIVE if w == "good" else NEGATIVE for w in text.split()]
+        return {"input_ids": ids}
+
+    def num_special_tokens_to_add(self, pair=False):
+        return 2
+
+    def build_inputs_with_special_tokens(self, ids):
+        return [CLS, *ids, SEP]
+
+    def pad(self, encoded, return_tensors=None):
+        rows = encoded["input_ids"]
+        width = max(len(r) for r in rows)
+        return {
+            "input_ids": [r + [PAD] * (width - len(r)) for r in rows],
+            "attention_mask": [[1] * len(r) + [0] * (width - len(r)) for r in rows],
+        }
+
+
+class FakeSession:
+    """Logits favour POSITIVE by the share of "good" tokens in each window."""
+
+    def __init__(self):
+        self.batches = []
+
+    def get_inputs(self):
+        return [SimpleNamespace(name="input_ids"), SimpleNamespace(name="attention_mask")]
+
+    def run(self, outputs, feeds):
+        ids = feeds["input_ids"]
+        self.batches.append(ids)
+        share = (ids == POSITIVE).sum(axis=1) / (ids != PAD).sum(axis=1)
+        return [np.stack([-4 * share, 4 * share], axis=1)]
+
+
+def onnx_pipeline(max_length):
+    # built without __init__, which needs onnxruntime and an exported model directory
+    pipeline = OnnxSentimentPipeline.__new__(OnnxSentimentPipeline)
+    pipeline.session = FakeSession()
+    pipeline.input_names = {"input_ids", "attention_mask"}
+    pipeline.tokenizer = FakeTokenizer()
+    pipeline.config = SimpleNamespace(id2label={0: "NEGATIVE", 1: "POSITIVE"})
+    pipeline.max_length = max_length
+    return pipeline
+
+
+def test_chunked_mode_runs_through_onnx_wrapper(monkeypatch):
+    pipeline = onnx_pipeline(max_length=8)
+    monkeypatch.setattr(backend, "get_sentiment_pipeline", lambda: pipeline)
+    monkeypatch.setitem(backend.app.config, "SENTIMENT_WINDOW_OVERLAP", 2)
+    monkeypatch.setitem(backend.app.config, "SENTIMENT_MAX_WINDOWS", 8)
+    monkeypatch.setitem(backend.app.config, "SENTIMENT_AGGREGATION", "mean")
+
+    score = backend.get_chunked_sentiment(" ".join(["good"] * 20))
+
+    (batch,) = pipeline.session.batches
+    # 8 tokens per window: 6 article tokens plus [CLS] and [SEP]
+    assert batch.shape[1] == 8
+    assert batch.shape[0] > 1
+    assert -1.0 <= score <= 1.0
+    assert score > 0.9
+
+
+def test_pipeline_max_length_prefers_wrapper_attribute():
+    assert backend.pipeline_max_length(onnx_pipeline(max_length=64)) == 64
@@ -0,0 +1,66 @@
+import pytest
+
+import app as backend
+
+TEXTS = {
+    "https://news.example.com/budget": "Council members voted on the budget. " * 10,
+    "https://news.example.com/storm": "The storm flooded the harbour overnight. " * 10,
+}
+
+
+@pytest.fixture
+def corpus(monkeypatch):
+    # a plain word split instead of the lemmatizer, which needs the WordNet corpus
+    monkeypatch.setattr(
+        backend, "corpus_terms", lambda text: sorted(set(text.lower().replace(".", "").split()))
+    )
+    with backend.app.app_context():
+        backend.db.create_all()
+        yield backend.app.test_client()
+        backend.TermDocumentFrequency.query.delete()
+        backend.CorpusStat.query.delete()
+        backend.db.session.commit()
+
+
+def login(client, email):
+    client.post("/register", json={"email": email, "password": "pw"})
+    token = client.post("/login", json={"email": email, "password": "pw"}).get_json()["token"]
+    return {"x-access-token": token}
+
+
+def save(client, headers, url):
+    body = {
+        "url": url,
+        "title": "Title",
+        "article_text": TEXTS[url],
+        "sentiment": 0.0,
+        "keywords": [],
+        "category": "Politics",
+        "save_to_history": True,
+    }
+    assert client.post("/save_analysis", json=body, headers=headers).status_code == 200
+
+
+def frequencies():
+    stat = backend.db.session.get(backend.CorpusStat, "documents")
+    rows = backend.TermDocumentFrequency.query.all()
+    return stat.value, {row.term: row.doc_count for row in rows}
+
+
+def test_deleted_account_leaves_the_corpus(corpus):
+    a = login(corpus, "df-a@example.com")
+    b = login(corpus, "df-b@example.com")
+    save(corpus, a, "https://news.example.com/budget")
+    save(corpus, b, "https://news.example.com/storm")
+    n_docs, doc_freqs = frequencies()
+    assert n_docs == 2 and doc_freqs["the"] == 2 and doc_freqs["council"] == 1
+
+    assert corpus.delete("/account/delete", headers=a).status_code == 200
+    n_docs, doc_freqs = frequencies()
+    assert n_docs == 1
+    assert doc_freqs["the"] == 1
+    assert "council" not in doc_freqs
+    assert doc_freqs["storm"] == 1
+
+    corpus.delete("/account/delete", headers=b)
+    assert frequencies() == (0, {})
@@ -0,0 +1,103 @@
+import pytest
+from sqlalchemy import event
+
+import app as backend
+from extraction import STRATEGIES, ParsedPage, strategy_order
+
+ARTICLE = "<p>" + "Council members voted on the new budget today. " * 20 + "</p>"
+GOOD_PAGE = f"<html><body><nav>Home News Sports</nav><article>{ARTICLE}</article></body></html>"
+MAIN_PAGE = f"<html><body><nav>Home News Sports</nav><div id='main'>{ARTICLE}</div></body></html>"
+SHORT_PAGE = "<html><body><nav>Home News Sports</nav><p>Subscribe to read.</p></body></html>"
+
+
+@pytest.fixture
+def db_session():
+    with backend.app.app_context():
+        backend.db.create_all()
+        yield backend.db.session
+        backend.DomainStrategy.query.delete()
+        backend.db.session.commit()
+        backend.strategy_failures.clear()
+
+
+def extract(html, domain):
+    preferred = backend.get_domain_strategy(domain)
+    page = ParsedPage(html)
+    text = page.article_text(preferred)
+    backend.record_domain_strategy(domain, preferred, page.strategy)
+    return text, page.strategy
+
+
+def test_fallbacks_never_move_to_the_front():
+    assert strategy_order("full_text") == STRATEGIES
+    assert strategy_order("heuristic") == STRATEGIES
+    assert strategy_order("selector:#main")[0] == "selector:#main"
+    assert strategy_order("selector:#main")[-1] == "full_text"
+
+
+def test_fallback_is_not_remembered(db_session):
+    _, used = extract(SHORT_PAGE, "example.com")
+    assert not used.startswith("selector:")
+    assert backend.get_domain_strategy("example.com") is None
+
+    text, used = extract(GOOD_PAGE, "example.com")
+    assert used == "selector:article"
+    assert "Home News Sports" not in text
+    assert backend.get_domain_strategy("example.com") == "selector:article"
+
+    # a paywalled page afterwards does not replace the selector
+    extract(SHORT_PAGE, "example.com")
+    assert backend.get_domain_strategy("example.com") == "selector:article"
+
+
+def test_stale_fallback_row_is_dropped(db_session):
+    db_session.add(backend.DomainStrategy(domain="old.com", strategy="full_text", successes=5))
+    db_session.commit()
+    _, used = extract(GOOD_PAGE, "old.com")
+    assert used == "selector:article"
+    assert backend.get_domain_strategy("old.com") == "selector:article"
+
+
+def test_unchanged_strategy_is_not_written(db_session):
+    extract(GOOD_PAGE, "steady.com")
+    writes = []
+    listener = lambda *args: writes.append(args[2])
+    event.listen(backend.db.engine, "before_cursor_execute", listener)
+    try:
+        extract(GOOD_PAGE, "steady.com")
+    finally:
+        event.remove(backend.db.engine, "before_cursor_execute", listener)
+    assert not [s for s in writes if not s.lstrip().upper().startswith("SELECT")]
+
+
+def test_failures_are_counted_without_writing(db_session, monkeypatch):
+    monkeypatch.setitem(backend.app.config, "STRATEGY_RELEARN_AFTER", 3)
+    extract(GOOD_PAGE, "moved.com")
+    statements, commits = [], []
+    listener = lambda *args: statements.append(args[2])
+    on_commit = lambda session: commits.append(session)
+    request_session = backend.db.session()
+    event.listen(backend.db.engine, "before_cursor_execute", listener)
+    event.listen(request_session, "after_commit", on_commit)
+    try:
+        for _ in range(2):
+            _, used = extract(MAIN_PAGE, "moved.com")
+            assert used == "selector:#main"
+        assert not [s for s in statements if not s.lstrip().upper().startswith("SELECT")]
+        assert backend.get_domain_strategy("moved.com") == "selector:article"
+
+        extract(MAIN_PAGE, "moved.com")
+    finally:
+        event.remove(backend.db.engine, "before_cursor_execute", listener)
+        event.remove(request_session, "after_commit", on_commit)
+    assert backend.get_domain_strategy("moved.com") == "selector:#main"
+    assert not commits
+
+
+def test_success_resets_the_failure_count(db_session, monkeypatch):
+    monkeypatch.setitem(backend.app.config, "STRATEGY_RELEARN_AFTER", 2)
+    extract(GOOD_PAGE, "flaky.com")
+    extract(MAIN_PAGE, "flaky.com")
+    extract(GOOD_PAGE, "flaky.com")
+    extract(MAIN_PAGE, "flaky.com")
+    assert backend.get_domain_strategy("flaky.com") == "selector:article"
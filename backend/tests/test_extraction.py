@@ -0,0 +1,38 @@
+import extraction
+from extraction import ParsedPage, clean_article_text, strip_irrelevant_markup
+
+STORY = "<p>" + "The committee released its findings on Thursday. " * 10 + "</p>"
+
+
+def test_tag_names_inside_attribute_values_are_not_tags():
+    html = (
+        '<html><body><div data-template="<nav>menu</nav>" title=\'<script>\'>'
+        f"{STORY}</div><nav>Home News</nav></body></html>"
+    )
+    filtered = strip_irrelevant_markup(html)
+    assert 'data-template="<nav>menu</nav>"' in filtered
+    assert "title='<script>'" in filtered
+    assert STORY in filtered
+    assert "Home News" not in filtered
+
+
+def test_filter_only_runs_before_html_parser():
+    html = f"<html><body><nav>Home News</nav><article>{STORY}</article></body></html>"
+    page = ParsedPage(html, fast=True)
+    assert page.html_content == html
+    assert "Home News" not in page.article_text()
+    assert "Home News" not in ParsedPage(html, fast=False).soup.get_text()
+
+
+def test_domain_phrases_apply_after_reload(monkeypatch):
+    monkeypatch.setattr(extraction, "DOMAIN_CUTOFF_PHRASES", {})
+    text = STORY + " Continue reading in the app for more."
+    assert "Continue reading" in clean_article_text(text, "www.example.com")
+
+    extraction.add_domain_cutoff_phrases("example.com", ["Continue reading in the app"])
+    assert "Continue reading" not in clean_article_text(text, "www.example.com")
+    assert "Continue reading" in clean_article_text(text, "other.com")
+
+    extraction.DOMAIN_CUTOFF_PHRASES.clear()
+    extraction.reload_cleanup_phrases()
+    assert "Continue reading" in clean_article_text(text, "www.example.com")
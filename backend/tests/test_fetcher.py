@@ -0,0 +1,82 @@
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+import fetcher
+from fetcher import FetchError, PageFetcher
+
+PAGE = b"<html><body><p>Hello</p></body></html>"
+
+
+class Handler(BaseHTTPRequestHandler):
+    requests = 0
+
+    def do_GET(self):
+        Handler.requests += 1
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(PAGE)))
+        self.end_headers()
+        self.wfile.write(PAGE)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = HTTPServer(("127.0.0.1", 0), Handler)
+    Handler.requests = 0
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd.server_address[1]
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def rebinding_dns(monkeypatch):
+    """news.test resolves to 127.0.0.1 once, then to 127.0.0.2, where nothing listens."""
+    lookups = []
+    real_getaddrinfo = socket.getaddrinfo
+
+    def getaddrinfo(host, port, *args, **kwargs):
+        if host != "news.test":
+            return real_getaddrinfo(host, port, *args, **kwargs)
+        lookups.append(host)
+        address = "127.0.0.1" if len(lookups) == 1 else "127.0.0.2"
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", (address, port))]
+
+    monkeypatch.setattr(socket, "getaddrinfo", getaddrinfo)
+    # pretend the first answer is a public address
+    monkeypatch.setattr(fetcher, "_is_public_address", lambda ip: str(ip) == "127.0.0.1")
+    return lookups
+
+
+def test_connects_to_the_checked_address(server, rebinding_dns):
+    result = PageFetcher().fetch(f"http://news.test:{server}/story")
+    assert result.html == PAGE.decode()
+    assert rebinding_dns == ["news.test"]
+
+
+def test_non_public_address_is_refused_before_any_request(server, rebinding_dns):
+    rebinding_dns.append("first lookup already answered")
+    with pytest.raises(FetchError) as e:
+        PageFetcher().fetch(f"http://news.test:{server}/story")
+    assert e.value.status == 400
+    assert Handler.requests == 0
+
+
+def test_idle_hosts_are_forgotten(server):
+    page_fetcher = PageFetcher(allow_private_hosts=True)
+    for page in range(3):
+        page_fetcher.fetch(f"http://127.0.0.1:{server}/story?page={page}")
+    assert page_fetcher._host_slots == {}
+
+    slot = page_fetcher._host_slot("busy.test")
+    assert slot.acquire(timeout=0)
+    assert "busy.test" in page_fetcher._host_slots
+    page_fetcher._release_host_slot("busy.test", True)
+    assert page_fetcher._host_slots == {}
@@ -0,0 +1,31 @@
+import app as backend
+from payloads import PayloadMetrics
+
+
+def test_client_supplied_keys_are_bounded():
+    metrics = PayloadMetrics()
+    for mode in ("a" * 1000, "b" * 1000, ["html"], None, "html"):
+        metrics.record(mode, "identity", 10, 10, 0.01, 400)
+    for encoding in ("br", "x" * 1000):
+        metrics.record("extracted", encoding, 10, 10, 0.01, 415)
+    assert sorted(metrics.snapshot()) == [
+        "extracted/invalid",
+        "html/identity",
+        "invalid/identity",
+    ]
+    assert metrics.snapshot()["invalid/identity"]["requests"] == 4
+
+
+def test_non_string_text_is_a_client_error():
+    with backend.app.app_context():
+        backend.db.create_all()
+        client = backend.app.test_client()
+        client.post("/register", json={"email": "payload@example.com", "password": "pw"})
+        login = client.post("/login", json={"email": "payload@example.com", "password": "pw"})
+        headers = {"x-access-token": login.get_json()["token"]}
+        response = client.post(
+            "/analyze", json={"mode": "extracted", "text": 123}, headers=headers
+        )
+        assert response.status_code == 400
+        assert response.get_json()["message"] == "text must be a string"
+        client.delete("/account/delete", headers=headers)
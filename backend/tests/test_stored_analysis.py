@@ -0,0 +1,146 @@
+import datetime as dt
+
+import pytest
+
+import app as backend
+from fetcher import FetchResult
+
+TEXT = "Council members voted on the new budget today. " * 20
+PAGE = f"<html><head><title>Budget vote</title></head><body><article><p>{TEXT}</p></article></body></html>"
+URL = "https://news.example.com/budget"
+
+
+@pytest.fixture
+def client(monkeypatch):
+    calls = []
+
+    def analyze(text):
+        calls.append(text)
+        return 0.25, ["budget", "council"], "Politics"
+
+    monkeypatch.setattr(backend, "get_local_analysis", analyze)
+    monkeypatch.setattr(backend, "analysis_cache", None)
+    # keyword document frequencies are not under test (and need the WordNet corpus)
+    monkeypatch.setattr(backend, "add_document_frequencies", lambda texts: None)
+    monkeypatch.setattr(
+        backend.page_fetcher, "fetch", lambda url: FetchResult(url, PAGE, "miss", 0.01)
+    )
+    with backend.app.app_context():
+        backend.db.create_all()
+        client = backend.app.test_client()
+        client.post("/register", json={"email": "stored@example.com", "password": "pw"})
+        token = client.post(
+            "/login", json={"email": "stored@example.com", "password": "pw"}
+        ).get_json()["token"]
+        client.headers = {"x-access-token": token}
+        client.calls = calls
+        yield client
+        client.delete("/account/delete", headers=client.headers)
+        backend.PageAnalysis.query.delete()
+        backend.db.session.commit()
+
+
+def analyze_url(client):
+    return client.post("/analyze_url", json={"url": URL}, headers=client.headers).get_json()["data"]
+
+
+def test_saved_client_analysis_is_not_reused(client):
+    forged = {
+        "url": URL,
+        "title": "Budget vote",
+        "article_text": "Forged text",
+        "sentiment": -1.0,
+        "keywords": ["forged"],
+        "category": "Sports",
+        "save_to_history": True,
+    }
+    saved = client.post("/save_analysis", json=forged, headers=client.headers)
+    assert saved.get_json()["message"] == "New article saved and added to history."
+
+    data = analyze_url(client)
+    assert data["sentiment"] == 0.25
+    assert data["keywords"] == ["budget", "council"]
+    assert len(client.calls) == 1
+
+
+def test_server_analysis_is_reused_until_stale(client):
+    analyze_url(client)
+    data = client.post(
+        "/analyze",
+        json={"mode": "extracted", "url": URL, "title": "x", "text": "Different text " * 20},
+        headers=client.headers,
+    ).get_json()["data"]
+    assert data["sentiment"] == 0.25
+    assert len(client.calls) == 1
+
+    # a client-supplied page is analyzed but never stored for other readers
+    client.post(
+        "/analyze",
+        json={"mode": "extracted", "url": URL + "/other", "title": "x", "text": TEXT},
+        headers=client.headers,
+    )
+    assert backend.PageAnalysis.query.filter_by(url=URL + "/other").first() is None
+
+    stored = backend.PageAnalysis.query.filter_by(url=URL).one()
+    stored.fingerprint = "0" * 64
+    backend.db.session.commit()
+    analyze_url(client)
+    assert len(client.calls) == 3
+    stored = backend.PageAnalysis.query.filter_by(url=URL).one()
+    assert stored.fingerprint == backend.analysis_fingerprint()
+
+    stored.analyzed_at = dt.datetime.utcnow() - dt.timedelta(
+        hours=backend.app.config["ANALYSIS_MAX_AGE_HOURS"] + 1
+    )
+    backend.db.session.commit()
+    analyze_url(client)
+    assert len(client.calls) == 4
+    stored = backend.PageAnalysis.query.filter_by(url=URL).one()
+    assert dt.datetime.utcnow() - stored.analyzed_at < dt.timedelta(minutes=1)
+
+
+def canonical_page(canonical):
+    return PAGE.replace("<title>", f'<link rel="canonical" href="{canonical}"><title>')
+
+
+def analyze_extracted(client, url):
+    return client.post(
+        "/analyze",
+        json={"mode": "extracted", "url": url, "title": "x", "text": "Different text " * 20},
+        headers=client.headers,
+    ).get_json()["data"]
+
+
+def test_reused_under_the_canonical_url(client, monkeypatch):
+    monkeypatch.setattr(
+        backend.page_fetcher,
+        "fetch",
+        lambda url: FetchResult(url, canonical_page(URL), "miss", 0.01),
+    )
+    client.post("/analyze_url", json={"url": URL + "?utm_source=x"}, headers=client.headers)
+    assert analyze_extracted(client, URL)["sentiment"] == 0.25
+    assert len(client.calls) == 1
+
+
+def test_canonical_url_on_another_site_is_ignored(client, monkeypatch):
+    monkeypatch.setattr(
+        backend.page_fetcher,
+        "fetch",
+        lambda url: FetchResult(url, canonical_page(URL), "miss", 0.01),
+    )
+    client.post(
+        "/analyze_url", json={"url": "https://attacker.example.org/copy"}, headers=client.headers
+    )
+    assert backend.PageAnalysis.query.filter_by(canonical_url=URL).first() is None
+    analyze_extracted(client, URL)
+    assert len(client.calls) == 2
+
+
+def test_boilerplate_is_cut_before_analysis(client):
+    data = client.post(
+        "/analyze",
+        json={"mode": "extracted", "url": URL + "/cut", "text": TEXT + "Related Articles: more"},
+        headers=client.headers,
+    ).get_json()["data"]
+    assert "Related Articles" not in data["article_text"]
+    assert "Related Articles" not in client.calls[-1]
@@ -0,0 +1,78 @@
+import pytest
+
+import app as backend
+
+TEXT = "The central bank raised interest rates again as inflation stayed high. " * 5
+
+
+@pytest.fixture
+def readers(monkeypatch):
+    # keyword document frequencies are not under test (and need the WordNet corpus)
+    monkeypatch.setattr(backend, "add_document_frequencies", lambda texts: None)
+    with backend.app.app_context():
+        backend.db.create_all()
+        client = backend.app.test_client()
+        headers = []
+        for email in ("centroid-a@example.com", "centroid-b@example.com"):
+            client.post("/register", json={"email": email, "password": "pw"})
+            login = client.post("/login", json={"email": email, "password": "pw"})
+            token = login.get_json()["token"]
+            headers.append({"x-access-token": token})
+            client.post(
+                "/save_analysis",
+                json={
+                    "url": "https://news.example.com/rates",
+                    "title": "Rates rise",
+                    "article_text": TEXT,
+                    "sentiment": 0.0,
+                    "keywords": ["rates"],
+                    "category": "Business",
+                    "save_to_history": True,
+                },
+                headers=headers[-1],
+            )
+        client.post("/topics", json={"name": "Central banks"}, headers=headers[0])
+        article = backend.Article.query.filter_by(url="https://news.example.com/rates").one()
+        yield client, headers, article.id
+        for user_headers in headers:
+            client.delete("/account/delete", headers=user_headers)
+
+
+def centroid_count(user_email):
+    user = backend.User.query.filter_by(email=user_email).one()
+    centroid = backend.UserTopicCentroid.query.filter_by(user_id=user.id).first()
+    return centroid.doc_count if centroid else 0
+
+
+def move(client, headers, article_id, category):
+    response = client.post(
+        "/move_article",
+        json={"article_id": article_id, "new_category": category},
+        headers=headers,
+    )
+    assert response.status_code == 200
+
+
+def test_other_readers_move_does_not_strand_the_article(readers):
+    client, (a, b), article_id = readers
+    move(client, a, article_id, "Central banks")
+    assert centroid_count("centroid-a@example.com") == 1
+    terms = {t.feature: t.weight for t in backend.UserTopicCentroidTerm.query}
+    assert terms == pytest.approx(backend.nlp.hashed_vector(TEXT))
+
+    # another reader changes the shared category, then A moves it out of the topic
+    move(client, b, article_id, "Politics")
+    assert centroid_count("centroid-a@example.com") == 1
+    move(client, a, article_id, "Business")
+    assert centroid_count("centroid-a@example.com") == 0
+    assert backend.UserTopicCentroidTerm.query.count() == 0
+
+
+def test_topic_vectors_are_idf_weighted():
+    with backend.app.app_context():
+        hashing = backend.nlp.hashing_vectorizer[0]
+        vector = backend.nlp.hashed_vector("senate quasar")
+        senate = hashing.transform(["senate"]).indices[0]
+        quasar = hashing.transform(["quasar"]).indices[0]
+        # "senate" is in the Politics fingerprint, "quasar" in none of them
+        assert vector[quasar] > vector[senate]
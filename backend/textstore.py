@@ -0,0 +1,47 @@
+import zlib
+
+# "raw" stores utf-8 bytes as they are; "zstd" needs the optional zstandard package
+# and falls back to zlib without it
+CODECS = ("raw", "zlib", "zstd")
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return zstandard
+
+
+def encode_text(text, codec="zlib", level=6):
+    """Returns (codec used, bytes) for text. Text that does not shrink is stored raw."""
+    if codec not in CODECS:
+        raise ValueError(f"Unknown article text codec: {codec}")
+    raw = (text or "").encode("utf-8")
+    if codec == "zstd":
+        zstandard = _zstandard()
+        if zstandard is not None:
+            data = zstandard.ZstdCompressor(level=level).compress(raw)
+            return ("zstd", data) if len(data) < len(raw) else ("raw", raw)
+        codec = "zlib"
+    if codec == "zlib":
+        data = zlib.compress(raw, min(level, 9))
+        return ("zlib", data) if len(data) < len(raw) else ("raw", raw)
+    return "raw", raw
+
+
+def decode_text(codec, data):
+    """Inverse of encode_text. A missing body (codec None) decodes to an empty string."""
+    if codec is None or data is None:
+        return ""
+    data = bytes(data)
+    if codec == "zlib":
+        data = zlib.decompress(data)
+    elif codec == "zstd":
+        zstandard = _zstandard()
+        if zstandard is None:
+            raise RuntimeError("zstd-compressed article text needs the zstandard package")
+        data = zstandard.ZstdDecompressor().decompress(data)
+    elif codec != "raw":
+        raise ValueError(f"Unknown article text codec: {codec}")
+    return data.decode("utf-8")
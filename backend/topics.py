@@ -0,0 +1,60 @@
+import threading
+import time
+from collections import OrderedDict
+
+# centroid weights smaller than this after removing an article are float residue
+EPSILON = 1e-9
+
+
+def centroid_matrix(vectors, n_features):
+    """
+    Sparse (n_features x len(vectors)) matrix whose columns are the unit-length
+    centroids. The sum of unit article vectors points the same way as their mean.
+    """
+    import numpy as np
+    from scipy import sparse
+
+    rows, cols, data = [], [], []
+    for col, vector in enumerate(vectors):
+        weights = np.fromiter(vector.values(), dtype=np.float64, count=len(vector))
+        norm = np.linalg.norm(weights) or 1.0
+        rows.extend(int(k) for k in vector)
+        cols.extend([col] * len(vector))
+        data.extend(weights / norm)
+    return sparse.csc_matrix((data, (rows, cols)), shape=(n_features, len(vectors)))
+
+
+class CentroidCache:
+    """
+    Per-process LRU of each user's (topic names, centroid matrix), bounded to
+    max_users entries. Entries expire after ttl seconds so a move handled by
+    another worker is picked up; the worker that handled it invalidates at once.
+    """
+
+    def __init__(self, max_users=1000, ttl=60):
+        self.max_users = max_users
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id, loader):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and now - entry[0] < self.ttl:
+                self._entries.move_to_end(user_id)
+                return entry[1]
+        value = loader(user_id)
+        with self._lock:
+            self._entries[user_id] = (now, value)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_users:
+                self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def __len__(self):
+        return len(self._entries)
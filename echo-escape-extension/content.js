@@ -28,10 +28,13 @@ chrome.runtime.onMessage.addListener(function (request, sender, sendResponse) {
 
         // Send both the visible text and full HTML (for metadata)
         const fullHTML = new XMLSerializer().serializeToString(document);
+        const canonical = document.querySelector('link[rel="canonical"]');
 
         sendResponse({
             page_html: fullHTML,
-            page_text: articleText
+            page_text: articleText,
+            page_title: document.title,
+            canonical_url: canonical ? canonical.href : ""
         });
     }
 
@@ -336,6 +336,39 @@ function handleAuth(mode, container, e) {
             submitButton.disabled = false;
         });
 }
+// the server needs at least this much article text, below it the full page is sent
+const MIN_EXTRACTED_TEXT = 100;
+
+// Pre-extracted text + head metadata when the content script found the article,
+// otherwise the whole page. Either way the JSON is gzipped when the browser can.
+async function buildAnalyzeRequest(response) {
+    let payload;
+    if (response.page_text && response.page_text.trim().length >= MIN_EXTRACTED_TEXT) {
+        payload = {
+            mode: 'extracted',
+            title: response.page_title || '',
+            url: response.canonical_url || '',
+            text: response.page_text
+        };
+    } else {
+        payload = {
+            mode: 'html',
+            html_content: response.page_html,
+            visible_text: response.page_text
+        };
+    }
+    const json = JSON.stringify(payload);
+    const headers = { 'Content-Type': 'application/json' };
+    if (typeof CompressionStream === 'undefined') {
+        return { headers, data: json };
+    }
+    const stream = new Blob([json]).stream().pipeThrough(new CompressionStream('gzip'));
+    const data = await new Response(stream).arrayBuffer();
+    headers['Content-Encoding'] = 'gzip';
+    console.log(`/analyze ${payload.mode} payload: ${json.length} chars, ${data.byteLength} bytes gzipped`);
+    return { headers, data };
+}
+
 function handleAnalysis() {
     const analyzeButton = document.getElementById('analyze-button');
     const resultsContainer = document.getElementById('results-container');
@@ -377,31 +410,27 @@ function handleAnalysis() {
             console.log("Length of html_content:", response.page_html.length);
             console.log("Length of visible_text:", response.page_text.length);
 
-            fetch(`${API_URL}/analyze`, {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json', 'x-access-token': result.token },
-                body: JSON.stringify({
-                    html_content: response.page_html,
-                    visible_text: response.page_text
-                })
-
-            })
+            buildAnalyzeRequest(response)
+                .then(body => fetch(`${API_URL}/analyze`, {
+                    method: 'POST',
+                    headers: { ...body.headers, 'x-access-token': result.token },
+                    body: body.data
+                }))
                 .then(async res => {
                     const text = await res.text();  // always read raw text
 
+                    let json;
                     try {
-                        const json = JSON.parse(text);
-
-                        if (!res.ok) {
-                            throw new Error(json.message || 'Unexpected server error.');
-                        }
-
-                        return json;
+                        json = JSON.parse(text);
                     } catch (err) {
                         console.error("❌ Failed to parse JSON. Raw response was:");
                         console.error(text);  // This will show the "<!DOCTYPE..." if it failed
                         throw new Error("Server returned invalid JSON. Site may be blocking content.");
                     }
+                    if (!res.ok) {
+                        throw new Error(json.message || 'Unexpected server error.');
+                    }
+                    return json;
                 })
 
                 .then(data => {
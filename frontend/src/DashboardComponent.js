@@ -2,6 +2,8 @@ import React, { useState, useEffect, useMemo } from 'react';
 import styles from "./styles.js";
 import SentimentTimeline from './SentimentTimeline.js';
 
+const ARTICLES_PAGE_SIZE = 100;
+
 
 export default function DashboardComponent({ auth, setAuth, key }) {
   const [state, setState] = useState({
@@ -9,11 +11,12 @@ export default function DashboardComponent({ auth, setAuth, key }) {
     error: null,
     articles: [],
     topicAnalysis: [],
-    sourceData: [],
     timelineData: [],
   });
 
   const [expandedCategory, setExpandedCategory] = useState(null);
+  // category -> { articles, nextCursor }, filled page by page when a topic is expanded
+  const [categoryArticles, setCategoryArticles] = useState({});
   const [showTopicModal, setShowTopicModal] = useState(false);
   const [newTopicName, setNewTopicName] = useState("");
 
@@ -23,40 +26,54 @@ export default function DashboardComponent({ auth, setAuth, key }) {
     "Lifestyle", "Crime", "Other"
   ]);
 
-  useEffect(() => {
-    const fetchTopics = async () => {
-      try {
-        const res = await fetch(`${process.env.REACT_APP_API_URL}/topics`, {
-          headers: { 'x-access-token': auth.token }
-        });
-        const data = await res.json();
-        setAllCategories([...data.default_topics, ...data.custom_topics]);
-      } catch (err) {
-        console.error("Error fetching topics", err);
-      }
-    };
-    fetchTopics();
-  }, [auth.token]);
+  // one page of the reading history; the server answers 304 (served from the
+  // browser cache) while the history is unchanged
+  const fetchArticlesPage = async (params) => {
+    const query = new URLSearchParams({ limit: ARTICLES_PAGE_SIZE, ...params });
+    const res = await fetch(`${process.env.REACT_APP_API_URL}/dashboard?${query}`, {
+      headers: { 'x-access-token': auth.token }
+    });
+    if (!res.ok) throw new Error("Could not fetch articles.");
+    return res.json();
+  };
+
+  const fetchCategoryArticles = async (category, cursor = null) => {
+    try {
+      const page = await fetchArticlesPage(cursor ? { category, cursor } : { category });
+      setCategoryArticles(prev => ({
+        ...prev,
+        [category]: {
+          articles: [...(cursor && prev[category] ? prev[category].articles : []), ...page.articles],
+          nextCursor: page.next_cursor,
+        }
+      }));
+    } catch (err) {
+      console.error("Error fetching topic articles", err);
+    }
+  };
+
+  // everything the dashboard renders in one request; sources are not shown, so not requested
   const fetchData = async () => {
     setState(s => ({ ...s, loading: true }));
     try {
-      const [articlesRes, topicsRes, sourcesRes, timelineRes] = await Promise.all([
-        fetch(`${process.env.REACT_APP_API_URL}/dashboard`, { headers: { 'x-access-token': auth.token } }),
-        fetch(`${process.env.REACT_APP_API_URL}/category_analysis`, { headers: { 'x-access-token': auth.token } }),
-        fetch(`${ process.env.REACT_APP_API_URL}/source_analysis`, { headers: { 'x-access-token': auth.token } }),
-        fetch(`${process.env.REACT_APP_API_URL}/sentiment_timeline`, { headers: { 'x-access-token': auth.token } })
-      ]);
-      if (!articlesRes.ok || !topicsRes.ok || !sourcesRes.ok || !timelineRes.ok)
-        throw new Error("Could not fetch all dashboard data.");
-
-      const articles = await articlesRes.json();
-      const topicAnalysis = await topicsRes.json();
-      const sourceData = await sourcesRes.json();
-      const timelineData = await timelineRes.json();
+      const query = new URLSearchParams({ sections: 'articles,categories,timeline,topics', limit: ARTICLES_PAGE_SIZE });
+      const res = await fetch(`${process.env.REACT_APP_API_URL}/dashboard_bundle?${query}`, {
+        headers: { 'x-access-token': auth.token }
+      });
+      if (!res.ok) throw new Error("Could not fetch all dashboard data.");
+      const bundle = await res.json();
 
-      setState({ loading: false, error: null, articles, topicAnalysis, sourceData, timelineData });
+      setAllCategories([...bundle.topics.default_topics, ...bundle.topics.custom_topics]);
+      setState({
+        loading: false,
+        error: null,
+        // the most recent page only, for the keyword cloud
+        articles: bundle.articles.articles,
+        topicAnalysis: bundle.categories,
+        timelineData: bundle.timeline,
+      });
     } catch (err) {
-      setState({ loading: false, error: err.message, articles: [], topicAnalysis: [], sourceData: [], timelineData: [] });
+      setState({ loading: false, error: err.message, articles: [], topicAnalysis: [], timelineData: [] });
     }
   };
 
@@ -83,6 +100,8 @@ export default function DashboardComponent({ auth, setAuth, key }) {
       }
 
       await fetchData();  // ✅ this now guarantees UI is up-to-date
+      setCategoryArticles({});
+      if (expandedCategory) await fetchCategoryArticles(expandedCategory);
 
     } catch (err) {
       console.error("Move article error:", err);
@@ -200,14 +219,7 @@ export default function DashboardComponent({ auth, setAuth, key }) {
 
                     if (!res.ok) throw new Error(await res.json().then(e => e.message));
 
-                    // ✅ Re-fetch updated topics list
-                    const topicsRes = await fetch(`${process.env.REACT_APP_API_URL}/topics`, {
-                      headers: { 'x-access-token': auth.token }
-                    });
-                    const topicsData = await topicsRes.json();
-                    setAllCategories([...topicsData.default_topics, ...topicsData.custom_topics]);
-
-                    // ✅ Also refresh full dashboard data
+                    // ✅ Refresh dashboard data, including the topics list
                     await fetchData();
 
                     setShowTopicModal(false);
@@ -270,7 +282,11 @@ export default function DashboardComponent({ auth, setAuth, key }) {
                   }}>{item.average_sentiment.toFixed(2)}</td>
                   <td style={{ ...styles.tableCell, verticalAlign: 'middle' }}>
                     <button
-                      onClick={() => setExpandedCategory(expandedCategory === item.category ? null : item.category)}
+                      onClick={() => {
+                        const next = expandedCategory === item.category ? null : item.category;
+                        setExpandedCategory(next);
+                        if (next && !categoryArticles[next]) fetchCategoryArticles(next);
+                      }}
                       style={{ ...styles.button, padding: '5px 10px', fontSize: '12px' }}
                     >
                       {expandedCategory === item.category ? 'Hide' : 'View'}
@@ -284,7 +300,7 @@ export default function DashboardComponent({ auth, setAuth, key }) {
                       background: '#1f1f1f',
                       color: '#f1f1f1'
                     }}>
-                      {state.articles.filter(a => a.category === item.category).map(article => (
+                      {(categoryArticles[item.category]?.articles || []).map(article => (
                         <div
                           key={article.id}
                           style={{
@@ -326,6 +342,14 @@ export default function DashboardComponent({ auth, setAuth, key }) {
                           </select>
                         </div>
                       ))}
+                      {categoryArticles[item.category]?.nextCursor && (
+                        <button
+                          onClick={() => fetchCategoryArticles(item.category, categoryArticles[item.category].nextCursor)}
+                          style={{ ...styles.button, padding: '5px 10px', fontSize: '12px', marginTop: '10px' }}
+                        >
+                          Load more
+                        </button>
+                      )}
                     </td>
                   </tr>
                 )}